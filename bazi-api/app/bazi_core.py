@@ -1,11 +1,20 @@
 # -*- encoding:utf-8 -*- 
 
-import sxtwl, json
+import os
+import sxtwl
 from datetime import datetime, timedelta
+from typing import Dict, List
+from typing_extensions import TypedDict  # pydantic 在 3.12 以下要求用它生成接口文档
+from .city_db import load_cities, normalize_city
+from .chart_api import engine_module, profiling
+from .result_cache import from_env
 # import ephem
 from math import radians, sin, cos
 import math 
 
+# 起运用仓库根目录的交节时刻表，与 /chart 的排盘引擎相同；没有引擎时为 None，见 qi_yun
+jieqi_table = engine_module("jieqi_table", None)
+
 # 基础表
 TG  = "甲乙丙丁戊己庚辛壬癸"
 DZ  = "子丑寅卯辰巳午未申酉戌亥"
@@ -53,69 +62,224 @@ WU_XING_KE = {
 
 from datetime import datetime
 
-# 1. 预置城市数据库（部分示例）
-# city_coordinates = {"北京": (116.40, 39.90), "上海": (121.47, 31.23)}
-def parse_city_coordinates(file_path: str) -> dict:
+
+def eot_simple(n: int) -> float:
+    """年内第 n 天的时差(EoT)，单位：分钟"""
+    b = math.radians((n - 81) * 360 / 365.242)
+    # 椭圆轨道修正公式
+    return 9.87 * math.sin(2*b) - 7.53 * math.cos(b) - 1.5 * math.sin(b)
+
+
+def eot_spencer(n: int) -> float:
+    """年内第 n 天正午的时差(EoT)，Spencer 傅里叶级数，误差约 0.5 分钟，单位：分钟"""
+    g = 2 * math.pi * (n - 1) / 365
+    return 229.18 * (0.000075 + 0.001868 * math.cos(g) - 0.032077 * math.sin(g)
+                     - 0.014615 * math.cos(2*g) - 0.040849 * math.sin(2*g))
+
+
+# 时差只与年内天数有关，按天预先算好：EOT_TABLES[模型][年内天数 - 1]
+EOT_TABLES = {
+    "simple": [eot_simple(n) for n in range(1, 367)],
+    "spencer": [eot_spencer(n) for n in range(1, 367)],
+}
+# 默认用原来的公式，环境变量 BAZI_EOT_MODEL=spencer 时用高精度模型
+EOT_MODEL = os.environ.get("BAZI_EOT_MODEL", "simple")
+
+
+def calculate_eot(date: datetime, model: str = None) -> float:
+    """计算时差修正值(EoT) - 单位：分钟"""
+    n = date.timetuple().tm_yday  # 年内天数
+    return EOT_TABLES[model or EOT_MODEL][n - 1]
+
+# 城市索引：精确名称、去后缀的别名、前缀树和经纬度网格，第一次查城市时建立
+def city_level(code: str) -> int:
+    """行政级别：省 1，地级 2，县级 3"""
+    if code.endswith("0000"):
+        return 1
+    if code.endswith("00"):
+        return 2
+    return 3
+
+
+def is_parent_city(parent: str, code: str) -> bool:
+    """parent 编码是否为 code 的上级行政区"""
+    if parent == code:
+        return False
+    if parent.endswith("0000"):
+        return code[:2] == parent[:2]
+    if parent.endswith("00"):
+        return code[:4] == parent[:4]
+    return False
+
+
+class CityIndex:
     """
-    从文件解析城市经纬度数据，生成{city_name: (lng, lat)}字典
-    文件格式：编码 省份城市 经度 纬度（空格/tab分隔）
+    城市经纬度索引：
+    - exact: 名称和简化名称到经纬度，与原来的 city_coordinates 相同
+    - aliases: 去后缀的名称到城市列表
+    - trie: 名称和别名的前缀树，用于补全和在输入中找城市名
+    - grid: 按 1 度经纬度分格，用于找最近的城市
+    - offsets: 各城市相对东经 120 度的经度时差（分钟），按城市序号
     """
-    city_coordinates = {}
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            # 分割字段（兼容空格/tab混合）
-            parts = line.strip().split()
-            if len(parts) < 4:
-                continue  # 跳过格式错误行
-            
-            # 解析字段
-            code = parts[0]
-            name = parts[1]
-            try:
-                lng = float(parts[2])
-                lat = float(parts[3])
-            except ValueError:
-                continue  # 跳过数值错误行
-            
-            # 主键：使用完整城市名称
-            city_coordinates[name] = (lng, lat)
-            
+
+    def __init__(self, rows, aliases=None):
+        self.rows = rows
+        # 同等匹配时的排序：级别高的、名称短的、编码小的在前
+        self.ranks = [(city_level(code), len(name), code) for code, name, _, _ in rows]
+        self.exact = {}
+        self.exact_ids = {}
+        self.offsets = [(120 - lng) * 4 for _, _, lng, _ in rows]
+        self.aliases = {}
+        self.trie = {}
+        self.grid = {}
+        seen = set()
+        for seq, (code, name, lng, lat) in enumerate(rows):
+            self.exact[name] = (lng, lat)
+            self.exact_ids[name] = seq
             # 添加简化名称支持（去掉"市"、"省"、"自治区"等后缀）
-            simplified_name = name
             for suffix in ['市', '省', '自治区', '特别行政区', '县', '区']:
-                if simplified_name.endswith(suffix):
-                    simplified_name = simplified_name[:-len(suffix)]
-                    city_coordinates[simplified_name] = (lng, lat)
+                if name.endswith(suffix):
+                    self.exact[name[:-len(suffix)]] = (lng, lat)
+                    self.exact_ids[name[:-len(suffix)]] = seq
                     break
-    
-    return city_coordinates
+            # 重复的行只更新精确名称，别名、前缀树和网格中只收一次
+            if (code, name) in seen:
+                continue
+            seen.add((code, name))
+            alias = aliases[seq] if aliases else normalize_city(name)
+            self.aliases.setdefault(alias, []).append(seq)
+            for key in {name, alias}:
+                self._insert(key, seq)
+            self.grid.setdefault((math.floor(lng), math.floor(lat)), []).append(seq)
+        for seqs in self.aliases.values():
+            seqs.sort(key=self.ranks.__getitem__)
+        self.examples = [name for name in self.exact if len(name) <= 10][:5]
+
+    def _insert(self, key, seq):
+        node = self.trie
+        for char in key:
+            node = node.setdefault(char, {})
+            # 每个节点记下以此为前缀的最佳城市
+            best = node.get("", None)
+            if best is None or self.ranks[seq] < self.ranks[best]:
+                node[""] = seq
+        node.setdefault(None, []).append(seq)
+
+    def complete(self, prefix: str):
+        """以 prefix 开头的最佳城市序号，没有时返回 None"""
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get("")
+
+    def contained(self, text: str):
+        """text 中出现的城市名，返回 [(序号, 匹配长度)]；结尾两个字以上的不完整名称按前缀补全"""
+        matches = []
+        for i in range(len(text)):
+            node = self.trie
+            for j in range(i, len(text)):
+                node = node.get(text[j])
+                if node is None:
+                    break
+                for seq in node.get(None, ()):
+                    matches.append((seq, j + 1 - i))
+            else:
+                if len(text) - i >= 2 and None not in node:
+                    matches.append((node[""], len(text) - i))
+        return matches
+
+    def find(self, city_name: str):
+        """城市名称对应的城市序号，找不到时返回 None"""
+        alias = normalize_city(city_name)
+        seqs = self.aliases.get(alias)
+        if seqs:
+            return seqs[0]
+
+        matches = self.contained(alias)
+        if matches:
+            codes = {self.rows[seq][0] for seq, _ in matches}
+
+            # 输入里同时出现上级行政区的优先，如"北京朝阳"取北京的朝阳区
+            def rank(match):
+                seq, length = match
+                code = self.rows[seq][0]
+                parents = sum(is_parent_city(item, code) for item in codes)
+                return (-parents, -length, -city_level(code)) + self.ranks[seq]
+            return min(matches, key=rank)[0]
+
+        return self.complete(alias)
+
+    def lookup_id(self, city_name: str) -> int:
+        """城市名称对应的城市序号，未收录时抛出 ValueError"""
+        seq = self.exact_ids.get(city_name)
+        if seq is None:
+            seq = self.find(city_name)
+        if seq is None:
+            raise ValueError(f"城市 '{city_name}' 经纬度未收录。可用城市示例：{', '.join(self.examples)}等")
+        return seq
+
+    def lookup(self, city_name: str) -> tuple:
+        """城市名称对应的经纬度 (lng, lat)，未收录时抛出 ValueError"""
+        return self.rows[self.lookup_id(city_name)][2:]
+
+    def nearest(self, lng: float, lat: float) -> str:
+        """离经纬度最近的城市名称，按格子由近及远搜索"""
+        x, y = math.floor(lng), math.floor(lat)
+        scale = math.cos(math.radians(lat))
+        best = None
+        for radius in range(361):
+            for i in range(x - radius, x + radius + 1):
+                for j in range(y - radius, y + radius + 1):
+                    if max(abs(i - x), abs(j - y)) != radius:
+                        continue
+                    for seq in self.grid.get((i, j), ()):
+                        code, name, lng2, lat2 = self.rows[seq]
+                        # 经度按纬度缩放后的平面距离，近距离时足够准确
+                        dx = (lng2 - lng) * scale
+                        key = (dx * dx + (lat2 - lat) ** 2, city_level(code), code, name)
+                        if best is None or key < best:
+                            best = key
+            # 外圈的城市至少相距 radius 格
+            if best is not None and (radius * scale) ** 2 >= best[0]:
+                break
+        return best[-1] if best else None
 
-def calculate_eot(date: datetime) -> float:
-    """计算时差修正值(EoT) - 单位：分钟"""
-    n = date.timetuple().tm_yday  # 年内天数
-    b = math.radians((n - 81) * 360 / 365.242)
-    # 椭圆轨道修正公式
-    eot = 9.87 * math.sin(2*b) - 7.53 * math.cos(b) - 1.5 * math.sin(b)
-    return eot
 
-city_coordinates = parse_city_coordinates("/app/app/data.txt")
+_city_index = None
+
+def get_city_index() -> CityIndex:
+    """城市索引，第一次使用时从编译好的城市文件加载"""
+    global _city_index
+    if _city_index is None:
+        _city_index = CityIndex(*load_cities())
+    return _city_index
+
+
+def __getattr__(name):
+    # 兼容原来的模块变量，按需加载
+    if name == "city_index":
+        return get_city_index()
+    if name == "city_coordinates":
+        return get_city_index().exact
+    raise AttributeError(name)
+
+
+def find_city(city_name: str) -> tuple:
+    """城市名称对应的经纬度 (lng, lat)，未收录时抛出 ValueError"""
+    return get_city_index().lookup(city_name)
+
+
+def find_city_id(city_name: str) -> int:
+    """城市名称对应的城市序号，用于 true_solar_time_batch"""
+    return get_city_index().lookup_id(city_name)
+
 # 2. 真太阳时计算函数
-def true_solar_time(city_name: str, local_dt: datetime) -> datetime:
-    # 尝试精确匹配
-    coordinates = city_coordinates.get(city_name)
-    
-    if not coordinates:
-        # 尝试模糊匹配（在城市名称中搜索）
-        for city, coord in city_coordinates.items():
-            if city_name in city or city in city_name:
-                coordinates = coord
-                break
-    
-    if not coordinates:
-        # 提供可用城市的提示
-        available_cities = [city for city in city_coordinates.keys() if len(city) <= 10][:10]
-        raise ValueError(f"城市 '{city_name}' 经纬度未收录。可用城市示例：{', '.join(available_cities[:5])}等")
-    
+def true_solar_time(city_name: str, local_dt: datetime, coordinates: tuple = None) -> datetime:
+    if coordinates is None:
+        coordinates = find_city(city_name)
+
     lon, lat = coordinates
     
     # 2. 计算经度时差（120°为东八区基准）
@@ -129,6 +293,21 @@ def true_solar_time(city_name: str, local_dt: datetime) -> datetime:
     return local_dt + total_correction
 
 
+def true_solar_time_batch(city_ids, datetimes, model: str = None) -> list:
+    """
+    批量计算真太阳时，只查表相加：经度时差按城市序号查，时差按年内天数查
+
+    Args:
+        city_ids: 城市序号（find_city_id 的结果）
+        datetimes: 对应的北京时
+        model: 时差模型，默认为 EOT_MODEL
+    """
+    offsets = get_city_index().offsets
+    table = EOT_TABLES[model or EOT_MODEL]
+    return [dt + timedelta(minutes=offsets[city] + table[dt.timetuple().tm_yday - 1])
+            for city, dt in zip(city_ids, datetimes)]
+
+
 def gan_idx(g): return TG.index(g)
 
 def ten_shen(day_gan, target_gan):
@@ -287,21 +466,56 @@ def get_next_gan_zhi(gan_zhi, direction=1):
     return TG[next_gan_idx] + DZ[next_zhi_idx]
 
 
-def calc_da_yun(birth_year, month_gan_zhi, day_gan, gender):
+# 排盘结果，键与接口输出的 JSON 相同
+DaYunStep = TypedDict("DaYunStep", {"干支": str, "起止年龄": str, "十神干": str, "十神支": str})
+DaYunInfo = TypedDict("DaYunInfo", {"排运方式": str, "起运年龄": str, "起运时间": str, "大运": List[DaYunStep]})
+BaziResult = TypedDict("BaziResult", {
+    "姓名": str,
+    "城市": str,
+    "北京时": str,
+    "真太阳时": str,
+    "农历": str,
+    "八字": str,
+    "五行": str,
+    "十神": Dict[str, str],
+    "大运": DaYunInfo,
+})
+
+
+def qi_yun(birth_dt, forward):
+    """
+    起运，forward 为是否顺排，见仓库根目录 jieqi_table.qi_yun；
+    没有排盘引擎时用 lunar_python 的 getYun 现算，结果相同
+
+    Returns:
+        (年, 月, 日, 时, 起运时刻)
+    """
+    if jieqi_table is not None:
+        return jieqi_table.qi_yun(birth_dt, forward)
+    from lunar_python import Solar
+    lunar = Solar.fromYmdHms(birth_dt.year, birth_dt.month, birth_dt.day, birth_dt.hour, birth_dt.minute, 0).getLunar()
+    # getYun 按年干阴阳和性别定顺逆，这里反推出顺逆为 forward 的性别
+    is_yang_year = lunar.getYearGanIndexExact() % 2 == 0
+    yun = lunar.getEightChar().getYun(1 if is_yang_year == forward else 0)
+    s = yun.getStartSolar()
+    return (yun.getStartYear(), yun.getStartMonth(), yun.getStartDay(), yun.getStartHour(),
+            datetime(s.getYear(), s.getMonth(), s.getDay(), s.getHour(), s.getMinute()))
+
+
+def calc_da_yun(birth_dt, year_gan, month_gan_zhi, day_gan, gender) -> DaYunInfo:
     """
     计算大运
     
     Args:
-        birth_year: 出生年份
+        birth_dt: 出生时间（北京时间）
+        year_gan: 年干（立春换年）
         month_gan_zhi: 月柱干支
         day_gan: 日干
         gender: 性别
     
     Returns:
-        大运列表
+        大运列表，年龄为虚岁，与 lunar_python 的 DaYun 相同
     """
-    # 判断年干阴阳
-    year_gan = TG[(birth_year - 4) % 10]  # 天干纪年算法
     is_yang_year = YIN_YANG[year_gan]  # True为阳年，False为阴年
     
     # 确定排运方向
@@ -310,8 +524,9 @@ def calc_da_yun(birth_year, month_gan_zhi, day_gan, gender):
     else:
         direction = -1  # 逆排
     
-    # 简化起运年龄计算（实际应该根据节气计算，这里用固定值）
-    start_age = 8  # 暂定8岁起运
+    # 起运：按出生到前后节的时间推算，见 qi_yun
+    years, months, days, _, start_dt = qi_yun(birth_dt, direction == 1)
+    start_age = start_dt.year - birth_dt.year + 1
     
     # 计算10步大运
     da_yun = []
@@ -337,29 +552,18 @@ def calc_da_yun(birth_year, month_gan_zhi, day_gan, gender):
     return {
         "排运方式": "顺排" if direction == 1 else "逆排",
         "起运年龄": f"{start_age}岁",
+        "起运时间": f"{years}年{months}个月{days}天后，{start_dt.strftime('%Y-%m-%d %H:%M')}",
         "大运": da_yun
     }
 
 
-def calc_bazi(name, city, gender, year, month, day, hour, minute=0):
-
-    # 1. 北京时 -> 当地标准时
-    local_dt = datetime(year, month, day, hour, minute)
-    # 2. 当地标准时 -> 真太阳时
-    true_dt = true_solar_time(city, local_dt)
-
-    # 3. 八字
-
-    day_obj = sxtwl.fromSolar(year, month, day) 
-
-    # 公历 → 农历
-    # 农历日期
-    lunar_year  = day_obj.getLunarYear()
-    lunar_month = day_obj.getLunarMonth()
-    lunar_day   = day_obj.getLunarDay()
-    is_leap     = bool(day_obj.isLunarLeap())
+def day_info(year, month, day):
+    """
+    公历日期的农历和年、月、日柱，同一天的多次排盘可以共用
 
-    d = sxtwl.fromSolar(true_dt.year, true_dt.month, true_dt.day)
+    Returns:
+        (sxtwl.Day, 农历, 年柱, 月柱, 日柱)
+    """
     d = sxtwl.fromSolar(year, month, day)
 
     # 农历日期
@@ -367,19 +571,59 @@ def calc_bazi(name, city, gender, year, month, day, hour, minute=0):
     lunar_month = d.getLunarMonth()
     lunar_day   = d.getLunarDay()
     is_leap     = bool(d.isLunarLeap())
+    lunar = f"{lunar_year}年{'闰' if is_leap else ''}{lunar_month}月{lunar_day}日"
 
-    yg, mg, dg, hg = TG[d.getYearGZ().tg] + DZ[d.getYearGZ().dz], TG[d.getMonthGZ().tg] + DZ[d.getMonthGZ().dz], \
-                     TG[d.getDayGZ().tg] + DZ[d.getDayGZ().dz], TG[d.getHourGZ(hour).tg] + DZ[d.getHourGZ(hour).dz]
+    yg, mg, dg = TG[d.getYearGZ().tg] + DZ[d.getYearGZ().dz], TG[d.getMonthGZ().tg] + DZ[d.getMonthGZ().dz], \
+                 TG[d.getDayGZ().tg] + DZ[d.getDayGZ().dz]
+    return d, lunar, yg, mg, dg
+
+
+# 排盘结果缓存，见 result_cache.from_env
+result_cache = from_env()
+
+
+def calc_bazi(name, city, gender, year, month, day, hour, minute=0, coordinates=None, day_data=None) -> BaziResult:
+    """
+    排盘。coordinates 为城市经纬度，day_data 为 day_info 的结果，
+    批量排盘时传入已算好的值，避免重复查城市和推算历法。
+    结果按 (经纬度, 性别, 北京时, 时差模型) 缓存，同一地点不同写法的城市名共用；
+    北京时和经纬度确定真太阳时，八字也按北京时的日期和小时排。
+    命中时返回的嵌套字段与缓存共用，不要修改。
+    """
+
+    # 1. 北京时 -> 当地标准时
+    local_dt = datetime(year, month, day, hour, minute)
+    if coordinates is None:
+        with profiling.stage("bazi.city"):
+            coordinates = find_city(city)
+
+    key = (coordinates[0], coordinates[1], gender, year, month, day, hour, minute, EOT_MODEL)
+    if result_cache is not None:
+        cached = result_cache.get(key)
+        if cached is not None:
+            profiling.count("bazi.cache_hits")
+            return dict(cached, **{"姓名": name, "城市": city})
+        profiling.count("bazi.cache_misses")
+
+    # 2. 当地标准时 -> 真太阳时
+    with profiling.stage("bazi.true_solar_time"):
+        true_dt = true_solar_time(city, local_dt, coordinates)
+
+    # 3. 八字
+    with profiling.stage("bazi.calendar"):
+        d, lunar, yg, mg, dg = day_data or day_info(year, month, day)
+        hg = TG[d.getHourGZ(hour).tg] + DZ[d.getHourGZ(hour).dz]
 
     # 计算大运
-    da_yun_info = calc_da_yun(year, mg, dg[0], gender)
+    with profiling.stage("bazi.da_yun"):
+        da_yun_info = calc_da_yun(local_dt, yg[0], mg, dg[0], gender)
 
-    return {
+    result = {
         "姓名": name,
         "城市": city,
         "北京时": local_dt.strftime("%Y-%m-%d %H:%M"),
         "真太阳时": true_dt.strftime("%Y-%m-%d %H:%M"),
-        "农历": f"{lunar_year}年{'闰' if is_leap else ''}{lunar_month}月{lunar_day}日",
+        "农历": lunar,
         "八字": f"{yg} {mg} {dg} {hg}",
         "五行": " ".join([f"{g}({ELE[g]})" for g in (yg[0], mg[0], dg[0], hg[0])]),
         "十神": {
@@ -394,13 +638,48 @@ def calc_bazi(name, city, gender, year, month, day, hour, minute=0):
         },
         "大运": da_yun_info
     }
+    if result_cache is not None:
+        result_cache.set(key, result)
+    return result
 
-def solar_to_bazi(name: str, city: str, gender: str, year: int, month: int, day: int, hour: int, minute: int = 0):
 
-    json_data = {}
-    try:
-        json_data = calc_bazi(name, city, gender, year, month, day, hour, minute)
-    except Exception as e:
-        print(e)
+def calc_bazi_batch(items):
+    """
+    批量排盘，同一批中相同城市、相同日期只计算一次
 
-    return json.dumps(json_data, ensure_ascii=False, indent=2)
+    Args:
+        items: 可迭代的参数字典，键与 calc_bazi 的参数相同
+
+    Yields:
+        (结果, None) 或 (None, 错误信息)，与 items 顺序一致
+    """
+    cities = {}
+    days = {}
+    for item in items:
+        try:
+            city = item["city"]
+            if city not in cities:
+                try:
+                    cities[city] = find_city(city)
+                except ValueError as e:
+                    cities[city] = e
+            if isinstance(cities[city], Exception):
+                raise cities[city]
+
+            date = (item["year"], item["month"], item["day"])
+            # 先校验日期，非法日期不进缓存
+            datetime(*date)
+            if date not in days:
+                days[date] = day_info(*date)
+
+            yield calc_bazi(coordinates=cities[city], day_data=days[date], **item), None
+        except Exception as e:
+            yield None, str(e)
+
+def bazi_batch(items: list) -> list:
+    """calc_bazi_batch 的结果列表，供进程池按块调用"""
+    return list(calc_bazi_batch(items))
+
+def solar_to_bazi(name: str, city: str, gender: str, year: int, month: int, day: int, hour: int, minute: int = 0) -> BaziResult:
+    """排盘结果，出错时抛出异常，由调用方决定如何返回；序列化交给接口层"""
+    return calc_bazi(name, city, gender, year, month, day, hour, minute)
@@ -0,0 +1,246 @@
+# -*- encoding:utf-8 -*-
+"""
+完整排盘：调用仓库根目录的排盘引擎（chart.py，bazi.py 用的也是它），按需返回各部分。
+
+引擎的断语和大运流年在访问时才计算，没有请求的部分不会计算；
+其中大运流年最慢（约 2ms），断语不到 1ms，其余部分合计约 0.2ms。
+
+环境变量：
+    BAZI_ENGINE_PATH  排盘引擎所在目录，默认为 bazi-api 的上一级目录
+"""
+
+import contextlib
+import cProfile
+import datetime
+import importlib
+import os
+import sys
+
+ENGINE_PATH = os.environ.get(
+    "BAZI_ENGINE_PATH", os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_engine = None
+_MISSING = object()
+
+
+def engine_module(name: str, default=_MISSING):
+    """
+    仓库根目录的引擎模块（chart、jieqi_table、luohou、profiling 等），第一次调用时把 ENGINE_PATH 加入 sys.path；
+    给出 default 时，没有引擎（导入失败）返回 default，否则抛出 ImportError
+    """
+    if ENGINE_PATH not in sys.path:
+        sys.path.insert(0, ENGINE_PATH)
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        if default is _MISSING:
+            raise
+        return default
+
+
+class _NoProfiling:
+    """没有排盘引擎时代替其 profiling：不做阶段统计，profile 仍用 cProfile 写出 pstats 文件"""
+    enabled = False
+
+    @staticmethod
+    def stage(name: str):
+        return contextlib.nullcontext()
+
+    @staticmethod
+    def count(name: str, value: int = 1):
+        pass
+
+    @staticmethod
+    def drain() -> dict:
+        return {"stages": {}, "counters": {}}
+
+    @staticmethod
+    def merge(data: dict):
+        pass
+
+    @staticmethod
+    def prometheus() -> str:
+        return ""
+
+    @staticmethod
+    @contextlib.contextmanager
+    def profile(path: str):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            profiler.dump_stats(path)
+
+
+# 阶段统计与排盘引擎共用仓库根目录的 profiling（BAZI_PROFILE=1 时打开），没有引擎时不统计
+profiling = engine_module("profiling", _NoProfiling())
+
+
+def engine():
+    """排盘引擎模块 chart，第一次调用时导入"""
+    global _engine
+    if _engine is None:
+        _engine = engine_module("chart")
+    return _engine
+
+
+def _pillars(c, e):
+    hidden = [[{"天干": e.GANS[gan], "十神": e.SHENS[shen]} for gan, shen in items] for items in c.hidden_ids]
+    return {
+        "八字": c.pillars,
+        "十神干": c.gan_shens,
+        "十神支": c.zhi_shens,
+        "藏干": hidden,
+        "纳音": [e.NAYINS[nayin] for _, nayin, _ in c.nayins],
+        "日主长生": c.statuses,
+        "空亡": c.zhi_empties,
+        "大运": c.dayuns,
+    }
+
+
+def _scores(c, e):
+    return {
+        "五行": c.scores,
+        "天干": c.gan_scores,
+        "强根": c.strong,
+        "身弱": c.weak,
+        "湿度": c.temps_scores,
+    }
+
+
+def _relations(c, e):
+    zhi_relations = [[{"关系": e.ZHI_RELATIONS[type_], "地支": [e.ZHIS[item] for item in items]}
+                      for type_, items in relations] for relations in c.zhi_relations]
+    return {
+        "地支关系": zhi_relations,
+        "六合": c.zhi_6he,
+        "六冲": c.zhi_6chong,
+        "干合": c.gan_he,
+        "刑": c.zhi_xing,
+        "夹拱": c.gongs,
+    }
+
+
+def _shensha(c, e):
+    return [[{"神煞": e.SHENSHAS[item], "日干": by_gan} for item, by_gan in items] for items in c.shensha]
+
+
+def _calendar(c, e):
+    return {
+        "公历": "{}-{:02d}-{:02d}".format(*c.solar),
+        "农历": "{}年{}月{}日".format(*c.lunar),
+        "上运时间": c.yun_start,
+        "命宫": c.ming_gong,
+        "胎元": c.tai_yuan,
+        "上一节气": list(c.prev_jieqi),
+        "下一节气": list(c.next_jieqi),
+        "星宿": c.xiu,
+        "星宿歌": c.xiu_song,
+        "建除": list(c.jianchu),
+    }
+
+
+def _transit(row, e):
+    return {
+        "年龄": row.age,
+        "年份": row.year,
+        "干支": e.GANS[row.gan] + e.ZHIS[row.zhi],
+        "十神": e.SHENS[row.shen],
+        "长生": e.STATUSES[row.status],
+        "藏干": [{"天干": e.GANS[gan], "十神": e.SHENS[shen]} for gan, shen in row.hidden],
+        "地支关系": [{"关系": e.ZHI_RELATIONS[type_], "地支": e.ZHIS[item]} for type_, item in row.relations],
+        "空亡": row.empty,
+        "伏吟": row.fu,
+        "纳音": e.NAYINS[row.nayin],
+        "神煞": [e.SHENSHAS[item] for item in row.shens],
+    }
+
+
+def _yuns(c, e):
+    return [dict(_transit(dayun, e), 流年=[_transit(item, e) for item in dayun.liunians]) for dayun in c.yuns]
+
+
+def _yuns_range(c, e, from_year: int = None, to_year: int = None):
+    """from_year 至 to_year 的流年，按大运分组，起运之前的流年没有大运的字段"""
+    groups = []
+    for dayun, liunian in c.transits.years(from_year, to_year):
+        if not groups or groups[-1][0] is not dayun:
+            groups.append((dayun, []))
+        groups[-1][1].append(liunian)
+    return [dict({} if dayun is None else _transit(dayun, e), 流年=[_transit(item, e) for item in liunians])
+            for dayun, liunians in groups]
+
+
+def _findings(c, e):
+    return {
+        "格局": c.ge,
+        "所有格局": c.all_ges,
+        "三合局": c.jus,
+        "断语": c.notes,
+        "格局断语": c.ge_notes,
+    }
+
+
+def _texts(c, e):
+    return {
+        "穷通宝鉴": c.month_text,
+        "三命通会": c.summary_text,
+    }
+
+
+# 可选的部分，按此顺序输出
+SECTIONS = {
+    "pillars": _pillars,
+    "scores": _scores,
+    "relations": _relations,
+    "shensha": _shensha,
+    "calendar": _calendar,
+    "yuns": _yuns,
+    "findings": _findings,
+    "texts": _texts,
+}
+DEFAULT_SECTIONS = ("pillars", "scores", "relations", "shensha", "calendar")
+
+
+def parse_sections(text: str = None) -> list:
+    """
+    解析逗号分隔的部分名称，空时为默认部分，all 为全部
+
+    Raises:
+        ValueError: 有未知的部分
+    """
+    if not text:
+        return list(DEFAULT_SECTIONS)
+    names = [item.strip() for item in text.split(",") if item.strip()]
+    if "all" in names:
+        return list(SECTIONS)
+    unknown = [item for item in names if item not in SECTIONS]
+    if unknown:
+        raise ValueError(f"未知的部分：{','.join(unknown)}，可选：{','.join(SECTIONS)}")
+    return [item for item in SECTIONS if item in names]
+
+
+def chart_sections(year: int, month: int, day: int, hour: int, gender: str = "男",
+                   lunar: bool = False, leap: bool = False, sections=DEFAULT_SECTIONS,
+                   from_year: int = None, to_year: int = None) -> dict:
+    """
+    按出生时间排盘，只计算 sections 中的部分；默认为公历，lunar 时为农历
+    指定 from_year 或 to_year 时 yuns 只逐年计算此范围内的流年，用于按年份翻页
+
+    Raises:
+        ValueError: 公历日期不存在
+    """
+    if not lunar:
+        datetime.date(year, month, day)
+    e = engine()
+    c = e.compute_chart(year, month, day, hour, gregorian=not lunar, leap=leap, female=gender == "女")
+    result = {"性别": "女" if c.female else "男"}
+    for name in sections:
+        if name == "yuns" and (from_year is not None or to_year is not None):
+            result[name] = _yuns_range(c, e, from_year, to_year)
+        else:
+            result[name] = SECTIONS[name](c, e)
+    return result
@@ -0,0 +1,165 @@
+# -*- encoding:utf-8 -*-
+"""
+城市数据库：把 data.txt 编译为定长记录加字符串区的二进制文件，启动时 mmap 读取，不再逐行解析文本。
+
+文件头记录 data.txt 的 md5，文本改动后自动重新编译（目录不可写时直接解析文本）。
+路径可用环境变量配置：
+    BAZI_CITY_TXT  城市文本数据，默认为本目录的 data.txt
+    BAZI_CITY_DB   编译后的文件，默认为本目录的 cities.bin
+
+编译: python -m app.city_db [-i data.txt] [-o cities.bin]
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+MAGIC = b'BZCT'
+VERSION = 2
+# magic, version, 条数, data.txt 的 md5
+HEADER = struct.Struct('<4sII16s')
+# 编码, 经度, 纬度, 名称偏移, 名称长度, 别名偏移, 别名长度；偏移和长度按字符计，字符串区整体解码一次
+RECORD = struct.Struct('<IddIHIH')
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+# 别名去掉的行政区划后缀
+CITY_SUFFIXES = ('特别行政区', '自治区', '自治州', '自治县', '地区', '市', '省', '县', '区', '區')
+
+
+def normalize_city(name: str) -> str:
+    """去掉空白和一个行政区划后缀，至少保留两个字"""
+    name = "".join(name.split())
+    for suffix in CITY_SUFFIXES:
+        if name.endswith(suffix) and len(name) - len(suffix) >= 2:
+            return name[:-len(suffix)]
+    return name
+
+
+def parse_city_rows(file_path: str) -> list:
+    """
+    从文件解析城市数据，返回 [(编码, 名称, 经度, 纬度)]，按文件顺序保留重复行，
+    精确名称后出现的覆盖先出现的（如"海南"为最后一行的海南省），与原来的 city_coordinates 相同
+    文件格式：编码 省份城市 经度 纬度（空格/tab分隔）
+    """
+    rows = []
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            parts = line.strip().split()
+            if len(parts) < 4:
+                continue
+            try:
+                lng = float(parts[2])
+                lat = float(parts[3])
+            except ValueError:
+                continue
+            rows.append((parts[0], parts[1], lng, lat))
+    return rows
+
+
+def text_path() -> str:
+    return os.environ.get('BAZI_CITY_TXT', os.path.join(BASE, 'data.txt'))
+
+
+def db_path() -> str:
+    return os.environ.get('BAZI_CITY_DB', os.path.join(BASE, 'cities.bin'))
+
+
+def file_digest(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).digest()
+
+
+def compile_city_db(source: str, target: str):
+    """把城市文本编译为二进制文件"""
+    rows = parse_city_rows(source)
+    strings = []
+    size = 0
+    records = []
+    for code, name, lng, lat in rows:
+        fields = []
+        for text in (name, normalize_city(name)):
+            fields += [size, len(text)]
+            strings.append(text)
+            size += len(text)
+        records.append(RECORD.pack(int(code), lng, lat, *fields))
+
+    # 每次写单独的临时文件再改名，几个工作进程同时编译时不会写进同一个文件
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(target) + '.', suffix='.tmp',
+                               dir=os.path.dirname(os.path.abspath(target)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(rows), file_digest(source)))
+            f.write(b''.join(records))
+            f.write(''.join(strings).encode('utf-8'))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def read_city_db(path: str, digest: bytes = None):
+    """
+    读取编译后的城市文件，digest 不符时抛出 ValueError
+
+    Returns:
+        (rows, aliases)，rows 与 parse_city_rows 相同，aliases 为对应的别名
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, version, count, stored = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} 不是城市数据文件")
+        if digest is not None and stored != digest:
+            raise ValueError(f"{path} 与城市文本不一致")
+        base = HEADER.size + count * RECORD.size
+        strings = mm[base:].decode('utf-8')
+        rows = []
+        aliases = []
+        for code, lng, lat, name_at, name_len, alias_at, alias_len in RECORD.iter_unpack(mm[HEADER.size:base]):
+            rows.append(("%06d" % code, strings[name_at:name_at + name_len], lng, lat))
+            aliases.append(strings[alias_at:alias_at + alias_len])
+        return rows, aliases
+    finally:
+        mm.close()
+
+
+def load_cities():
+    """
+    城市数据，优先读编译后的文件；文件缺失或与文本不一致时重新编译，
+    无法写入时直接解析文本
+
+    Returns:
+        (rows, aliases)，aliases 为 None 时由调用方自行计算
+    """
+    source, target = text_path(), db_path()
+    digest = file_digest(source) if os.path.exists(source) else None
+    try:
+        return read_city_db(target, digest)
+    except (OSError, ValueError):
+        pass
+    if digest is None:
+        raise FileNotFoundError(f"找不到城市数据：{source}、{target}")
+    try:
+        compile_city_db(source, target)
+        return read_city_db(target, digest)
+    except OSError:
+        return parse_city_rows(source), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='编译城市经纬度数据')
+    parser.add_argument('-i', '--input', default=text_path(), help='城市文本数据')
+    parser.add_argument('-o', '--output', default=db_path(), help='输出文件')
+    options = parser.parse_args()
+    compile_city_db(options.input, options.output)
+    print("写入", options.output)
+
+
+if __name__ == '__main__':
+    main()
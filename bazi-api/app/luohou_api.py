@@ -0,0 +1,49 @@
+# -*- encoding:utf-8 -*-
+"""
+罗喉日：调用仓库根目录的 luohou.py，一次推算一段日期，与命令行逐日打印的内容相同。
+
+一年约 4ms，历法查表（见根目录 calendar_backend.py），不调用 sxtwl 和 lunar_python。
+"""
+
+import datetime
+
+from .chart_api import engine_module
+
+# 一次最多的天数
+MAX_DAYS = 3660
+
+
+def engine():
+    """罗喉日引擎模块 luohou"""
+    return engine_module("luohou")
+
+
+def _day(item) -> dict:
+    return {
+        "公历": item.date.isoformat(),
+        "农历": {"年": item.lunar.year, "月": item.lunar.month, "日": item.lunar.day, "闰月": item.lunar.leap},
+        "八字": [gan + zhi for gan, zhi in zip(item.gans, item.zhis)],
+        "杀师时": list(item.shas),
+        "年猴": item.nian_hou,
+        "月罗": item.yue_luo,
+        "季猴": item.ji_hou or None,
+        "日九星": item.jiuxing,
+        "时飞星": dict(zip(engine().Zhi, item.feixings)),
+        "择日": list(item.zeri),
+    }
+
+
+def luohou_days(start: datetime.date, days: int, hou_only: bool = False) -> list:
+    """
+    start 起 days 天每天的罗喉日记录；hou_only 时只返回年猴、月罗或季猴的日子
+
+    Raises:
+        ValueError: 天数不在 1 至 MAX_DAYS 之间
+    """
+    if not 1 <= days <= MAX_DAYS:
+        raise ValueError(f"天数须在 1 至 {MAX_DAYS} 之间")
+    e = engine()
+    items = e.days(start, start + datetime.timedelta(days=days))
+    if hou_only:
+        items = (item for item in items if item.nian_hou or item.yue_luo or item.ji_hou)
+    return [_day(item) for item in items]
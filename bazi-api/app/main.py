@@ -1,9 +1,32 @@
+import asyncio
+import collections
+import datetime
+import os
+import time
+import uuid
+import orjson
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, conint
-from .bazi_core import solar_to_bazi
-from typing import Optional
+from .bazi_core import solar_to_bazi, bazi_batch, BaziResult
+from .workers import WorkerPool, Overloaded
+from .chart_api import chart_sections, parse_sections, profiling
+from .luohou_api import luohou_days
+from typing import List, Optional
 
-app = FastAPI(title="精准八字 API", version="2.0.0")
+# 设置后可在请求中加 profile=true，用 cProfile 剖析该请求，pstats 文件写到此目录
+PROFILE_DIR = os.environ.get("BAZI_PROFILE_DIR")
+
+pool = WorkerPool()
+
+@asynccontextmanager
+async def lifespan(app):
+    await pool.start()
+    yield
+    pool.shutdown()
+
+app = FastAPI(title="精准八字 API", version="2.0.0", lifespan=lifespan)
 
 class BaziRequest(BaseModel):
     name: str  # 必填字段
@@ -15,10 +38,187 @@ class BaziRequest(BaseModel):
     hour:  conint(ge=0,   le=23)
     minute: conint(ge=0, le=59) = 0  # 可选
 
-@app.post("/bazi")
-def get_bazi(req: BaziRequest):
+def json_response(data, pretty: bool = False) -> Response:
+    """用 orjson 编码一次直接返回，跳过 FastAPI 的再次校验和编码；pretty 时缩进"""
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    return Response(orjson.dumps(data, option=option), media_type="application/json")
+
+def profile_path(endpoint: str, profile: bool) -> Optional[str]:
+    """profile=true 时该请求的 pstats 文件路径，须设置 BAZI_PROFILE_DIR"""
+    if not profile:
+        return None
+    if not PROFILE_DIR:
+        raise HTTPException(status_code=400, detail="未设置 BAZI_PROFILE_DIR，不能剖析请求")
+    name = f"{endpoint}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.pstats"
+    return os.path.join(PROFILE_DIR, name)
+
+def with_profile(response: Response, path: Optional[str]) -> Response:
+    if path:
+        response.headers["X-Profile-File"] = path
+    return response
+
+class ChartRequest(BaseModel):
+    year:  conint(ge=1900, le=2100)
+    month: conint(ge=1,   le=12)
+    day:   conint(ge=1,   le=31)
+    hour:  conint(ge=0,   le=23)
+    gender: Optional[str] = "男"
+    lunar: bool = False  # 是否为农历
+    leap: bool = False   # 是否为闰月，仅用于农历
+
+@app.post("/bazi", response_model=BaziResult)
+async def get_bazi(req: BaziRequest, pretty: bool = False, profile: bool = False):
+    path = profile_path("bazi", profile)
     try:
-        result = solar_to_bazi(req.name, req.city, req.gender, req.year, req.month, req.day, req.hour, req.minute)
-        return result
+        with profiling.stage("http.bazi"):
+            result = await pool.run(solar_to_bazi, req.name, req.city, req.gender, req.year, req.month, req.day,
+                                    req.hour, req.minute, profile_path=path)
+    except Overloaded:
+        raise HTTPException(status_code=503, detail="服务繁忙，请稍后再试", headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="计算超时")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return with_profile(json_response(result, pretty), path)
+
+MAX_BATCH = 1000
+# 批量排盘每块的项数，每块是进程池中的一次调用
+BATCH_CHUNK = int(os.environ.get("BAZI_BATCH_CHUNK", "50"))
+
+def pool_error(e: Exception) -> HTTPException:
+    """进程池调用失败时的 HTTP 错误，与 /bazi 相同"""
+    if isinstance(e, Overloaded):
+        return HTTPException(status_code=503, detail="服务繁忙，请稍后再试", headers={"Retry-After": "1"})
+    if isinstance(e, asyncio.TimeoutError):
+        return HTTPException(status_code=504, detail="计算超时")
+    return HTTPException(status_code=500, detail=str(e))
+
+async def batch_chunks(reqs: List[BaziRequest]):
+    """
+    把批量请求按 BATCH_CHUNK 项分块交给进程池，同时在算的块不超过进程数，按顺序逐块产出各项的输出；
+    某块失败（排队已满、超时等）时抛出该异常，未取的块不再等待
+    """
+    items = [req.model_dump() for req in reqs]
+    running = collections.deque()
+    try:
+        for start in range(0, len(items), BATCH_CHUNK):
+            running.append((start, asyncio.ensure_future(pool.run(bazi_batch, items[start:start + BATCH_CHUNK]))))
+            if len(running) < max(pool.workers, 1):
+                continue
+            start, task = running.popleft()
+            yield batch_items(start, await task)
+        while running:
+            start, task = running.popleft()
+            yield batch_items(start, await task)
+    finally:
+        for _, task in running:
+            if task.done() and not task.cancelled():
+                # 取出异常以免告警
+                task.exception()
+            else:
+                task.cancel()
+
+def batch_items(start: int, chunk: list) -> list:
+    return [{"index": index, "result": result} if error is None else {"index": index, "error": error}
+            for index, (result, error) in enumerate(chunk, start)]
+
+@app.post("/bazi/batch")
+async def get_bazi_batch(reqs: List[BaziRequest], stream: bool = False, pretty: bool = False):
+    """
+    批量排盘，每项单独返回结果或错误；stream=true 时按 NDJSON 逐块输出，
+    已开始输出后某块失败时，该块及以后各项都返回同一个错误
+    """
+    if len(reqs) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"一次最多 {MAX_BATCH} 项")
+    chunks = batch_chunks(reqs)
+    try:
+        # 第一块算完再返回，排队已满或超时可以用状态码告诉调用方
+        first = await anext(chunks, [])
+    except Exception as e:
+        raise pool_error(e)
+    if stream:
+        async def lines():
+            done = 0
+            items = first
+            try:
+                while True:
+                    for item in items:
+                        yield orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+                    done += len(items)
+                    items = await anext(chunks, None)
+                    if items is None:
+                        return
+            except Exception as e:
+                error = pool_error(e).detail
+                for index in range(done, len(reqs)):
+                    yield orjson.dumps({"index": index, "error": error}, option=orjson.OPT_APPEND_NEWLINE)
+            finally:
+                await chunks.aclose()
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    results = list(first)
+    try:
+        async for items in chunks:
+            results.extend(items)
+    except Exception as e:
+        raise pool_error(e)
+    return json_response({"results": results}, pretty)
+
+@app.post("/chart")
+async def get_chart(req: ChartRequest, sections: Optional[str] = None, pretty: bool = False, profile: bool = False,
+                    from_year: Optional[int] = None, to_year: Optional[int] = None):
+    """
+    完整排盘，与 bazi.py 用同一引擎；sections 为逗号分隔的部分：
+    pillars,scores,relations,shensha,calendar,yuns,findings,texts，all 为全部，默认为前五项；
+    from_year、to_year 限定 yuns 中流年的范围（含两端），用于按年份翻页
+    """
+    try:
+        names = parse_sections(sections)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    path = profile_path("chart", profile)
+    try:
+        with profiling.stage("http.chart"):
+            result = await pool.run(chart_sections, req.year, req.month, req.day, req.hour,
+                                    req.gender, req.lunar, req.leap, names, from_year, to_year, profile_path=path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Overloaded:
+        raise HTTPException(status_code=503, detail="服务繁忙，请稍后再试", headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="计算超时")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return with_profile(json_response(result, pretty), path)
+
+@app.get("/luohou")
+def get_luohou(start: Optional[datetime.date] = None, days: int = 32, hou: bool = False, pretty: bool = False):
+    """
+    start（默认今天）起 days 天的罗喉日，与 luohou.py 相同：八字、杀师时、年猴、月罗、季猴、日九星、时飞星和择日；
+    hou=true 时只返回有年猴、月罗或季猴的日子
+    """
+    try:
+        with profiling.stage("http.luohou"):
+            result = luohou_days(start or datetime.date.today(), days, hou)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response({"days": result}, pretty)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus 文本格式的指标：进程池的排队数，以及 BAZI_PROFILE=1 时各阶段的次数、耗时和计数器；
+    各阶段统计包括工作进程中的排盘，随每个请求的结果带回合并
+    """
+    lines = [
+        "# HELP bazi_pool_pending 在算和排队的请求数",
+        "# TYPE bazi_pool_pending gauge",
+        f"bazi_pool_pending {pool.pending}",
+        "# HELP bazi_pool_workers 工作进程数，0 为不用进程池",
+        "# TYPE bazi_pool_workers gauge",
+        f"bazi_pool_workers {max(pool.workers, 0)}",
+        "# HELP bazi_profile_enabled 是否打开阶段统计",
+        "# TYPE bazi_profile_enabled gauge",
+        f"bazi_profile_enabled {int(profiling.enabled)}",
+    ]
+    return PlainTextResponse("\n".join(lines) + "\n" + profiling.prometheus(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,136 @@
+# -*- encoding:utf-8 -*-
+"""
+排盘结果缓存：内存 LRU，可选过期时间，可选落盘存储（重启后仍然有效）。
+
+环境变量：
+    BAZI_CACHE_SIZE  内存中最多缓存的条数，默认 10000，0 表示不缓存
+    BAZI_CACHE_TTL   过期秒数，默认不过期
+    BAZI_CACHE_PATH  落盘的 sqlite 文件，默认不落盘
+"""
+
+import collections
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class DiskStore:
+    """sqlite 存储，值为 JSON，作为内存缓存的第二级"""
+
+    def __init__(self, path: str):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, created REAL)")
+        self.conn.commit()
+
+    def get(self, key: str):
+        """返回 (值, 写入时间)，没有时返回 None"""
+        with self.lock:
+            row = self.conn.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value, created: float):
+        data = json.dumps(value, ensure_ascii=False)
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (key, data, created))
+            self.conn.commit()
+
+    def delete(self, key: str):
+        with self.lock:
+            self.conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            self.conn.commit()
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM results")
+            self.conn.commit()
+
+
+class ResultCache:
+    """
+    LRU 缓存，线程安全
+
+    Args:
+        maxsize: 内存中最多的条数，超出时淘汰最久未用的
+        ttl: 过期秒数，None 表示不过期
+        store: 第二级存储（如 DiskStore），内存未命中时查找，写入时同时写入
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = None, store=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self.data = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key):
+        """缓存的值，没有或已过期时返回 None"""
+        with self.lock:
+            item = self.data.get(key)
+            if item is not None:
+                if not self._expired(item[1]):
+                    self.data.move_to_end(key)
+                    self.hits += 1
+                    return item[0]
+                del self.data[key]
+                self.expirations += 1
+
+        if self.store is not None:
+            item = self.store.get(repr(key))
+            if item is not None:
+                if not self._expired(item[1]):
+                    with self.lock:
+                        self.hits += 1
+                        self._put(key, item)
+                    return item[0]
+                self.store.delete(repr(key))
+                with self.lock:
+                    self.expirations += 1
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def _put(self, key, item):
+        self.data[key] = item
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, key, value):
+        item = (value, time.time())
+        with self.lock:
+            self._put(key, item)
+        if self.store is not None:
+            self.store.set(repr(key), value, item[1])
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> dict:
+        """命中、未命中、淘汰、过期次数和当前条数"""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "expirations": self.expirations, "size": len(self.data), "maxsize": self.maxsize}
+
+
+def from_env():
+    """按环境变量创建缓存，BAZI_CACHE_SIZE 为 0 时返回 None"""
+    maxsize = int(os.environ.get("BAZI_CACHE_SIZE", "10000"))
+    if maxsize <= 0:
+        return None
+    ttl = os.environ.get("BAZI_CACHE_TTL")
+    path = os.environ.get("BAZI_CACHE_PATH")
+    return ResultCache(maxsize, float(ttl) if ttl else None, DiskStore(path) if path else None)
@@ -0,0 +1,128 @@
+# -*- encoding:utf-8 -*-
+"""
+排盘进程池：异步接口把计算交给多个进程，绕开 GIL，单个容器也能用满多核。
+
+环境变量：
+    BAZI_WORKERS  进程数，默认为 CPU 核数，0 表示不用进程池，在线程池中计算
+    BAZI_QUEUE    同时在算和排队的请求上限，超出时返回 503，默认为进程数的 4 倍
+    BAZI_TIMEOUT  单个请求的超时秒数，默认 10
+
+打开统计（BAZI_PROFILE=1）时，各进程的阶段统计（含排盘引擎的）随结果带回主进程合并，见根目录 profiling.py。
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from .chart_api import engine_module, profiling
+
+
+class Overloaded(Exception):
+    """排队的请求已满"""
+
+
+def warm_up():
+    """进程启动时预先导入模块、加载城市索引和历法，第一个请求不用等"""
+    from . import bazi_core
+    bazi_core.get_city_index()
+    bazi_core.day_info(2000, 1, 1)
+    bazi_core.qi_yun(datetime(2000, 1, 1), True)
+    try:
+        from .chart_api import engine
+        engine()
+    except ImportError:
+        # 没有排盘引擎时 /chart 不可用，不影响其他接口
+        pass
+    return os.getpid()
+
+
+def prepare_data():
+    """
+    生成排盘引擎缺失或过期的数据文件（历法表、交节时刻表、古籍），
+    在创建进程池之前于主进程中执行，免得各工作进程同时生成同一个文件
+    """
+    try:
+        engine_module("calendar_backend").get_backend()
+        engine_module("jieqi_table").get_table()
+        engine_module("corpus").get_corpus()
+    except ImportError:
+        pass
+
+
+def call(func, args, profile_path: str = None):
+    """
+    在工作进程中执行 func(*args)，profile_path 不为空时用 cProfile 剖析并写入该文件
+
+    Returns:
+        (结果, 本进程积累的阶段统计列表)，没有打开统计时统计为 None
+    """
+    if profile_path:
+        with profiling.profile(profile_path):
+            result = func(*args)
+    else:
+        result = func(*args)
+    if not profiling.enabled:
+        return result, None
+    return result, [profiling.drain()]
+
+
+class WorkerPool:
+
+    def __init__(self, workers: int = None, queue: int = None, timeout: float = None):
+        if workers is None:
+            workers = int(os.environ.get("BAZI_WORKERS", os.cpu_count() or 1))
+        if queue is None:
+            queue = int(os.environ.get("BAZI_QUEUE", max(workers, 1) * 4))
+        if timeout is None:
+            timeout = float(os.environ.get("BAZI_TIMEOUT", "10"))
+        self.workers = workers
+        self.queue = queue
+        self.timeout = timeout
+        self.executor = None
+        self.pending = 0
+
+    async def start(self):
+        """创建进程池，并让每个进程都先预热"""
+        if self.executor is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if self.workers <= 0:
+            await loop.run_in_executor(None, warm_up)
+            self.executor = False
+            return
+        await loop.run_in_executor(None, prepare_data)
+        self.executor = ProcessPoolExecutor(self.workers, initializer=warm_up)
+        await asyncio.gather(*(loop.run_in_executor(self.executor, warm_up) for _ in range(self.workers)))
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+
+    def _done(self, future):
+        self.pending -= 1
+        if not future.cancelled():
+            # 超时后已无人等待的结果，取出异常以免告警
+            future.exception()
+
+    async def run(self, func, *args, profile_path: str = None):
+        """
+        在进程池中执行 func(*args)，func 须为可导入的模块级函数；profile_path 见 call
+
+        Raises:
+            Overloaded: 排队已满
+            asyncio.TimeoutError: 超时；进程中的计算不会中断，算完前仍占用名额
+        """
+        if self.executor is None:
+            await self.start()
+        if self.pending >= self.queue:
+            raise Overloaded()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor or None, call, func, args, profile_path)
+        self.pending += 1
+        future.add_done_callback(self._done)
+        result, stats = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        for item in stats or ():
+            profiling.merge(item)
+        return result
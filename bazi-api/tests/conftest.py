@@ -0,0 +1,9 @@
+# -*- encoding:utf-8 -*-
+"""测试导入 bazi-api 的 app 包"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,31 @@
+# -*- encoding:utf-8 -*-
+"""城市索引的精确名称与原来的 city_coordinates 相同：按文件顺序，后出现的覆盖先出现的"""
+
+import pytest
+
+from app import bazi_core
+from app.city_db import parse_city_rows, text_path
+
+
+@pytest.fixture(scope="module")
+def index():
+    return bazi_core.get_city_index()
+
+
+@pytest.mark.parametrize("name, full", [
+    ("海南", "海南省"),
+    ("河北", "河北省"),
+    ("海南省", "海南省"),
+    ("河北区", "河北区"),
+    ("上海", "上海市"),
+])
+def test_exact(index, name, full):
+    assert index.rows[index.lookup_id(name)][1] == full
+    assert index.lookup(name) == index.exact[full]
+
+
+def test_exact_last_row_wins(index):
+    expected = {}
+    for _, name, lng, lat in parse_city_rows(text_path()):
+        expected[name] = (lng, lat)
+    assert {name: index.exact[name] for name in expected} == expected
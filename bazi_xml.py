@@ -12,7 +12,6 @@ from lunar_python import Lunar, Solar
 from datas import *
 from common import *
 from ganzhi import *
-from yue import months
 
 def create_bazi_xml(name, birthplace, year, month, day, time, is_female=False, is_lunar=False):
     """
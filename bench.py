@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 性能基准：单次排盘延迟、批量吞吐、冷启动导入时间、bazi-api 并发压测的 p50/p99，以及各项的峰值内存。
+# 出生数据按种子生成，年份 1900–2100，城市轮流取 bazi-api/app/data.txt 中的全部城市，同一种子每次相同。
+# 每项在单独的子进程中运行，峰值内存互不影响。结果存为 JSON（默认 data/bench/），并与上一次结果比较。
+#
+# 运行: python bench.py                       全部测试，与上一次结果比较
+#       python bench.py -s latency,batch -q   只跑部分测试，数据量减小
+#       python bench.py --compare data/bench/20240101-120000.json
+# 压测需要安装 uvicorn（见 bazi-api/requirements.txt），没有时跳过。
+
+import argparse
+import datetime
+import glob
+import http.client
+import importlib.util
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from common import data_path
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(BASE, 'bazi-api')
+SUITES = ('latency', 'batch', 'import', 'api')
+# 导入时间：(模块, 运行目录)
+IMPORTS = (('bazi', BASE), ('bazi_xml', BASE), ('app.bazi_core', API_DIR))
+FIRST_DAY = datetime.date(1900, 1, 1).toordinal()
+LAST_DAY = datetime.date(2100, 12, 31).toordinal()
+
+
+def cities():
+    '''bazi-api 城市数据中的全部城市名'''
+    sys.path.insert(0, API_DIR)
+    try:
+        from app.city_db import parse_city_rows, text_path
+    finally:
+        sys.path.remove(API_DIR)
+    return [row[1] for row in parse_city_rows(text_path())]
+
+
+def births(size, seed):
+    '''按种子生成的出生数据：[(年, 月, 日, 时, 分, 性别, 城市)]，城市打乱后依次轮流使用'''
+    rng = random.Random(seed)
+    names = cities()
+    rng.shuffle(names)
+    items = []
+    for seq in range(size):
+        day = datetime.date.fromordinal(rng.randint(FIRST_DAY, LAST_DAY))
+        items.append((day.year, day.month, day.day, rng.randrange(24), rng.randrange(60),
+                      rng.choice('男女'), names[seq % len(names)]))
+    return items
+
+
+def fingerprint(items):
+    return '{:08x}'.format(zlib.crc32(json.dumps(items, ensure_ascii=False).encode('utf-8')))
+
+
+def percentiles(values):
+    '''毫秒数的统计'''
+    values = sorted(values)
+    pick = lambda ratio: values[min(int(len(values) * ratio), len(values) - 1)]
+    return {'mean_ms': statistics.fmean(values), 'p50_ms': pick(0.5), 'p90_ms': pick(0.9),
+            'p99_ms': pick(0.99), 'max_ms': values[-1]}
+
+
+def peak_rss_mb(pid='self'):
+    '''进程的峰值内存（VmHWM）。ru_maxrss 在 fork、exec 后沿用父进程的值，只在没有 /proc 时用于当前进程'''
+    try:
+        with open('/proc/{}/status'.format(pid)) as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if pid == 'self':
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return None
+
+
+def _child_pids(pid):
+    try:
+        with open('/proc/{0}/task/{0}/children'.format(pid)) as f:
+            return [int(item) for item in f.read().split()]
+    except OSError:
+        return []
+
+
+# 以下各项在子进程中运行，返回结果字典
+
+def suite_latency(options):
+    '''单次排盘：chart.py 只排四柱、chart.py 连同大运流年和断语、bazi-api 的 calc_bazi（不缓存）'''
+    from chart import compute_chart
+    sys.path.insert(0, API_DIR)
+    from app import bazi_core
+
+    items = births(options.size, options.seed)[:options.charts]
+    results = {}
+
+    def measure(name, func):
+        func(*items[0])
+        times = []
+        for item in items:
+            start = time.perf_counter()
+            func(*item)
+            times.append((time.perf_counter() - start) * 1000)
+        results[name] = percentiles(times)
+
+    def static(year, month, day, hour, minute, gender, city):
+        return compute_chart(year, month, day, hour, gregorian=True, female=gender == '女')
+
+    def full(year, month, day, hour, minute, gender, city):
+        chart = static(year, month, day, hour, minute, gender, city)
+        return chart.yuns, chart.ge, chart.month_text, chart.summary_text
+
+    def api(year, month, day, hour, minute, gender, city):
+        return bazi_core.calc_bazi('', city, gender, year, month, day, hour, minute)
+
+    measure('chart', static)
+    measure('chart_full', full)
+    measure('calc_bazi', api)
+    results['rss_mb'] = peak_rss_mb()
+    return results
+
+
+def suite_batch(options):
+    '''批量：chart_batch 的 numpy 查表、bazi-api 的 calc_bazi_batch（不缓存）'''
+    from chart import compute_chart
+    from chart_batch import compute_charts_batch
+    sys.path.insert(0, API_DIR)
+    from app import bazi_core
+
+    items = births(options.size, options.seed)
+    results = {}
+
+    pillars = []
+    for year, month, day, hour, minute, gender, city in items:
+        chart = compute_chart(year, month, day, hour, gregorian=True)
+        pillars.append([value for pair in zip(chart.gan_ids, chart.zhi_ids) for value in pair])
+    compute_charts_batch(pillars[:10])
+    start = time.perf_counter()
+    for _ in range(options.rounds):
+        compute_charts_batch(pillars)
+    elapsed = time.perf_counter() - start
+    results['chart_batch'] = {'charts_per_s': len(pillars) * options.rounds / elapsed}
+
+    keys = ('year', 'month', 'day', 'hour', 'minute', 'gender', 'city')
+    requests = [dict(zip(keys, item), name='') for item in items]
+    start = time.perf_counter()
+    errors = sum(error is not None for _, error in bazi_core.calc_bazi_batch(requests))
+    elapsed = time.perf_counter() - start
+    results['calc_bazi_batch'] = {'charts_per_s': len(requests) / elapsed, 'errors': errors}
+    results['rss_mb'] = peak_rss_mb()
+    return results
+
+
+def _import_once(module, cwd):
+    code = ('import sys, time\n'
+            'sys.path.insert(0, "")\n'
+            'start = time.perf_counter()\n'
+            'import {}\n'
+            'elapsed = time.perf_counter() - start\n'
+            'sys.path.insert(0, {!r})\n'
+            'import bench\n'
+            'print(elapsed, bench.peak_rss_mb())\n').format(module, BASE)
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    output = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+    return float(output[-2]) * 1000, float(output[-1])
+
+
+def suite_import(options):
+    '''冷启动：每次新开解释器导入模块；第一次不计，用于写入 .pyc'''
+    results = {}
+    for module, cwd in IMPORTS:
+        _import_once(module, cwd)
+        runs = [_import_once(module, cwd) for _ in range(options.imports)]
+        results[module] = {'import_ms': statistics.median(item[0] for item in runs),
+                           'rss_mb': max(item[1] for item in runs)}
+    return results
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(port, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn 已退出，返回码 {}".format(server.returncode))
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/openapi.json')
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn {} 秒内没有启动".format(timeout))
+
+
+def _load(port, path, bodies, concurrency):
+    '''concurrency 个连接各自保持长连接，依次发送 bodies 中的请求，返回 (延迟毫秒数, 失败数, 耗时)'''
+    chunks = [bodies[seq::concurrency] for seq in range(concurrency)]
+
+    def worker(chunk):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        times, errors = [], 0
+        for body in chunk:
+            start = time.perf_counter()
+            try:
+                conn.request('POST', path, body, {'Content-Type': 'application/json'})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            times.append((time.perf_counter() - start) * 1000)
+        conn.close()
+        return times, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        outputs = list(executor.map(worker, chunks))
+    elapsed = time.perf_counter() - start
+    return [value for times, _ in outputs for value in times], sum(errors for _, errors in outputs), elapsed
+
+
+def suite_api(options):
+    '''本机启动 uvicorn，对 /bazi 和 /chart 并发压测；默认关闭结果缓存'''
+    if importlib.util.find_spec('uvicorn') is None:
+        return {'skipped': 'uvicorn 未安装'}
+
+    items = births(options.size, options.seed)[:options.requests]
+    port = _free_port()
+    env = dict(os.environ)
+    if not options.api_cache:
+        env['BAZI_CACHE_SIZE'] = '0'
+    server = subprocess.Popen([sys.executable, '-m', 'uvicorn', 'app.main:app', '--host', '127.0.0.1',
+                               '--port', str(port), '--log-level', 'warning'], cwd=API_DIR, env=env)
+    results = {}
+    try:
+        _wait_ready(port, server)
+        endpoints = {
+            'bazi': ('/bazi', [{'name': '', 'city': city, 'gender': gender, 'year': year, 'month': month,
+                                'day': day, 'hour': hour, 'minute': minute}
+                               for year, month, day, hour, minute, gender, city in items]),
+            'chart': ('/chart?sections=all', [{'year': year, 'month': month, 'day': day, 'hour': hour,
+                                               'gender': gender}
+                                              for year, month, day, hour, minute, gender, city in items]),
+        }
+        for name, (path, bodies) in endpoints.items():
+            bodies = [json.dumps(body, ensure_ascii=False).encode('utf-8') for body in bodies]
+            _load(port, path, bodies[:options.concurrency * 2], options.concurrency)
+            times, errors, elapsed = _load(port, path, bodies, options.concurrency)
+            results['api_' + name] = dict(percentiles(times), requests_per_s=len(bodies) / elapsed, errors=errors)
+        rss = [peak_rss_mb(pid) for pid in [server.pid] + _child_pids(server.pid)]
+        results['server_rss_mb'] = sum(item for item in rss if item is not None)
+    finally:
+        server.terminate()
+        try:
+            server.wait(10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    results['concurrency'] = options.concurrency
+    return results
+
+
+def run_suite(name, options):
+    '''在子进程中运行一项测试，返回结果字典'''
+    args = [sys.executable, os.path.abspath(__file__), '--child', name]
+    for key in ('size', 'seed', 'charts', 'rounds', 'imports', 'requests', 'concurrency'):
+        args += ['--' + key, str(getattr(options, key))]
+    if options.api_cache:
+        args.append('--api-cache')
+    env = dict(os.environ)
+    if name != 'api':
+        env['BAZI_CACHE_SIZE'] = '0'
+    output = subprocess.run(args, cwd=BASE, env=env, check=True, stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def _git_revision():
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE, stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL, universal_newlines=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BASE,
+                               stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+        return revision + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results):
+    '''{(测试, 项目, 指标): 数值}'''
+    items = {}
+    for suite, values in results.items():
+        for name, value in values.items():
+            if isinstance(value, dict):
+                for metric, number in value.items():
+                    items[suite, name, metric] = number
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                items[suite, '', name] = value
+    return items
+
+
+def compare(previous, current, threshold):
+    '''打印与上次结果的差异，返回变差超过 threshold（百分比）的指标'''
+    if previous['meta'].get('dataset') != current['meta'].get('dataset'):
+        print("注意：两次的出生数据不同（种子或数量不同），结果不可直接比较")
+    old, new = flatten(previous['results']), flatten(current['results'])
+    worse = []
+    print("{:<40} {:>12} {:>12} {:>9}".format('与 ' + previous['meta']['time'] + ' 比较', '上次', '本次', '变化'))
+    for key in sorted(new):
+        if key not in old or key[2] in ('errors', 'concurrency') or not old[key]:
+            continue
+        change = (new[key] - old[key]) / old[key] * 100
+        # 吞吐越大越好，其余（毫秒、内存）越小越好
+        better = change > 0 if key[2].endswith('_per_s') else change < 0
+        mark = ''
+        if abs(change) >= threshold:
+            mark = '好' if better else '差'
+            if not better:
+                worse.append(key)
+        print("{:<40} {:>12.3f} {:>12.3f} {:>+8.1f}% {}".format(
+            '.'.join(item for item in key if item), old[key], new[key], change, mark))
+    return worse
+
+
+def latest_result(directory):
+    files = sorted(glob.glob(os.path.join(directory, '*.json')))
+    return files[-1] if files else None
+
+
+def report(results):
+    for key, value in sorted(flatten(results).items()):
+        print("{:<40} {:>12.3f}".format('.'.join(item for item in key if item), value))
+    for suite, values in results.items():
+        if 'skipped' in values:
+            print("{}: 跳过，{}".format(suite, values['skipped']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='排盘性能基准')
+    parser.add_argument('-s', '--suites', default=','.join(SUITES), help='逗号分隔的测试：' + ','.join(SUITES))
+    parser.add_argument('-q', '--quick', action='store_true', default=False, help='数据量减小，用于快速检查')
+    parser.add_argument('--seed', type=int, default=20240801, help='出生数据的种子')
+    parser.add_argument('--size', type=int, default=5000, help='出生数据条数，批量测试全部使用')
+    parser.add_argument('--charts', type=int, default=1000, help='单次排盘测试的条数')
+    parser.add_argument('--rounds', type=int, default=20, help='numpy 批量测试的轮数')
+    parser.add_argument('--imports', type=int, default=5, help='每个模块冷启动导入的次数')
+    parser.add_argument('--requests', type=int, default=2000, help='每个接口压测的请求数')
+    parser.add_argument('-c', '--concurrency', type=int, default=16, help='压测的并发连接数')
+    parser.add_argument('--api-cache', action='store_true', default=False, help='压测时保留 bazi-api 的结果缓存')
+    parser.add_argument('-o', '--output', default=data_path('bench'), help='结果目录')
+    parser.add_argument('--compare', default='latest', help='比较的结果文件，latest 为目录中最近一次，none 为不比较')
+    parser.add_argument('--threshold', type=float, default=10, help='变化超过该百分比时标记')
+    parser.add_argument('--check', action='store_true', default=False, help='有指标变差超过阈值时返回 1')
+    parser.add_argument('--child', choices=SUITES, help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.child:
+        print(json.dumps(globals()['suite_' + options.child](options)))
+        return 0
+
+    if options.quick:
+        options.size, options.charts, options.rounds = 1000, 200, 5
+        options.imports, options.requests = 2, 300
+    names = [item for item in options.suites.split(',') if item]
+    unknown = set(names) - set(SUITES)
+    if unknown:
+        parser.error("没有这些测试：" + ','.join(sorted(unknown)))
+
+    previous = None
+    path = latest_result(options.output) if options.compare == 'latest' else options.compare
+    if path and path != 'none':
+        with open(path, encoding='utf-8') as f:
+            previous = json.load(f)
+
+    now = datetime.datetime.now()
+    current = {
+        'meta': {
+            'time': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'dataset': {'seed': options.seed, 'size': options.size,
+                        'fingerprint': fingerprint(births(options.size, options.seed))},
+            'options': {key: getattr(options, key) for key in
+                        ('charts', 'rounds', 'imports', 'requests', 'concurrency', 'api_cache')},
+        },
+        'results': {},
+    }
+    for name in names:
+        print("运行", name, "...", file=sys.stderr)
+        current['results'][name] = run_suite(name, options)
+
+    os.makedirs(options.output, exist_ok=True)
+    target = os.path.join(options.output, now.strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    print("写入", target)
+
+    if previous is None:
+        report(current['results'])
+        return 0
+    worse = compare(previous, current, options.threshold)
+    return 1 if options.check and worse else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 四柱反查出生时间的索引：对一段年份内的每个时辰算出四柱，按四柱排序后存盘，
+# 查询时 mmap 打开二分查找，不再逐年推算历法。
+# 每个时辰取其起点：子时为 0 点，丑时 1 点……亥时 21 点，与 sxtwl.siZhu2Year 相同，年份范围也同样按年柱（立春起）计。
+# 节气当天按时辰起点是否已过交节时刻定月柱、年柱，与 bazi.py -g 排出的四柱一致；
+# siZhu2Year 在交节当天会漏掉交节后的几个时辰，索引不会。
+#
+# 生成: python birth_index.py [-o 输出文件] [--start 1600] [--end 2200]
+
+import argparse
+import bisect
+import datetime
+import mmap
+import os
+import struct
+
+import sxtwl
+
+from common import atomic_write, data_path
+from ganzhi_codes import *
+
+MAGIC = b'BZBI'
+VERSION = 1
+# magic, version, 起始年, 结束年, 起始日的公历序数, 条数；其后为每年立春的时辰序号和按四柱排序的记录
+HEADER = struct.Struct('<4sIiiII')
+START = 1600
+END = 2200
+# JD 与 datetime.date 序数之差（公元1年1月1日0时的 JD 为 1721425.5）
+ORDINAL_JD = 1721425
+
+
+def pillars_key(gans, zhis):
+    '''四柱编号打包为整数：年、月、日、时的六十甲子编号依次为 60 进制的各位'''
+    key = 0
+    for gan, zhi in zip(gans, zhis):
+        key = key * 60 + ganzhi_id(gan, zhi)
+    return key
+
+
+def slot_hour(slot):
+    '''时辰起点的小时数'''
+    return 0 if slot == 0 else slot * 2 - 1
+
+
+def _jies(start, end):
+    '''start 年立春到 end+1 年立春之间的节，返回 [(交节时刻 JD, 年柱编号, 月柱编号)]，最后一项为 end+1 年立春'''
+    result = []
+    for year in range(start, end + 2):
+        jies = [item.jd for item in sxtwl.getJieQiByYear(year) if item.jqIndex % 2 == 1][:12]
+        # 立春之后一天的月柱即寅月的月柱，其后每个节月柱编号加一
+        day = datetime.date.fromordinal(int(jies[0] + 0.5) - ORDINAL_JD + 1)
+        month = sxtwl.fromSolar(day.year, day.month, day.day).getMonthGZ()
+        first = ganzhi_id(month.tg, month.dz)
+        for seq, jd in enumerate(jies):
+            result.append((jd, (year - 4) % 60, (first + seq) % 60))
+    return result[:(end - start + 1) * 12 + 1]
+
+
+def build(path, start=START, end=END):
+    '''生成 start 年立春到 end+1 年立春之间全部时辰的索引，年份按年柱计'''
+    if start < 1583 or end < start:
+        raise ValueError("年份范围不对：{}-{}".format(start, end))
+    jies = _jies(start, end)
+    base = int(jies[0][0] + 0.5) - ORDINAL_JD
+    days = int(jies[-1][0] + 0.5) - ORDINAL_JD - base + 1
+
+    items = []
+    # 每年立春后第一个时辰的序号
+    springs = []
+    seq = 0
+    for day in range(days):
+        jd = base + day + ORDINAL_JD - 0.5
+        day_id = int(jd + 0.5 + 49) % 60
+        for slot in range(12):
+            moment = jd + slot_hour(slot) / 24
+            while seq < len(jies) - 1 and jies[seq + 1][0] <= moment:
+                seq += 1
+            if seq % 12 == 0 and len(springs) * 12 <= seq and moment >= jies[seq][0]:
+                springs.append(day * 12 + slot)
+            if moment < jies[0][0] or seq == len(jies) - 1:
+                continue
+            _, year_id, month_id = jies[seq]
+            time_id = ganzhi_id((day_id % 5 * 2 + slot) % 10, slot)
+            key = ((year_id * 60 + month_id) * 60 + day_id) * 60 + time_id
+            items.append(key << 32 | day * 12 + slot)
+    items.sort()
+    assert len(springs) == end - start + 2
+
+    with atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, start, end, base, len(items)))
+        f.write(struct.pack('<{}I'.format(len(springs)), *springs))
+        f.write(struct.pack('<{}Q'.format(len(items)), *items))
+
+
+class BirthIndex:
+    '''mmap 打开的四柱反查索引'''
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.start, self.end, self.base, count = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} 不是四柱反查索引".format(path))
+        offset = HEADER.size + (self.end - self.start + 2) * 4
+        if len(self.mm) != offset + count * 8:
+            raise ValueError("{} 长度不对".format(path))
+        self.springs = memoryview(self.mm)[HEADER.size:offset].cast('I')
+        self.items = memoryview(self.mm)[offset:].cast('Q')
+
+    def _slot(self, year):
+        '''year 年立春后第一个时辰的序号'''
+        return self.springs[min(max(year, self.start), self.end + 1) - self.start]
+
+    def lookup(self, gans, zhis, start=None, end=None):
+        '''gans、zhis 为四柱的天干、地支编号，返回年柱在 start 年到 end 年（含）的可能出生时间，按时间排序'''
+        key = pillars_key(gans, zhis) << 32
+        low = key | self._slot(self.start if start is None else start)
+        high = key | self._slot((self.end if end is None else end) + 1)
+        result = []
+        for i in range(bisect.bisect_left(self.items, low), bisect.bisect_left(self.items, high)):
+            day, slot = divmod(self.items[i] & 0xFFFFFFFF, 12)
+            date = datetime.date.fromordinal(self.base + day)
+            result.append(datetime.datetime(date.year, date.month, date.day, slot_hour(slot)))
+        return result
+
+    def covers(self, start, end):
+        return self.start <= start and end <= self.end
+
+    def close(self):
+        self.springs.release()
+        self.items.release()
+        self.mm.close()
+
+
+def default_path():
+    return os.environ.get('BAZI_BIRTH_INDEX', data_path('birth_index.bin'))
+
+
+_index = None
+
+def get_index():
+    '''默认路径的索引，不存在时返回 None'''
+    global _index
+    if _index is None:
+        try:
+            _index = BirthIndex(default_path())
+        except (OSError, ValueError):
+            _index = False
+    return _index or None
+
+
+def lookup(gans, zhis, start=1850, end=2030):
+    '''四柱可能的出生时间，gans、zhis 为汉字。
+    索引覆盖该年份范围时查索引，否则用 sxtwl.siZhu2Year 现算。
+    '''
+    gans = tuple(gan_ids[item] for item in gans)
+    zhis = tuple(zhi_ids[item] for item in zhis)
+    index = get_index()
+    if index is not None and index.covers(start, end):
+        return index.lookup(gans, zhis, start, end)
+    result = []
+    gzs = [sxtwl.GZ(gan, zhi) for gan, zhi in zip(gans, zhis)]
+    for jd in sxtwl.siZhu2Year(*gzs, start, end):
+        t = sxtwl.JD2DD(jd)
+        result.append(datetime.datetime(int(t.Y), int(t.M), int(t.D), int(t.h), int(t.m), round(t.s)))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成四柱反查出生时间的索引')
+    parser.add_argument('-o', '--output', default=default_path(), help='输出文件')
+    parser.add_argument('--start', type=int, default=START, help='起始年')
+    parser.add_argument('--end', type=int, default=END, help='结束年（含）')
+    options = parser.parse_args()
+    build(options.output, options.start, options.end)
+    print("写入", options.output)
+
+
+if __name__ == '__main__':
+    main()
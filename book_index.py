@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# books/ 和 examples/ 的全文检索：按标题把 markdown 切成段落，汉字按单字和相邻两字建倒排索引，
+# 查询时先用索引求出候选段落，再核对原文是否包含查询词，按 BM25 排序。
+# 索引存为 data/book_index.bin，文件头记录各 markdown 的大小和修改时间，文件改动后自动重建。
+#
+# 查询: python book_index.py 正官 财印
+#       python book_index.py -c 1977 8 11 19 -g      按八字的格局、日主和月令查询
+
+import argparse
+import array
+import collections
+import glob
+import marshal
+import math
+import os
+import re
+import struct
+
+from common import atomic_write, data_path
+
+MAGIC = b'BZBX'
+VERSION = 1
+BASE = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIRS = ('books', 'examples')
+
+Section = collections.namedtuple("Section", "path line title text")
+Hit = collections.namedtuple("Hit", "score section snippet")
+
+_HEADING = re.compile(r'^(#{1,6})\s*(.+?)\s*#*\s*$')
+_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+# 目录行：只有一个页内链接的列表项
+_TOC = re.compile(r'^\s*[*-]\s*\[[^\]]*\]\(#[^)]*\)\s*$')
+# 汉字连续的一段，或一个英文单词、数字
+_TOKEN = re.compile(r'[㐀-鿿]+|[A-Za-z0-9]+')
+
+# 格的名称，键为 Chart.ge
+GE_TERMS = {
+    '建': ('建禄',), '月刃': ('月刃', '阳刃'),
+    '比': ('建禄',), '劫': ('月劫', '阳刃'),
+    '食': ('食神',), '伤': ('伤官',), '才': ('偏财',), '财': ('正财', '财格'),
+    '杀': ('偏官', '七杀', '七煞'), '官': ('正官',), '枭': ('偏印',), '印': ('正印', '印绶'),
+}
+
+
+def sources():
+    return sorted(path for name in SOURCE_DIRS for path in glob.glob(os.path.join(BASE, name, '*.md')))
+
+
+def sources_digest(paths):
+    '''各文件的路径、大小和修改时间'''
+    items = []
+    for path in paths:
+        stat = os.stat(path)
+        items.append((os.path.relpath(path, BASE), stat.st_size, stat.st_mtime_ns))
+    return items
+
+
+def split_sections(path):
+    '''按标题切分 markdown，标题之前的内容以文件名为标题'''
+    rel = os.path.relpath(path, BASE)
+    sections = []
+    title, start, lines = os.path.splitext(os.path.basename(path))[0], 1, []
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            match = _HEADING.match(line)
+            if match:
+                if ''.join(lines).strip():
+                    sections.append(Section(rel, start, title, ''.join(lines).strip()))
+                title, start, lines = _LINK.sub(r'\1', match.group(2)).strip(), number, []
+            elif not _TOC.match(line):
+                lines.append(_LINK.sub(r'\1', line))
+    if ''.join(lines).strip():
+        sections.append(Section(rel, start, title, ''.join(lines).strip()))
+    return sections
+
+
+def tokenize(text):
+    '''汉字取单字和相邻两字，英文、数字取整个词（小写）'''
+    tokens = []
+    for item in _TOKEN.findall(text):
+        if item.isascii():
+            tokens.append(item.lower())
+            continue
+        tokens.extend(item)
+        tokens.extend(item[i:i+2] for i in range(len(item) - 1))
+    return tokens
+
+
+def _query_tokens(term):
+    '''查询词用到的词元：两字以上只用相邻两字，一个字时用单字'''
+    tokens = []
+    for item in _TOKEN.findall(term):
+        if item.isascii():
+            tokens.append(item.lower())
+        elif len(item) == 1:
+            tokens.append(item)
+        else:
+            tokens.extend(item[i:i+2] for i in range(len(item) - 1))
+    return tokens
+
+
+class BookIndex:
+    '''段落和倒排索引，postings 为 {词元: 段落序号和次数交替排列的 uint16 数组的字节}，
+    存盘后读取时不必逐个创建小字典'''
+
+    def __init__(self, sections, postings, lengths):
+        self.sections = sections
+        self.postings = postings
+        self.lengths = lengths
+        self.average = sum(lengths) / len(lengths) if lengths else 0
+
+    @classmethod
+    def build(cls, paths=None):
+        sections = []
+        seen = set()
+        for path in sources() if paths is None else paths:
+            for section in split_sections(path):
+                # 内容相同的段落（如重复的文件）只收录一次
+                if (section.title, section.text) in seen:
+                    continue
+                seen.add((section.title, section.text))
+                sections.append(section)
+        postings = {}
+        lengths = []
+        for seq, section in enumerate(sections):
+            tokens = tokenize(section.title + '\n' + section.text)
+            lengths.append(len(tokens))
+            for token, count in collections.Counter(tokens).items():
+                postings.setdefault(token, array.array('H')).extend((seq, min(count, 0xFFFF)))
+        return cls(sections, {token: item.tobytes() for token, item in postings.items()}, lengths)
+
+    def posting(self, token):
+        '''{段落序号: 次数}'''
+        items = array.array('H', self.postings.get(token, b''))
+        return dict(zip(items[0::2], items[1::2]))
+
+    def _score(self, postings, seq):
+        '''BM25'''
+        score = 0
+        for posting in postings:
+            tf = posting[seq]
+            idf = math.log(1 + (len(self.sections) - len(posting) + 0.5) / (len(posting) + 0.5))
+            score += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * self.lengths[seq] / self.average))
+        return score
+
+    def _match(self, term):
+        '''查询词各词元的 posting，以及包含查询词的段落序号'''
+        tokens = set(_query_tokens(term))
+        if not tokens or any(token not in self.postings for token in tokens):
+            return [], set()
+        postings = sorted((self.posting(token) for token in tokens), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        lowered = term.lower()
+        return postings, {seq for seq in candidates
+                        if lowered in (self.sections[seq].title + '\n' + self.sections[seq].text).lower()}
+
+    def search(self, query, limit=10, any_term=False):
+        '''按空白分隔的查询词检索，默认须包含全部查询词，any_term 时包含任一即可
+
+        Returns:
+            [Hit]，按得分从高到低
+        '''
+        terms = query.split() if isinstance(query, str) else list(query)
+        scores = collections.Counter()
+        matched = None
+        for term in terms:
+            postings, seqs = self._match(term)
+            if not any_term:
+                matched = seqs if matched is None else matched & seqs
+            for seq in seqs:
+                scores[seq] += self._score(postings, seq)
+        if not any_term:
+            scores = {seq: scores[seq] for seq in matched or ()}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [Hit(score, self.sections[seq], snippet(self.sections[seq].text, terms)) for seq, score in ranked]
+
+    def search_chart(self, chart, limit=10):
+        '''与八字相关的段落：格局名称，以及“甲生寅月”“甲日寅月”这样的日主和月令'''
+        return self.search(chart_terms(chart), limit, any_term=True)
+
+    def save(self, path, digest):
+        data = marshal.dumps((digest, [tuple(item) for item in self.sections], self.postings, self.lengths))
+        with atomic_write(path) as f:
+            f.write(MAGIC + struct.pack('<I', VERSION))
+            f.write(data)
+
+    @classmethod
+    def load(cls, path, digest=None):
+        '''读取索引，与 digest 不符时抛出 ValueError'''
+        with open(path, 'rb') as f:
+            head = f.read(8)
+            if head != MAGIC + struct.pack('<I', VERSION):
+                raise ValueError("{} 不是检索索引".format(path))
+            stored, sections, postings, lengths = marshal.load(f)
+        if digest is not None and stored != digest:
+            raise ValueError("{} 与 books/、examples/ 不一致".format(path))
+        return cls([Section(*item) for item in sections], postings, lengths)
+
+
+def chart_terms(chart):
+    me, month = chart.me, chart.zhis.month
+    return list(GE_TERMS.get(chart.ge, ())) + ['{}生{}月'.format(me, month), '{}日{}月'.format(me, month)]
+
+
+def snippet(text, terms, width=40):
+    '''第一个查询词附近的一段文字'''
+    lowered = text.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    positions = [item for item in positions if item >= 0]
+    start = max(min(positions) - width // 2, 0) if positions else 0
+    return ' '.join(text[start:start + width * 2].split())
+
+
+def default_path():
+    return os.environ.get('BAZI_BOOK_INDEX', data_path('book_index.bin'))
+
+
+_index = None
+
+def get_index():
+    '''默认路径的索引，缺失或过期时重建；无法写入时只保存在内存中'''
+    global _index
+    if _index is None:
+        paths = sources()
+        digest = sources_digest(paths)
+        try:
+            _index = BookIndex.load(default_path(), digest)
+        except (OSError, ValueError, EOFError):
+            _index = BookIndex.build(paths)
+            try:
+                _index.save(default_path(), digest)
+            except OSError:
+                pass
+    return _index
+
+
+def search(query, limit=10, any_term=False):
+    return get_index().search(query, limit, any_term)
+
+
+def search_chart(chart, limit=10):
+    return get_index().search_chart(chart, limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='检索 books/ 和 examples/')
+    parser.add_argument('query', nargs='*', help='查询词，空格分隔')
+    parser.add_argument('-c', '--chart', nargs=4, type=int, metavar=('YEAR', 'MONTH', 'DAY', 'TIME'),
+                        help='按八字的格局、日主和月令查询')
+    parser.add_argument('-g', action='store_true', default=False, help='是否采用公历')
+    parser.add_argument('-r', action='store_true', default=False, help='是否为闰月，仅仅使用于农历')
+    parser.add_argument('-n', action='store_true', default=False, help='是否为女，默认为男')
+    parser.add_argument('-o', '--any', action='store_true', default=False, help='包含任一查询词即可')
+    parser.add_argument('-l', '--limit', type=int, default=10, help='最多显示的条数')
+    parser.add_argument('--rebuild', action='store_true', default=False, help='重建索引')
+    options = parser.parse_args()
+
+    if options.rebuild:
+        paths = sources()
+        BookIndex.build(paths).save(default_path(), sources_digest(paths))
+        print("写入", default_path())
+    if options.chart:
+        from chart import compute_chart
+        chart = compute_chart(*options.chart, gregorian=options.g, leap=options.r, female=options.n)
+        print("查询：", ' '.join(chart_terms(chart)))
+        hits = search_chart(chart, options.limit)
+    elif options.query:
+        hits = search(options.query, options.limit, options.any)
+    else:
+        return
+
+    for hit in hits:
+        print("{:.2f}  {}:{}  {}".format(hit.score, hit.section.path, hit.section.line, hit.section.title))
+        print("      ", hit.snippet)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 历法后端：公历农历互转、闰月、四柱、前后节气，同一个接口有三种实现：
+#     lunar_python   lunar_python 的 Solar、Lunar、EightChar
+#     sxtwl          寿星天文历，1900 年以后节气时刻与 lunar_python 相差不到一分钟，
+#                    更早的年份有些一月的节气相差一天
+#     table          预先生成的表（data/calendar.bin，1600-2200 年），mmap 打开后按日取定长记录，默认使用
+# 表由 lunar_python 生成，结果与之相同；表不存在时自动生成（需数秒，几个进程同时启动时只生成一次），
+# 超出范围时用 lunar_python 现算。
+# 环境变量 BAZI_CALENDAR 可指定默认后端。
+#
+# 生成: python calendar_backend.py --build [-o 输出文件] [--start 1600] [--end 2200]
+# 核对: python calendar_backend.py --check [-n 1000] [--start 1900] [--end 2100]
+#       随机时刻比较三种后端，不一致时返回 1
+
+import argparse
+import bisect
+import collections
+import datetime
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+
+from common import atomic_write, build_lock, data_path
+from ganzhi import jqmc
+from ganzhi_codes import *
+
+# 农历日期，month 为正数，闰月时 leap 为 True
+LunarDate = collections.namedtuple("LunarDate", "year month day leap")
+# 四柱的六十甲子编号
+Pillars = collections.namedtuple("Pillars", "year month day time")
+# 节气：index 为 JIEQIS 中的序号（冬至为 0，节为奇数），moment 为交节时刻（北京时间，精确到秒）
+JieQi = collections.namedtuple("JieQi", "index name moment")
+
+JIEQIS = tuple(jqmc)
+LI_CHUN = JIEQIS.index('立春')
+
+# 公元1年1月1日0时，时刻按距此的秒数存
+EPOCH = datetime.datetime(1, 1, 1)
+# 儒略日数（中午）与 datetime.date 序数之差
+ORDINAL_JD = 1721425
+
+
+def to_jd(moment):
+    '''datetime（北京时间）转为 JD'''
+    return ORDINAL_JD - 0.5 + (moment - EPOCH).total_seconds() / 86400
+
+
+def from_jd(jd):
+    '''JD（北京时间）转为 datetime，精确到秒'''
+    return EPOCH + datetime.timedelta(seconds=round((jd - ORDINAL_JD + 0.5) * 86400))
+
+
+def day_pillar(date):
+    '''公历日的日柱，与 lunar_python 相同由儒略日数算出'''
+    return (date.toordinal() + ORDINAL_JD - 11) % 60
+
+
+def time_pillar(day, hour):
+    '''日柱为 day 时 hour 点的时柱：五鼠遁，23 点为子时，时干按次日的日干起'''
+    zhi = (hour + 1) // 2 % 12
+    if hour == 23:
+        day += 1
+    return ganzhi_id((day % 5 * 2 + zhi) % 10, zhi)
+
+
+def month_pillar(year, index):
+    '''立春年份为 year、从序号为 index 的节起的月柱，立春为寅月，小寒为上一年的丑月'''
+    zhi = ((index - LI_CHUN) // 2 + 2) % 12
+    return (year * 12 + (zhi - 2) % 12 + 14) % 60
+
+
+def ming_gong(pillars):
+    '''命宫，与 lunar_python 的 EightChar.getMingGong 相同'''
+    offset = (pillars.month % 12 - 2) % 12 + 1 + (pillars.time % 12 - 2) % 12 + 1
+    offset = 26 - offset if offset >= 14 else 14 - offset
+    gan = ((pillars.year % 10 + 1) * 2 + offset - 1) % 10
+    return GANS[gan] + ZHIS[(offset + 1) % 12]
+
+
+def tai_yuan(pillars):
+    '''胎元：月柱的天干进一位、地支进三位'''
+    return GANS[(pillars.month + 1) % 10] + ZHIS[(pillars.month + 3) % 12]
+
+
+def xiu(date, day):
+    '''二十八宿及其歌诀，按日支和星期，与 lunar_python 的 getXiu、getXiuSong 相同'''
+    from lunar_python.util import LunarUtil
+    name = LunarUtil.XIU[ZHIS[day % 12] + str(date.isoweekday() % 7)]
+    return name, LunarUtil.XIU_SONG[name]
+
+
+def _seconds(moment):
+    return int((moment - EPOCH).total_seconds())
+
+
+def _moment(seconds):
+    return EPOCH + datetime.timedelta(seconds=seconds)
+
+
+class CalendarBackend:
+    '''历法后端的接口。时刻都是北京时间的 datetime，干支为六十甲子编号（见 ganzhi_codes）。
+
+    年柱以立春、月柱以节的交节时刻为界；日柱按公历日，23 点仍算当天（晚子时），
+    时柱的天干在 23 点按次日的日干起，与 lunar_python 的 EightChar 相同。
+    '''
+
+    name = None
+
+    def solar_to_lunar(self, date):
+        '''公历日期转为 LunarDate'''
+        raise NotImplementedError
+
+    def lunar_to_solar(self, year, month, day, leap=False):
+        '''农历日期转为 datetime.date，日期不存在时抛出 ValueError'''
+        raise NotImplementedError
+
+    def leap_month(self, year):
+        '''农历 year 年的闰月，没有闰月时为 0'''
+        raise NotImplementedError
+
+    def pillars(self, moment):
+        '''moment 的四柱，Pillars'''
+        raise NotImplementedError
+
+    def prev_jieqi(self, moment, whole_day=False):
+        '''moment 之前（含）的节气，whole_day 时按日比较，当天交节的都算之前'''
+        raise NotImplementedError
+
+    def next_jieqi(self, moment, whole_day=False):
+        '''moment 之后的节气，whole_day 时按日比较，只算之后各天'''
+        raise NotImplementedError
+
+
+class LunarPythonBackend(CalendarBackend):
+    name = 'lunar_python'
+
+    def __init__(self):
+        from lunar_python import Lunar, LunarYear, Solar
+        self._lunar, self._lunar_year, self._solar = Lunar, LunarYear, Solar
+
+    def _get_lunar(self, moment):
+        return self._solar.fromYmdHms(moment.year, moment.month, moment.day, moment.hour, moment.minute, 0).getLunar()
+
+    def solar_to_lunar(self, date):
+        lunar = self._solar.fromYmd(date.year, date.month, date.day).getLunar()
+        return LunarDate(lunar.getYear(), abs(lunar.getMonth()), lunar.getDay(), lunar.getMonth() < 0)
+
+    def lunar_to_solar(self, year, month, day, leap=False):
+        try:
+            solar = self._lunar.fromYmd(year, -month if leap else month, day).getSolar()
+        except Exception as e:
+            raise ValueError(str(e))
+        return datetime.date(solar.getYear(), solar.getMonth(), solar.getDay())
+
+    def leap_month(self, year):
+        return self._lunar_year.fromYear(year).getLeapMonth()
+
+    def pillars(self, moment):
+        ba = self._get_lunar(moment).getEightChar()
+        return Pillars(*(ganzhi_id(gan_ids[gan], zhi_ids[zhi]) for gan, zhi in (
+            (ba.getYearGan(), ba.getYearZhi()), (ba.getMonthGan(), ba.getMonthZhi()),
+            (ba.getDayGan(), ba.getDayZhi()), (ba.getTimeGan(), ba.getTimeZhi()))))
+
+    @staticmethod
+    def _jieqi(item):
+        solar = item.getSolar()
+        moment = datetime.datetime(solar.getYear(), solar.getMonth(), solar.getDay(),
+                                   solar.getHour(), solar.getMinute(), solar.getSecond())
+        return JieQi(JIEQIS.index(item.getName()), item.getName(), moment)
+
+    def prev_jieqi(self, moment, whole_day=False):
+        return self._jieqi(self._get_lunar(moment).getPrevJieQi(whole_day))
+
+    def next_jieqi(self, moment, whole_day=False):
+        return self._jieqi(self._get_lunar(moment).getNextJieQi(whole_day))
+
+
+class _TermsBackend(CalendarBackend):
+    '''按排好序的交节时刻（秒）查年柱、月柱和前后节气，子类提供 _terms(moment)'''
+
+    def _terms(self, moment):
+        '''(秒数的序列, 节气序号的序列, 年柱的序列, 月柱的序列)，后两者为各节气起的年柱、月柱'''
+        raise NotImplementedError
+
+    def pillars(self, moment):
+        seconds, _, years, months = self._terms(moment)
+        i = bisect.bisect_right(seconds, _seconds(moment)) - 1
+        day = self._day_pillar(moment)
+        return Pillars(years[i], months[i], day, time_pillar(day, moment.hour))
+
+    def _day_pillar(self, moment):
+        return day_pillar(moment)
+
+    def _near(self, moment, whole_day, forward):
+        seconds, indexes, _, _ = self._terms(moment)
+        if whole_day:
+            key = _seconds(datetime.datetime(moment.year, moment.month, moment.day) + datetime.timedelta(days=1))
+            i = bisect.bisect_left(seconds, key)
+        else:
+            i = bisect.bisect_right(seconds, _seconds(moment))
+        if not forward:
+            i -= 1
+        return JieQi(indexes[i], JIEQIS[indexes[i]], _moment(seconds[i]))
+
+    def prev_jieqi(self, moment, whole_day=False):
+        return self._near(moment, whole_day, False)
+
+    def next_jieqi(self, moment, whole_day=False):
+        return self._near(moment, whole_day, True)
+
+
+def _term_pillars(items):
+    '''items 为 [(秒数, 节气序号)]，从立春开始，加上各节气起的年柱、月柱'''
+    result = []
+    year = month = None
+    for seconds, index in items:
+        if index == LI_CHUN:
+            year = _moment(seconds).year
+        if index % 2 == 1:
+            month = month_pillar(year, index)
+        result.append((seconds, index, (year - 4) % 60, month))
+    return result
+
+
+class SxtwlBackend(_TermsBackend):
+    name = 'sxtwl'
+
+    def __init__(self):
+        import sxtwl
+        self._sxtwl = sxtwl
+        self._cache = {}
+
+    def solar_to_lunar(self, date):
+        day = self._sxtwl.fromSolar(date.year, date.month, date.day)
+        return LunarDate(day.getLunarYear(), day.getLunarMonth(), day.getLunarDay(), bool(day.isLunarLeap()))
+
+    def lunar_to_solar(self, year, month, day, leap=False):
+        item = self._sxtwl.fromLunar(year, month, day, leap)
+        date = datetime.date(item.getSolarYear(), item.getSolarMonth(), item.getSolarDay())
+        if self.solar_to_lunar(date) != (year, month, day, leap):
+            raise ValueError("农历{}年{}{}月{}日不存在".format(year, '闰' if leap else '', month, day))
+        return date
+
+    def leap_month(self, year):
+        return self._sxtwl.getRunMonth(year)
+
+    def _terms(self, moment):
+        # 前一年立春到后一年的节气，按公历年缓存
+        result = self._cache.get(moment.year)
+        if result is None:
+            items = []
+            for year in range(moment.year - 1, moment.year + 2):
+                for item in self._sxtwl.getJieQiByYear(year):
+                    items.append((_seconds(from_jd(item.jd)), item.jqIndex))
+            items.sort()
+            first = next(seq for seq, (_, index) in enumerate(items) if index == LI_CHUN)
+            result = self._cache[moment.year] = tuple(zip(*_term_pillars(items[first:])))
+        return result
+
+    def _day_pillar(self, moment):
+        gz = self._sxtwl.fromSolar(moment.year, moment.month, moment.day).getDayGZ()
+        return ganzhi_id(gz.tg, gz.dz)
+
+
+MAGIC = b'BZCL'
+VERSION = 2
+# magic, version, 起始年, 结束年, 节气数, 农历月数, 第一天的公历序数, 天数；其后依次为
+# 每天一条定长记录 DAY、交节时刻 int64[节气数]、各月初一的公历序数 int32[农历月数+1]、
+# 各月的农历年 int16[农历月数+1]、节气序号 int8[节气数]、各节气起的年柱 int8[节气数]、
+# 月柱 int8[节气数]、农历月 int8[农历月数+1]（闰月为负）。农历月多一项，为最后一个月之后一天
+HEADER = struct.Struct('<4sIiiIIiI')
+# 每天的记录：农历年、月（闰月为负）、日，0 点的年柱、月柱，日柱，当天交节的节气序号（没有为 -1），
+# 0 点之前（含）最后一个节气在交节时刻中的序号，交节时刻距 0 点的秒数（没有为 -1）
+DAY = struct.Struct('<hbBBBBbHi2x')
+START = 1600
+END = 2200
+
+
+def build(path, start=START, end=END):
+    '''由 lunar_python 生成 start 至 end 年的节气、农历月和每天的记录'''
+    from lunar_python import LunarYear, Solar
+    if end < start:
+        raise ValueError("年份范围不对：{}-{}".format(start, end))
+    terms = {}
+    months = []
+    for year in range(start - 1, end + 2):
+        lunar_year = LunarYear.fromYear(year)
+        # 依次为上一年大雪、冬至……大雪、下一年冬至……惊蛰
+        for seq, jd in enumerate(lunar_year.getJieQiJulianDays()):
+            solar = Solar.fromJulianDay(jd)
+            moment = datetime.datetime(solar.getYear(), solar.getMonth(), solar.getDay(),
+                                       solar.getHour(), solar.getMinute(), solar.getSecond())
+            terms[_seconds(moment)] = (seq - 1) % 24
+        for month in lunar_year.getMonthsInYear():
+            months.append((month.getFirstJulianDay() - ORDINAL_JD, month.getYear(), month.getMonth()))
+    months.append((months[-1][0] + lunar_year.getMonthsInYear()[-1].getDayCount(), 0, 0))
+
+    # 从 start 年立春起，到 end+1 年立春止
+    items = sorted(terms.items())
+    lo = next(seq for seq, (seconds, index) in enumerate(items)
+              if index == LI_CHUN and _moment(seconds).year == start)
+    hi = next(seq for seq, (seconds, index) in enumerate(items)
+              if index == LI_CHUN and _moment(seconds).year == end + 1)
+    items = _term_pillars(items[lo:hi + 1])
+    for (_, a, _, _), (_, b, _, _) in zip(items, items[1:]):
+        if b != (a + 1) % 24:
+            raise ValueError("节气不连续")
+    seconds, indexes, years, month_pillars = zip(*items)
+
+    # 每天的记录，从第一个节气的次日起，到倒数第二个节气的前一天，以便查前后节气
+    days = []
+    first = _moment(seconds[0]).toordinal() + 1
+    term = month = 0
+    for ordinal in range(first, _moment(seconds[-2]).toordinal()):
+        begin = _seconds(datetime.datetime.fromordinal(ordinal))
+        while seconds[term + 1] <= begin:
+            term += 1
+        while months[month + 1][0] <= ordinal:
+            month += 1
+        jieqi, offset = -1, -1
+        if seconds[term + 1] < begin + 86400:
+            jieqi, offset = indexes[term + 1], seconds[term + 1] - begin
+        _, lunar_year, lunar_month = months[month]
+        days.append(DAY.pack(lunar_year, lunar_month, ordinal - months[month][0] + 1, years[term],
+                             month_pillars[term], (ordinal + ORDINAL_JD - 11) % 60, jieqi, term, offset))
+
+    ordinals, lunar_years, lunar_months = zip(*months)
+    with atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, start, end, len(seconds), len(months) - 1, first, len(days)))
+        f.write(b''.join(days))
+        f.write(struct.pack('<{}q'.format(len(seconds)), *seconds))
+        f.write(struct.pack('<{}i'.format(len(months)), *ordinals))
+        f.write(struct.pack('<{}h'.format(len(months)), *lunar_years))
+        for values in (indexes, years, month_pillars, lunar_months):
+            f.write(struct.pack('<{}b'.format(len(values)), *values))
+
+
+class CalendarTable:
+    '''mmap 打开的历法表：按公历日 O(1) 取每天的记录，节气和农历月的各列为 memoryview'''
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.start, self.end, terms, months,
+         self.first, self.days) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} 不是历法表".format(path))
+        months += 1
+        if len(self.mm) != HEADER.size + self.days * DAY.size + terms * 11 + months * 7:
+            raise ValueError("{} 长度不对".format(path))
+        view = memoryview(self.mm)
+        offset = HEADER.size + self.days * DAY.size
+        columns = []
+        for fmt, count in (('q', terms), ('i', months), ('h', months),
+                           ('b', terms), ('b', terms), ('b', terms), ('b', months)):
+            size = struct.calcsize(fmt) * count
+            columns.append(view[offset:offset + size].cast(fmt))
+            offset += size
+        (self.seconds, self.ordinals, self.lunar_years,
+         self.indexes, self.years, self.months, self.lunar_months) = columns
+
+    def day(self, ordinal):
+        '''公历序数那天的记录（见 DAY），超出范围时返回 None'''
+        seq = ordinal - self.first
+        if not 0 <= seq < self.days:
+            return None
+        return DAY.unpack_from(self.mm, HEADER.size + seq * DAY.size)
+
+    def months_of(self, year):
+        '''农历 year 年各月在表中的序号，不在范围内时为空'''
+        lo = bisect.bisect_left(self.lunar_years, year, 0, len(self.lunar_years) - 1)
+        hi = bisect.bisect_right(self.lunar_years, year, lo, len(self.lunar_years) - 1)
+        return range(lo, hi)
+
+    def close(self):
+        for item in (self.seconds, self.ordinals, self.lunar_years, self.indexes,
+                     self.years, self.months, self.lunar_months):
+            item.release()
+        self.mm.close()
+
+
+class TableBackend(CalendarBackend):
+    '''查表的后端：公历日的农历、四柱、前后节气都只读一条记录，时柱由日柱算出'''
+
+    name = 'table'
+
+    def __init__(self, table):
+        self.table = table
+        self._fallback = None
+
+    @property
+    def fallback(self):
+        '''超出表的范围时使用'''
+        if self._fallback is None:
+            self._fallback = LunarPythonBackend()
+        return self._fallback
+
+    def solar_to_lunar(self, date):
+        record = self.table.day(date.toordinal())
+        if record is None:
+            return self.fallback.solar_to_lunar(date)
+        year, month, day = record[:3]
+        return LunarDate(year, abs(month), day, month < 0)
+
+    def lunar_to_solar(self, year, month, day, leap=False):
+        table = self.table
+        seqs = table.months_of(year)
+        if not seqs or not table.start <= year <= table.end:
+            return self.fallback.lunar_to_solar(year, month, day, leap)
+        month_ = -month if leap else month
+        for seq in seqs:
+            if table.lunar_months[seq] == month_:
+                days = table.ordinals[seq + 1] - table.ordinals[seq]
+                if not 1 <= day <= days:
+                    raise ValueError("农历{}年{}{}月只有{}天".format(year, '闰' if leap else '', month, days))
+                return datetime.date.fromordinal(table.ordinals[seq] + day - 1)
+        raise ValueError("农历{}年没有{}{}月".format(year, '闰' if leap else '', month))
+
+    def leap_month(self, year):
+        table = self.table
+        if not table.start <= year <= table.end:
+            return self.fallback.leap_month(year)
+        return next((-table.lunar_months[seq] for seq in table.months_of(year) if table.lunar_months[seq] < 0), 0)
+
+    def pillars(self, moment):
+        record = self.table.day(moment.toordinal())
+        if record is None:
+            return self.fallback.pillars(moment)
+        _, _, _, year, month, day, jieqi, _, offset = record
+        # 当天交节且已过交节时刻：节换月，立春换年
+        if jieqi >= 0 and moment.hour * 3600 + moment.minute * 60 + moment.second >= offset:
+            if jieqi % 2 == 1:
+                month = (month + 1) % 60
+            if jieqi == LI_CHUN:
+                year = (year + 1) % 60
+        return Pillars(year, month, day, time_pillar(day, moment.hour))
+
+    def _near(self, moment, whole_day, forward):
+        '''前一个（forward 为真时后一个）节气'''
+        record = self.table.day(moment.toordinal())
+        if record is None:
+            return (self.fallback.next_jieqi if forward else self.fallback.prev_jieqi)(moment, whole_day)
+        _, _, _, _, _, _, jieqi, term, offset = record
+        # 当天交节：整天算时或已过交节时刻，前一个节气就是当天的
+        if jieqi >= 0 and (whole_day or moment.hour * 3600 + moment.minute * 60 + moment.second >= offset):
+            term += 1
+        if forward:
+            term += 1
+        index = self.table.indexes[term]
+        return JieQi(index, JIEQIS[index], _moment(self.table.seconds[term]))
+
+    def prev_jieqi(self, moment, whole_day=False):
+        return self._near(moment, whole_day, False)
+
+    def next_jieqi(self, moment, whole_day=False):
+        return self._near(moment, whole_day, True)
+
+
+def default_path():
+    return os.environ.get('BAZI_CALENDAR_TABLE', data_path('calendar.bin'))
+
+
+def load_table():
+    '''默认路径的表，缺失或格式不对时重新生成，无法生成时返回 None'''
+    path = default_path()
+    try:
+        return CalendarTable(path)
+    except (OSError, ValueError):
+        pass
+    try:
+        with build_lock(path):
+            # 等锁期间别的进程可能已经生成好了
+            try:
+                return CalendarTable(path)
+            except (OSError, ValueError):
+                build(path)
+                return CalendarTable(path)
+    except (OSError, ValueError):
+        return None
+
+
+BACKENDS = ('table', 'lunar_python', 'sxtwl')
+_backends = {}
+
+def get_backend(name=None):
+    '''name 为 BACKENDS 之一，默认为环境变量 BAZI_CALENDAR 或 table；表不可用时 table 即为 lunar_python'''
+    name = name or os.environ.get('BAZI_CALENDAR') or 'table'
+    backend = _backends.get(name)
+    if backend is None:
+        if name == 'table':
+            table = load_table()
+            backend = TableBackend(table) if table is not None else get_backend('lunar_python')
+        elif name == 'lunar_python':
+            backend = LunarPythonBackend()
+        elif name == 'sxtwl':
+            backend = SxtwlBackend()
+        else:
+            raise ValueError("未知的历法后端：{}，可选：{}".format(name, ','.join(BACKENDS)))
+        _backends[name] = backend
+    return backend
+
+
+def check(count=1000, seed=0, start=1900, end=2100, out=print):
+    '''随机时刻比较各后端与 lunar_python，返回不一致的条数。
+
+    sxtwl 的交节时刻与 lunar_python 相差不到一分钟，交节前后一分钟内的时刻不算 sxtwl 不一致。
+    '''
+    reference = get_backend('lunar_python')
+    others = [get_backend(name) for name in BACKENDS if name != 'lunar_python']
+    rng = random.Random(seed)
+    first, last = datetime.date(start, 1, 1).toordinal(), datetime.date(end, 12, 31).toordinal()
+    bad = collections.Counter()
+    near = collections.Counter()
+    elapsed = collections.Counter()
+    for _ in range(count):
+        date = datetime.date.fromordinal(rng.randint(first, last))
+        moment = datetime.datetime(date.year, date.month, date.day, rng.randrange(24), rng.randrange(60))
+        lunar = reference.solar_to_lunar(date)
+        expected = (lunar, reference.lunar_to_solar(*lunar), reference.leap_month(lunar.year),
+                    reference.pillars(moment),
+                    reference.prev_jieqi(moment), reference.next_jieqi(moment),
+                    reference.prev_jieqi(moment, True), reference.next_jieqi(moment, True))
+        for backend in others:
+            begin = time.perf_counter()
+            lunar_ = backend.solar_to_lunar(date)
+            got = (lunar_, backend.lunar_to_solar(*lunar_), backend.leap_month(lunar_.year),
+                   backend.pillars(moment),
+                   backend.prev_jieqi(moment), backend.next_jieqi(moment),
+                   backend.prev_jieqi(moment, True), backend.next_jieqi(moment, True))
+            elapsed[backend.name] += time.perf_counter() - begin
+            if backend.name == 'sxtwl':
+                # 交节时刻只比较名称和相差的秒数
+                terms = [(item.index, item.moment) for item in expected[4:]]
+                close = all(a.index == b[0] and abs((a.moment - b[1]).total_seconds()) <= 60
+                            for a, b in zip(got[4:], terms))
+                boundary = any(abs((moment - item).total_seconds()) <= 60 or
+                               abs((datetime.datetime.combine(date, datetime.time()) - item).total_seconds()) <= 60 or
+                               abs((datetime.datetime.combine(date, datetime.time()) + datetime.timedelta(days=1)
+                                    - item).total_seconds()) <= 60 for _, item in terms)
+                if got[:4] == expected[:4] and close:
+                    continue
+                if boundary:
+                    near[backend.name] += 1
+                    continue
+            elif got == expected:
+                continue
+            bad[backend.name] += 1
+            if bad[backend.name] <= 5:
+                out(backend.name, moment, got, expected)
+    for backend in others:
+        out("{:<14} 不一致 {:>5}  交节前后 {:>5}  {:>8.1f}µs/次".format(
+            backend.name, bad[backend.name], near[backend.name], elapsed[backend.name] / count * 1e6))
+    return sum(bad.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='历法后端：生成历法表，或比较各后端的结果')
+    parser.add_argument('--build', action='store_true', default=False, help='生成历法表')
+    parser.add_argument('-o', '--output', default=default_path(), help='输出文件')
+    parser.add_argument('--start', type=int, help='起始年，生成时默认为 {}，比较时默认为 1900'.format(START))
+    parser.add_argument('--end', type=int, help='结束年（含），生成时默认为 {}，比较时默认为 2100'.format(END))
+    parser.add_argument('--check', action='store_true', default=False, help='比较各后端')
+    parser.add_argument('-n', type=int, default=1000, help='比较的时刻数')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子')
+    options = parser.parse_args()
+
+    if options.build:
+        build(options.output, options.start or START, options.end or END)
+        print("写入", options.output)
+    if options.check:
+        sys.exit(1 if check(options.n, options.seed, options.start or 1900, options.end or 2100) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,990 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 八字排盘引擎：compute_chart 返回结构化结果，不做任何输出。
+# 命令行的展示见 bazi.py。
+# 排盘用 ganzhi_codes 中的整数编码，Chart 上的 gans、gan_shens 等汉字字段只是按编号转换的视图，
+# 供断语规则和显示使用。
+
+import collections
+import datetime
+import functools
+import io
+
+from bidict import bidict
+
+from datas import *
+from common import *
+from ganzhi_codes import *
+from jieqi_table import qi_yun
+import calendar_backend
+from corpus import get_summary, get_month_text
+import profiling
+import rules
+
+Gans = collections.namedtuple("Gans", "year month day time")
+Zhis = collections.namedtuple("Zhis", "year month day time")
+
+# 大运或流年的一行，除 age、year 外都是编号。hidden: ((藏干, 十神), ...)，
+# relations: ((关系, 原局地支), ...)，he/chong: 与之相合/相冲的天干，没有为 NONE，
+# jias: ((JIA或GONG, 地支), ...)，shens: 神煞，marks: TRANSIT_MARKS 中的组合。
+Transit = collections.namedtuple(
+    "Transit",
+    "age year gan zhi shen status hidden relations empty fu nayin he chong jias shens marks liunians",
+    defaults=((),))
+# 干支与原局的关系，见 Transits.interaction。流年不看破，只在流年看拱，
+# 所以 liunian_relations、liunian_jias 与大运用的 relations、jias 分开。
+Interaction = collections.namedtuple(
+    "Interaction",
+    "gan zhi shen status hidden relations liunian_relations empty fu nayin he chong jias liunian_jias shens")
+
+JIA, GONG = 0, 1
+JIA_KINDS = ('夹', '拱')
+TRANSIT_MARKS = ("天罗地网：戌亥辰巳", "四生：寅申巳亥", "四败：子午卯酉", "四库：辰戌丑未")
+_TRANSIT_MASKS = tuple(sum(1 << zhi_ids[item] for item in mark.split('：')[1]) for mark in TRANSIT_MARKS)
+
+
+def get_roots(gan, zhis):
+    '''天干在地支中的根，返回 (本气, 中气, 余气) 三个地支列表'''
+    element = gan_elements[gan]
+    roots = ([], [], [])
+    for level in range(3):
+        for zhi in zhis:
+            hidden = hidden_table[zhi]
+            if len(hidden) > level and gan_elements[hidden[level][0]] == element:
+                roots[level].append(zhi)
+    return roots
+
+
+def get_gong(gans, zhis):
+    '''同干相邻两柱地支所夹、所拱之支'''
+    result = []
+    for i in range(3):
+        if  gans[i] != gans[i+1]:
+            continue
+        zhi1 = zhis[i]
+        zhi2 = zhis[i+1]
+        if abs(zhi1 - zhi2) == 2:
+            result.append((zhi1 + zhi2)//2)
+        gong = gong_he_table[zhi1][zhi2]
+        if gong != NONE and gong not in zhis:
+            result.append(gong)
+    return result
+
+
+def get_shens(me, zhis, gan_, zhi_):
+    '''干支 gan_、zhi_ 对日干 me 和原局地支 zhis 所带的神煞'''
+    keys = (zhis[0], zhis[1], zhis[2], me)
+    return [seq for seq, kind in enumerate(shensha_kinds)
+            if shensha_zhi_masks[seq][keys[kind]] >> zhi_ & 1
+            or shensha_gan_masks[seq][keys[kind]] >> gan_ & 1]
+
+
+def check_he_chong(gan, gans):
+    '''与 gan 相合、相冲且在 gans 中的天干'''
+    he = gan_he_table[gan]
+    chong = gan_chong_table[gan]
+    return (he if he in gans else NONE, chong if chong != NONE and chong in gans else NONE)
+
+
+class _Notes:
+    '''按 print 的方式收集断语文本'''
+
+    def __init__(self):
+        self.buf = io.StringIO()
+
+    def __call__(self, *args, sep=' ', end='\n'):
+        self.buf.write(sep.join(str(item) for item in args) + end)
+
+    def lines(self):
+        return self.buf.getvalue().split('\n')
+
+
+class Chart:
+    '''排盘结果。
+
+    四柱相关的字段在创建时计算好，除断语外都是编号（见 ganzhi_codes）；
+    断语 notes、ge_notes 为文本行列表；有出生时间时 yuns 为大运列表
+    （每个大运的 liunians 为流年），只输入八字时 yuns 为 None，只有 dayun_ids。
+    transits 按年份逐年计算流年（见 Transits），只输入八字时为 None。
+    断语（含 all_ges）和 yuns 在第一次访问时才计算。
+    '''
+
+    def __init__(self, gans, zhis, female=False):
+        self.gan_ids = tuple(gan_ids[item] for item in gans)
+        self.zhi_ids = tuple(zhi_ids[item] for item in zhis)
+        self.female = female
+
+        # 日历信息，只输入八字时为 None
+        self.solar = None
+        self.lunar = None
+        self.yun_start = None
+        self.ming_gong = None
+        self.tai_yuan = None
+        self.prev_jieqi = None
+        self.next_jieqi = None
+        self.xiu = None
+        self.xiu_song = None
+        # 起运时刻，用于计算 yuns
+        self._yun = None
+
+        with profiling.stage('chart.natal'):
+            _natal(self)
+
+        self.jianchu = jianchus[(self.zhi_ids[2] + 12 - self.zhi_ids[1])%12]
+
+    def __getattr__(self, name):
+        # 只在属性未计算时调用
+        if name in _FINDINGS_FIELDS:
+            with profiling.stage('chart.findings'):
+                _findings(self)
+            return self.__dict__[name]
+        if name == 'transits':
+            yun = self.__dict__.get('_yun')
+            self.transits = None if yun is None else Transits(self, yun)
+            return self.transits
+        if name == 'yuns':
+            with profiling.stage('chart.yuns'):
+                self.yuns = None if self.transits is None else _yuns(self.transits)
+            return self.yuns
+        raise AttributeError(name)
+
+    # 《穷通宝鉴》《三命通会》的断语，用到时才从 corpus 读取
+    @functools.cached_property
+    def month_text(self):
+        with profiling.stage('chart.texts'):
+            return get_month_text(self.me, self.zhis.month)
+
+    @functools.cached_property
+    def summary_text(self):
+        with profiling.stage('chart.texts'):
+            return get_summary(self.me, self.pillars[3])
+
+    # 格和三合局只由干支决定，断语规则也按它们触发
+    @functools.cached_property
+    def ge(self):
+        me, zhis, gans = self.me, self.zhis, self.gans
+        if (me, zhis.month) in jianlus:
+            return '建'
+        if (me, zhis.month) in (('甲','卯'), ('庚','酉'), ('壬','子')):
+            return '月刃'
+        ge = ''
+        zhi = zhis[1]
+        if zhi in wuhangs['土'] or (me, zhis.month) in (('乙','寅'), ('丙','午'),  ('丁','巳'), ('戊','午'), ('己','巳'), ('辛','申'), ('癸','亥')):
+            for item in zhi5[zhi]:
+                if item in gans[:2] + gans[3:]:
+                    ge = ten_deities[me][item]
+        else:
+            d = zhi5[zhi]
+            ge = ten_deities[me][max(d, key=d.get)]
+        return ge
+
+    @functools.cached_property
+    def jus(self):
+        me = self.me
+        zhis_g = set(self.zhis) | set(self.gongs)
+        jus = []
+        for item in zhi_hes:
+            if set(item).issubset(zhis_g):
+                jus.append(ju[ten_deities[me].inverse[zhi_hes[item]]])
+        for item in zhi_huis:
+            if set(item).issubset(zhis_g):
+                jus.append(ju[ten_deities[me].inverse[zhi_huis[item]]])
+        return jus
+
+    # 以下为汉字视图
+    @functools.cached_property
+    def gans(self):
+        return Gans(*[GANS[item] for item in self.gan_ids])
+
+    @functools.cached_property
+    def zhis(self):
+        return Zhis(*[ZHIS[item] for item in self.zhi_ids])
+
+    @property
+    def me(self):
+        return self.gans.day
+
+    @property
+    def zhus(self):
+        return list(zip(self.gans, self.zhis))
+
+    @property
+    def pillars(self):
+        return [''.join(item) for item in self.zhus]
+
+    @functools.cached_property
+    def gan_shens(self):
+        return ['--' if item == NONE else SHENS[item] for item in self.gan_shen_ids]
+
+    @functools.cached_property
+    def zhi_shens(self):
+        return [SHENS[item] for item in self.zhi_shen_ids]
+
+    @property
+    def shens(self):
+        return self.gan_shens + self.zhi_shens
+
+    @functools.cached_property
+    def zhi_shen3(self):
+        return [''.join(SHENS[shen] for _, shen in hidden) for hidden in self.hidden_ids]
+
+    @property
+    def zhi_shens2(self):
+        return [SHENS[shen] for hidden in self.hidden_ids for _, shen in hidden]
+
+    @property
+    def shens2(self):
+        return self.gan_shens + self.zhi_shens2
+
+    @property
+    def scores(self):
+        return dict(zip(ELEMENTS, self.element_scores))
+
+    @property
+    def gan_scores(self):
+        return dict(zip(GANS, self.gan_score_list))
+
+    @property
+    def statuses(self):
+        return [STATUSES[item] for item in self.zhi_statuses[2]]
+
+    @property
+    def dayuns(self):
+        return [ganzhi_name(item) for item in self.dayun_ids]
+
+    @property
+    def gongs(self):
+        return [ZHIS[item] for item in self.gong_ids]
+
+    @property
+    def all_shens_list(self):
+        # 按神煞的检查顺序，同一神煞按年月日时
+        items = sorted((item for items in self.shensha for item, _ in items))
+        return [SHENSHAS[item] for item in items]
+
+    @property
+    def all_shens(self):
+        return list(dict.fromkeys(self.all_shens_list))
+
+
+# _findings 设置的字段
+_FINDINGS_FIELDS = ('all_ges', 'notes', 'ge_notes', 'rule_findings')
+
+
+def _natal(chart):
+    '''原局：十神、五行分数、强弱、大运方向、地支关系、神煞等'''
+    gans, zhis = chart.gan_ids, chart.zhi_ids
+    me = gans[2]
+    shens = gan_shen_table[me]
+
+    chart.gan_shen_ids = tuple(NONE if seq == 2 else shens[item] for seq, item in enumerate(gans))
+    chart.zhi_shen_ids = tuple(shens[main_gan_table[item]] for item in zhis)
+    # 地支所有藏干及其十神，包含余气和尾气
+    chart.hidden_ids = tuple(tuple((gan, shens[gan]) for gan, _ in hidden_table[item]) for item in zhis)
+
+    # 计算五行分数 http://www.131.com.tw/word/b3_2_14.htm
+    scores = [0] * 5
+    gan_scores = [0] * 10
+    for item in gans:
+        scores[gan_elements[item]] += 5
+        gan_scores[item] += 5
+
+    for item in zhis + (zhis[1],):
+        for gan, score in hidden_table[item]:
+            scores[gan_elements[gan]] += score
+            gan_scores[gan] += score
+    chart.element_scores, chart.gan_score_list = scores, gan_scores
+
+    # 计算八字强弱
+    # 子平真诠的计算
+    me_status = [zhi_status_table[me][item] for item in zhis]
+    weak = not any(STATUSES[item] in ('长', '帝', '建') for item in me_status)
+    if weak:
+        # 原算法另加长生状态中 '库' 的个数，而长生状态里没有 '库'，只算比肩
+        bis = chart.gan_shen_ids.count(SHENS.index('比')) + chart.zhi_shen_ids.count(SHENS.index('比'))
+        if bis >2:
+            weak = False
+    chart.weak = weak
+
+    # 计算大运
+    if chart.female:
+        direction = -1 if gans[0] % 2 == 0 else 1
+    else:
+        direction = 1 if gans[0] % 2 == 0 else -1
+    chart.direction = direction
+
+    start = ganzhi_id(gans[1], zhis[1])
+    chart.dayun_ids = [(start + direction * i) % 60 for i in range(1, 13)]
+
+    # 网上的计算
+    chart.strong = sum(gan_scores[gan] for gan in range(10)
+                       if SHENS[shens[gan]] in ('比', '劫', '枭', '印'))
+
+    chart.temps_scores = sum(gan_temps[item] for item in gans) + sum(zhi_temps[item] for item in zhis) \
+        + zhi_temps[zhis[1]]
+    chart.gong_ids = get_gong(gans, zhis)
+
+    # 每柱：寒暖、禄、干支自合
+    chart.temps = [(gan_temps[gan], zhi_temps[zhi]) for gan, zhi in zip(gans, zhis)]
+    chart.lu_ids = [lu_table[gan] for gan in gans]
+    chart.self_hes = [any(item == gan_he_table[gan] for item, _ in hidden_table[zhi])
+                      for gan, zhi in zip(gans, zhis)]
+
+    chart.gan_checks = [check_he_chong(gan, gans) for gan in gans]
+    # 地支在各天干下的长生状态 zhi_statuses[天干柱][地支柱]，以及是否日柱空亡
+    chart.zhi_statuses = [[zhi_status_table[gan][zhi] for zhi in zhis] for gan in gans]
+    empty = empty_table[ganzhi_id(me, zhis[2])]
+    chart.zhi_empties = [zhi in empty for zhi in zhis]
+
+    # 地支关系: 每柱 [(关系, [其他柱的地支])]，先按位求出有哪些关系，地支按 zhi_atts 中的顺序
+    chart.zhi_relations = []
+    for seq, item in enumerate(zhis):
+        row = zhi_relation_matrix[item]
+        others = types = 0
+        for zhi in zhis[:seq] + zhis[seq+1:]:
+            others |= 1 << zhi
+            types |= row[zhi]
+        chart.zhi_relations.append([(type_, [zhi for zhi in zhi_relation_table[item][type_] if others >> zhi & 1])
+                                    for type_ in relation_types[types]])
+
+    chart.roots = [get_roots(item, zhis) for item in gans]
+
+    # 纳音以及亡神、劫杀、元辰
+    yuanchen = (zhis[0] + direction*-1*5)%12
+    chart.nayins = [(element_mark_table[gan_elements[gan]][zhi_elements[zhi]],
+                     nayin_table[ganzhi_id(gan, zhi)],
+                     (zhi == wang_table[zhis[0]], zhi == jiesha_table[zhis[0]], zhi == yuanchen))
+                    for gan, zhi in zip(gans, zhis)]
+
+    # 神煞计算: 每柱 [(神煞, 是否由日干引起)]，年柱不查年支神煞，日柱不查日支神煞
+    keys = (zhis[0], zhis[1], zhis[2], me)
+    shensha = [[], [], [], []]
+    with profiling.stage('chart.shensha'):
+        for seq, kind in enumerate(shensha_kinds):
+            gan_mask = shensha_gan_masks[seq][keys[kind]]
+            zhi_mask = shensha_zhi_masks[seq][keys[kind]]
+            for i in range(4):
+                if (kind == SHENSHA_YEAR and i == 0) or (kind == SHENSHA_DAY and i == 2):
+                    continue
+                by_gan = bool(gan_mask >> gans[i] & 1)
+                if by_gan or zhi_mask >> zhis[i] & 1:
+                    shensha[i].append((seq, i == 2 and by_gan))
+    chart.shensha = shensha
+
+    # 计算六合、六冲、干合、刑:相邻的才算
+    matrix = zhi_relation_matrix
+    chart.zhi_6he = _adjacent(zhis, lambda a, b: matrix[a][b] & _LIU_BIT)
+    chart.zhi_6chong = _adjacent(zhis, lambda a, b: matrix[a][b] & _CHONG_BIT)
+    chart.gan_he = _adjacent(gans, lambda a, b: gan_he_table[a] == b)
+    chart.zhi_xing = _adjacent(zhis, lambda a, b: matrix[a][b] & _XING_BIT or matrix[b][a] & _XING_BIT)
+
+
+_LIU_BIT, _CHONG_BIT, _XING_BIT, _PO_BIT = (1 << ZHI_RELATIONS.index(item) for item in '六冲刑破')
+
+
+def _adjacent(items, test):
+    flags = [False, False, False, False]
+    for i in range(3):
+        if test(items[i], items[i+1]):
+            flags[i] = flags[i+1] = True
+    return flags
+
+
+def _bits(mask):
+    '''掩码中为 1 的位，从低到高'''
+    result = []
+    while mask:
+        low = mask & -mask
+        result.append(low.bit_length() - 1)
+        mask ^= low
+    return result
+
+
+def _relations(zhi_, items, liunian=False):
+    '''zhi_ 与 items 中地支的关系 [(关系, 地支)]，按 items 的顺序，重复的地支只算一次，流年不看破'''
+    row = zhi_relation_matrix[zhi_]
+    keep = ~_PO_BIT if liunian else -1
+    return [(type_, item) for item in dict.fromkeys(items) for type_ in relation_types[row[item] & keep]]
+
+
+def _jias(gan_, zhi_, gans2, zhis2, natal, liunian=False):
+    '''与天干相同的柱之间夹、拱的地支，natal 为原局地支'''
+    jias = []
+    for i in range(len(gans2)):
+        if gan_ == gans2[i]:
+            zhi1 = zhis2[i]
+            if abs(zhi_ - zhi1) == 2:
+                jias.append((JIA, (zhi_ + zhi1)//2))
+            if abs(zhi_ - zhi1) == 10:
+                jias.append((JIA, (zhi_ + zhi1)%12))
+            gong = gong_he_table[zhi1][zhi_]
+            if liunian and gong != NONE and gong not in natal:
+                jias.append((GONG, gong))
+    return jias
+
+
+class Transits:
+    '''大运流年与原局的关系，按年份逐年计算，供按年份翻页使用，不必算出整个大运流年。
+
+    大运、流年（以及流月、流日）的干支只有六十种，它们与原局的关系（十神、长生、藏干、
+    地支关系、空亡、伏吟、纳音、合冲、夹拱、神煞）每个原局只需算一次，存在 60 行的
+    interaction 表中，用到时才计算。流年再加上与所在大运的关系，年份到干支只是算术：
+    (year - 4) % 60。年份和年龄与 yuns 相同，起运之前的流年没有大运，只与原局比较。
+    '''
+
+    # 大运的步数，与 Chart.dayun_ids 相同
+    STEPS = 12
+    # 默认显示的大运步数，与 yuns 相同
+    DEFAULT_STEPS = 9
+
+    def __init__(self, chart, start):
+        gans, zhis = chart.gan_ids, chart.zhi_ids
+        me = gans[2]
+        self.chart = chart
+        self.birth_year = chart.solar[0]
+        self.start_year = start.year
+        self.end_year = start.year + self.STEPS * 10 - 1
+        self._mask = sum(1 << item for item in set(zhis))
+        # 各组合除天罗地网外须原局有其中两支
+        natal = self._mask
+        self._marks = tuple((seq, mask) for seq, mask in enumerate(_TRANSIT_MASKS)
+                            if seq == 0 or bin(natal & mask).count('1') == 2)
+        # 神煞按位图：干支带的神煞为 _gan_shens[天干] | _zhi_shens[地支] 中的位
+        keys = (zhis[0], zhis[1], zhis[2], me)
+        self._gan_shens, self._zhi_shens = [0] * 10, [0] * 12
+        for seq, kind in enumerate(shensha_kinds):
+            gan_mask, zhi_mask = shensha_gan_masks[seq][keys[kind]], shensha_zhi_masks[seq][keys[kind]]
+            for gan in range(10):
+                if gan_mask >> gan & 1:
+                    self._gan_shens[gan] |= 1 << seq
+            for zhi in range(12):
+                if zhi_mask >> zhi & 1:
+                    self._zhi_shens[zhi] |= 1 << seq
+        # 只与天干或地支有关的部分：(十神, 合, 冲)，(长生, 藏干, 地支关系, 流年的地支关系, 空亡)
+        shens = gan_shen_table[me]
+        empty = empty_table[ganzhi_id(me, zhis[2])]
+        self._gan_parts = tuple((shens[gan],) + check_he_chong(gan, gans) for gan in range(10))
+        self._zhi_parts = tuple((zhi_status_table[me][zhi], tuple((gan, shens[gan]) for gan, _ in hidden_table[zhi]),
+                                 tuple(_relations(zhi, zhis)), tuple(_relations(zhi, zhis, liunian=True)), zhi in empty)
+                                for zhi in range(12))
+        self._fu = set(zip(gans, zhis))
+        self._table = [None] * 60
+        self._dayuns = {}
+
+    def interaction(self, ganzhi):
+        '''六十甲子编号为 ganzhi 的干支与原局的关系，Interaction'''
+        row = self._table[ganzhi]
+        if row is None:
+            row = self._table[ganzhi] = self._interaction(ganzhi)
+        return row
+
+    def table(self):
+        '''完整的 60 行，按六十甲子编号'''
+        return [self.interaction(seq) for seq in range(60)]
+
+    def _interaction(self, ganzhi):
+        gans, zhis = self.chart.gan_ids, self.chart.zhi_ids
+        gan_, zhi_ = ganzhi % 10, ganzhi % 12
+        shen, he, chong = self._gan_parts[gan_]
+        status, hidden, relations_, liunian_relations, empty = self._zhi_parts[zhi_]
+        # 夹拱只在天干与原局某柱相同时才有
+        jias = liunian_jias = ()
+        if gan_ in gans:
+            jias = tuple(_jias(gan_, zhi_, gans, zhis, zhis))
+            liunian_jias = tuple(_jias(gan_, zhi_, gans, zhis, zhis, liunian=True))
+        return Interaction(
+            gan=gan_, zhi=zhi_, shen=shen, status=status, hidden=hidden,
+            relations=relations_, liunian_relations=liunian_relations, empty=empty,
+            fu=(gan_, zhi_) in self._fu, nayin=nayin_table[ganzhi], he=he, chong=chong,
+            jias=jias, liunian_jias=liunian_jias, shens=tuple(_bits(self._gan_shens[gan_] | self._zhi_shens[zhi_])))
+
+    def dayun(self, seq):
+        '''第 seq 步大运（从 0 开始），liunians 为空'''
+        row = self._dayuns.get(seq)
+        if row is None:
+            year = self.start_year + seq * 10
+            item = self.interaction(self.chart.dayun_ids[seq])
+            row = self._dayuns[seq] = Transit(
+                age=year - self.birth_year + 1, year=year, gan=item.gan, zhi=item.zhi, shen=item.shen,
+                status=item.status, hidden=item.hidden, relations=item.relations, empty=item.empty,
+                fu=item.fu, nayin=item.nayin, he=item.he, chong=item.chong, jias=item.jias,
+                shens=item.shens, marks=())
+        return row
+
+    def dayun_of(self, year):
+        '''year 所在的大运，起运之前为 None'''
+        seq = (year - self.start_year) // 10
+        return self.dayun(seq) if 0 <= seq < self.STEPS else None
+
+    def liunian(self, year, dayun=None):
+        '''year 的流年，dayun 为所在的大运'''
+        item = self.interaction((year - 4) % 60)
+        gan_, zhi_ = item.gan, item.zhi
+        relations_, jias, he, chong = item.liunian_relations, item.liunian_jias, item.he, item.chong
+        all_zhis = self._mask | 1 << zhi_
+        if dayun is not None:
+            # 与大运的关系：地支关系（原局已有此地支时不重复）、夹拱、合冲
+            all_zhis |= 1 << dayun.zhi
+            if not self._mask >> dayun.zhi & 1:
+                relations_ += tuple((type_, dayun.zhi)
+                                    for type_ in relation_types[zhi_relation_matrix[zhi_][dayun.zhi] & ~_PO_BIT])
+            if dayun.gan == gan_:
+                jias += tuple(_jias(gan_, zhi_, (dayun.gan,), (dayun.zhi,), self.chart.zhi_ids, liunian=True))
+            if he == NONE and dayun.gan == gan_he_table[gan_]:
+                he = dayun.gan
+            if chong == NONE and dayun.gan == gan_chong_table[gan_]:
+                chong = dayun.gan
+        return Transit(
+            age=year - self.birth_year + 1, year=year, gan=gan_, zhi=zhi_, shen=item.shen,
+            status=item.status, hidden=item.hidden, relations=relations_, empty=item.empty,
+            fu=item.fu, nayin=item.nayin, he=he, chong=chong, jias=jias, shens=item.shens,
+            marks=tuple(seq for seq, mask in self._marks if all_zhis & mask == mask))
+
+    def years(self, from_year=None, to_year=None):
+        '''逐年生成 (大运, 流年)，包括 to_year。
+
+        默认从第一步大运开始到第九步大运结束；年份限于出生那年至第十二步大运结束，超出的部分略去。
+        '''
+        from_year = self.start_year if from_year is None else max(from_year, self.birth_year)
+        if to_year is None:
+            to_year = self.start_year + self.DEFAULT_STEPS * 10 - 1
+        for year in range(from_year, min(to_year, self.end_year) + 1):
+            dayun = self.dayun_of(year)
+            profiling.count('chart.transits')
+            yield dayun, self.liunian(year, dayun)
+
+
+def _yuns(transits):
+    '''大运和流年，每个大运的 liunians 为其中的十年'''
+    result = []
+    for seq in range(transits.DEFAULT_STEPS):
+        dayun = transits.dayun(seq)
+        liunians = [transits.liunian(year, dayun) for year in range(dayun.year, dayun.year + 10)]
+        result.append(dayun._replace(liunians=liunians))
+    profiling.count('chart.transits', len(result) * 11)
+    return result
+
+
+def compute_chart_from_pillars(gans, zhis, female=False):
+    '''只根据八字排盘。
+
+    Args:
+        gans: 年月日时四个天干，如 "甲丙戊庚"
+        zhis: 年月日时四个地支
+        female: 是否女命
+
+    Returns:
+        Chart，不含日历和大运流年信息
+    '''
+    return Chart(gans, zhis, female)
+
+
+def compute_chart(year, month, day, time, gregorian=False, leap=False, female=False):
+    '''根据出生时间排盘。
+
+    Args:
+        year, month, day, time: 出生年月日时，默认为农历
+        gregorian: 是否为公历
+        leap: 是否为闰月，仅用于农历
+        female: 是否女命
+
+    Returns:
+        Chart，包含日历、大运和流年，大运流年在访问 yuns 时计算
+    '''
+    profiling.count('chart.charts')
+    # 历法用 calendar_backend 的默认后端，见该模块
+    calendar = calendar_backend.get_backend()
+    with profiling.stage('chart.calendar'):
+        if gregorian:
+            date = datetime.date(int(year), int(month), int(day))
+        else:
+            date = calendar.lunar_to_solar(int(year), int(month), int(day), leap)
+        moment = datetime.datetime(date.year, date.month, date.day, int(time))
+        lunar = calendar.solar_to_lunar(date)
+        pillars = calendar.pillars(moment)
+
+    chart = Chart([GANS[item % 10] for item in pillars], [ZHIS[item % 12] for item in pillars], female)
+
+    chart.solar = (date.year, date.month, date.day)
+    chart.lunar = (lunar.year, -lunar.month if lunar.leap else lunar.month, lunar.day)
+    # 起运按交节时刻表计算，见 jieqi_table
+    with profiling.stage('chart.qi_yun'):
+        *_, start = qi_yun(moment, chart.direction == 1)
+    chart.yun_start = start.strftime('%Y-%m-%d')
+    with profiling.stage('chart.calendar'):
+        chart.ming_gong = calendar_backend.ming_gong(pillars)
+        chart.tai_yuan = calendar_backend.tai_yuan(pillars)
+        prev_jieqi = calendar.prev_jieqi(moment, whole_day=True)
+        next_jieqi = calendar.next_jieqi(moment, whole_day=True)
+        chart.prev_jieqi = (prev_jieqi.name, prev_jieqi.moment.strftime('%Y-%m-%d %H:%M:%S'))
+        chart.next_jieqi = (next_jieqi.name, next_jieqi.moment.strftime('%Y-%m-%d %H:%M:%S'))
+        chart.xiu, chart.xiu_song = calendar_backend.xiu(date, pillars.day)
+    chart._yun = start
+    return chart
+
+
+def _findings(chart):
+    '''断语：调候、六亲、格局等规则的文字说明，以及所有格 all_ges。
+
+    有条件的断语都写成 rules.RULES 中的规则，按特征一次找出，在原来的位置按段落输出；
+    这里只剩查表或带八字内容的输出（调候、六亲、神煞、贵人、学堂、将星等）。
+    '''
+    gans, zhis, me, zhus = chart.gans, chart.zhis, chart.me, chart.zhus
+    scores, gan_scores = chart.scores, chart.gan_scores
+    all_shens, statuses, female = chart.all_shens, chart.statuses, chart.female
+    all_ges = []
+
+    note = _Notes()
+
+    findings = rules.RULES.match(chart)
+    sections = collections.defaultdict(list)
+    for finding in findings:
+        sections[finding.section].append(finding)
+
+    def apply_rules(section):
+        for finding in sections.get(section, ()):
+            if finding.ge:
+                all_ges.append(finding.ge)
+            for text in finding.texts:
+                note(text, end=finding.end)
+
+    note("调候：", tiaohous['{}{}'.format(me, zhis[1])], "\t##金不换大运：", jinbuhuan['{}{}'.format(me, zhis[1])])
+    note("金不换大运：说明：", jins['{}'.format(me)])
+    note("格局选用：", ges[ten_deities[me]['本']][zhis[1]])
+
+    # 缺四生、三奇、胎绝、四大空亡等
+    apply_rules('general')
+
+    for item in all_shens:
+        note(item, ":",  shens_infos[item])
+
+    apply_rules('female')
+
+    note("-"*120)
+
+    liuqins = bidict({'才': '父亲',"财":'财' if female else '妻', "印": '母亲', "枭": '偏印' if female else '祖父',
+                      "官":'丈夫' if female else '女儿', "杀":'情夫' if female else '儿子', "劫":'兄弟' if female else '姐妹', "比":'姐妹' if female else '兄弟', 
+                      "食":'女儿' if female else '下属', "伤":'儿子' if female else '孙女'})
+
+    # 六亲分析
+    for item in Gan:
+        note("{}:{} {}-{} {} {} {}".format(item, ten_deities[me][item], liuqins[ten_deities[me][item]],  ten_deities[item][zhis[0]] ,ten_deities[item][zhis[1]], ten_deities[item][zhis[2]], ten_deities[item][zhis[3]]), end='  ')
+        if Gan.index(item) == 4:
+            note()
+
+    note()
+    note()
+
+    # 三合局、三会局，jus 见 Chart.jus
+    zhis_g = set(zhis) | set(chart.gongs)
+    for item in zhi_hes:
+        if set(item).issubset(zhis_g):
+            note("三合局", item)
+
+    for item in zhi_huis:
+        if set(item).issubset(zhis_g):
+            note("三会局", item)
+
+    for item in gan_scores:  
+        note("{}[{}]-{} ".format(
+            item, ten_deities[me][item], gan_scores[item]),  end='  ')    
+    note()
+    note("-"*120)
+    yinyangs(zhis, note)
+
+    minggong = Zhi[::-1][(Zhi.index(zhis[1]) + Zhi.index(zhis[3]) -6  )%12 ]
+    note(minggong, minggongs[minggong])
+    note("坐：", rizhus[me+zhis.day])
+
+    # 地网、天罗、魁罡、金神、六阴朝阳、从格等
+    apply_rules('special')
+    # 日时、相邻柱的干支关系
+    apply_rules('relation')
+    # 建禄格
+    apply_rules('jianlu')
+    # 甲分析、冬金子月
+    apply_rules('day_master')
+    # 比肩分析
+    apply_rules('bi')
+    # 日坐禄、时坐禄、日库
+    apply_rules('lu')
+    # 劫财分析
+    apply_rules('jie')
+    # 阳刃格
+    apply_rules('yangren')
+    # 偏印分析
+    apply_rules('xiao')
+    # 印分析
+    apply_rules('yin')
+    # 偏财分析
+    apply_rules('piancai')
+    # 财分析
+    apply_rules('cai')
+    # 官分析
+    apply_rules('guan')
+    # 杀分析
+    apply_rules('sha')
+    # 自坐绝、时坐绝
+    apply_rules('jue')
+    # 杀禄、杀格
+    apply_rules('sha_lu')
+    apply_rules('sha_ge')
+    # 食分析
+    apply_rules('shi')
+    # 伤分析
+    apply_rules('shang')
+
+    note("局", chart.jus, "格", all_ges, )
+
+    chart.all_ges = all_ges
+    chart.notes = note.lines()
+    chart.rule_findings = findings
+
+    note = _Notes()
+    # 检查三会 三合的拱合
+    result = ''
+    #for i in range(2):
+        #result += check_gong(zhis, i*2, i*2+1, me, gong_he)
+        #result += check_gong(zhis, i*2, i*2+1, me, gong_hui, '三会拱')
+
+    result += check_gong(zhis, 1, 2, me, gong_he)
+    result += check_gong(zhis, 1, 2, me, gong_hui, '三会拱')
+
+    if result:
+        note(result)
+
+    note("="*120)   
+
+    # 格局分析，ge 见 Chart.ge
+    if chart.ge == '建':
+        note(jianlu_desc)
+        note("-"*120)
+        note(jianlus[(me, zhis.month)]) 
+        note("-"*120 + "\n")
+
+    # 天乙贵人
+    flag = False
+    for items in tianyis[me]:
+        for item in items:
+            if item in zhis:
+                if not flag:
+                    note("| 天乙贵人：", end=' ')
+                    flag = True
+                note(item, end=' ')
+
+    # 玉堂贵人
+    flag = False
+    for items in yutangs[me]:
+        for item in items:
+            if item in zhis:
+                if not flag:
+                    note("| 玉堂贵人：", end=' ')
+                    flag = True
+                note(item, end=' ')            
+
+    # 天罗
+    if  nayins[zhus[0]][-1] == '火':			
+        if zhis.day in '戌亥':
+            note("| 天罗：{}".format(zhis.day), end=' ') 
+
+    # 地网		
+    if  nayins[zhus[0]][-1] in '水土':			
+        if zhis.day in '辰巳':
+            note("| 地网：{}".format(zhis.day), end=' ') 		
+
+
+
+    # 学堂分析
+    for seq, item in enumerate(statuses):
+        if item == '长':
+            note("学堂:", zhis[seq], "\t", end=' ')
+            if  nayins[zhus[seq]][-1] == ten_deities[me]['本']:
+                note("正学堂:", nayins[zhus[seq]], "\t", end=' ')
+
+
+    #xuetang = xuetangs[ten_deities[me]['本']][1]
+    #if xuetang in zhis:
+        #note("学堂:", xuetang, "\t\t", end=' ')
+        #if xuetangs[ten_deities[me]['本']] in zhus:
+            #note("正学堂:", xuetangs[ten_deities[me]['本']], "\t\t", end=' ')
+
+    # 学堂分析
+
+    for seq, item in enumerate(statuses):
+        if item == '建':
+            note("| 词馆:", zhis[seq], end=' ')
+            if  nayins[zhus[seq]][-1] == ten_deities[me]['本']:
+                note("- 正词馆:", nayins[zhus[seq]], end=' ')
+
+
+    ku = ten_deities[me]['库'][0]    
+    if ku in zhis:
+        note("库：",ku, end=' ')
+
+        for item in zhus: 
+            if ku != zhus[1]:
+                continue
+            if nayins[item][-1] == ten_deities[me]['克']:
+                note("库中有财，其人必丰厚")
+            if nayins[item][-1] == ten_deities[me]['被克']:
+                note(item, ten_deities[me]['被克'])
+                note("绝处无依，其人必滞")    
+
+    note()
+
+    # 天元分析
+    for item in zhi5[zhis[2]]:    
+        name = ten_deities[me][item]
+        note(self_zuo[name])
+    note("-"*120)
+
+    # 出身分析
+    apply_rules('birth')
+    # 食神、伤官、劫财、财、官、杀、印、偏印格的分析，以及财库、官库
+    apply_rules('ge_shi')
+    apply_rules('ge_shang')
+    apply_rules('ge_jie')
+    apply_rules('ge_cai')
+    apply_rules('cai_ku')
+    apply_rules('ge_guan')
+    apply_rules('guan_ku')
+    apply_rules('ge_sha')
+    apply_rules('ge_yin')
+    apply_rules('ge_xiao')
+
+    gan_ = tuple(gans)
+    for item in Gan:
+        if gan_.count(item) == 3:
+            note("三字干：", item, "--", gan3[item])
+            break
+
+    gan_ = tuple(gans)
+    for item in Gan:
+        if gan_.count(item) == 4:
+            note("四字干：", item, "--", gan4[item])
+            break    
+
+    zhi_ = tuple(zhis)
+    for item in Zhi:
+        if zhi_.count(item) > 2:
+            note("三字支：", item, "--", zhi3[item])
+            break
+
+    note("="*120)  
+    note("你属:", me, "特点：--", gan_desc[me],"\n")
+    note("年份:", zhis[0], "特点：--", zhi_desc[zhis[0]],"\n")
+
+
+
+
+
+    # 羊刃分析
+    key = '帝' if Gan.index(me)%2 == 0 else '冠'
+
+    if ten_deities[me].inverse[key] in zhis:
+        note("\n羊刃:", me, ten_deities[me].inverse[key])  
+        note("======================参考：https://www.jianshu.com/p/c503f7b3ed04")  
+        if ten_deities[me].inverse['冠']:
+            note("羊刃重重又见禄，富贵饶金玉。 官、印相助福相资。")  
+        else:
+            note("劳累命！")
+
+
+
+
+    # 将星分析
+    me_zhi = zhis[2]
+    other_zhis = zhis[:2] + zhis[3:]
+    flag = False
+    tmp_list = []
+    if me_zhi in ("申", "子", "辰"):
+        if "子" in other_zhis:
+            flag = True
+            tmp_list.append((me_zhi, '子'))
+    elif me_zhi in ("丑", "巳", "酉"):
+        if "酉" in other_zhis:
+            flag = True   
+            tmp_list.append((me_zhi, '酉'))
+    elif me_zhi in ("寅", "午", "戌"):
+        if "午" in other_zhis:
+            flag = True     
+            tmp_list.append((me_zhi, '午'))
+    elif me_zhi in ("亥", "卯", "未"):
+        if "卯" in other_zhis:
+            flag = True   
+            tmp_list.append((me_zhi, '卯'))
+
+    if flag:
+        note("\n\n将星: 常欲吉星相扶，贵煞加临乃为吉庆。")  
+        note("=========================")   
+        note('''理愚歌》云：将星若用亡神临，为国栋梁臣。言吉助之为贵，更夹贵库墓纯粹而
+    不杂者，出将入相之格也，带华盖、正印而不夹库，两府之格也；只带库墓而带正印，员郎
+    以上，既不带墓又不带正印，止有华盖，常调之禄也；带华印而正建驿马，名曰节印，主旌节
+    之贵；若岁干库同库为两重福，主大贵。''')
+        note(tmp_list)
+
+
+    # 华盖分析
+    apply_rules('huagai')
+
+    # 咸池 桃花
+    flag = False
+    taohuas = []
+    year_zhi = zhis[0]
+    if me_zhi in ("申", "子", "辰") or year_zhi in ("申", "子", "辰"):
+        if "酉" in zhis:
+            flag = True
+            taohuas.append("酉")
+    elif me_zhi in ("丑", "巳", "酉") or year_zhi in ("丑", "巳", "酉"):
+        if "午" in other_zhis:
+            flag = True   
+            taohuas.append("午")
+    elif me_zhi in ("寅", "午", "戌") or year_zhi in ("寅", "午", "戌"):
+        if "卯" in other_zhis:
+            flag = True    
+            taohuas.append("卯")
+    elif me_zhi in ("亥", "卯", "未") or year_zhi in ("亥", "卯", "未"):
+        if "子" in other_zhis:
+            flag = True   
+            taohuas.append("子")
+
+    if flag:
+        note("\n\n咸池(桃花): 墙里桃花，煞在年月；墙外桃花，煞在日时；")  
+        note("=========================")   
+        note('''一名败神，一名桃花煞，其神之奸邪淫鄙，如生旺则美容仪，耽酒色，疏财好欢，
+    破散家业，唯务贪淫；如死绝，落魄不检，言行狡诈，游荡赌博，忘恩失信，私滥奸淫，
+    靡所不为；与元辰并，更临生旺者，多得匪人为妻；与贵人建禄并，多因油盐酒货得生，
+    或因妇人暗昧之财起家，平生有水厄、痨瘵之疾，累遭遗失暗昧之灾。此人入命，有破无成，
+    非为吉兆，妇人尤忌之。
+    咸池非吉煞，日时与水命遇之尤凶。''')  
+        note(taohuas, zhis)
+
+    # 禄分析
+    flag = False
+    for item in zhus:
+        if item in lu_types[me]:
+            if not flag:
+                note("\n\n禄分析:")  
+                note("=========================")	    
+            note(item,lu_types[me][item])
+
+
+    # 文星贵人
+    if wenxing[me] in zhis:
+        note("文星贵人: ", me,  wenxing[me])  
+
+    # 天印贵人
+    if tianyin[me] in zhis:
+        note("天印贵人: 此号天印贵，荣达受皇封", me,  tianyin[me])  
+
+
+    short = min(scores, key=scores.get)
+    note("\n\n五行缺{}的建议参见 http://t.cn/E6zwOMq".format(short))    
+
+
+
+    note("======================================")  
+    # 杀的阴阳、三奇等十神组合
+    apply_rules('combo')
+
+    chart.ge_notes = note.lines()
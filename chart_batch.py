@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 批量排盘：用 numpy 查表一次算出大量八字的静态结果，与 chart.Chart 中的同名字段一致。
+# 输入为 N×8 的整数数组，每行依次为 年干 年支 月干 月支 日干 日支 时干 时支 的编号（见 ganzhi_codes）。
+
+import numpy as np
+
+from ganzhi_codes import *
+
+_gan_shen = np.array(gan_shen_table, dtype=np.int8)                      # [日干, 天干]
+_zhi_shen = _gan_shen[:, main_gan_table]                                 # [日干, 地支]
+_zhi_status = np.array(zhi_status_table, dtype=np.int8)                  # [天干, 地支]
+_gan_elements = np.array(gan_elements, dtype=np.int8)
+_gan_temps = np.array(gan_temps, dtype=np.int16)
+_zhi_temps = np.array(zhi_temps, dtype=np.int16)
+
+# 地支藏干的分数，按天干和按五行
+_hidden_gan_scores = np.zeros((12, 10), dtype=np.int16)
+_hidden_element_scores = np.zeros((12, 5), dtype=np.int16)
+for _zhi, _hidden in enumerate(hidden_table):
+    for _gan, _score in _hidden:
+        _hidden_gan_scores[_zhi, _gan] += _score
+        _hidden_element_scores[_zhi, gan_elements[_gan]] += _score
+
+_strong_shens = np.isin(_gan_shen, [SHENS.index(item) for item in ('比', '劫', '枭', '印')])
+_root_statuses = [STATUSES.index(item) for item in ('长', '帝', '建')]
+_BI = SHENS.index('比')
+
+
+_zhi_relations = np.array(zhi_relation_matrix, dtype=np.int16)          # [地支, 地支] 关系的位掩码
+
+
+def _relation_matrix(name, both=False):
+    result = (_zhi_relations >> ZHI_RELATIONS.index(name) & 1).astype(bool)
+    return result | result.T if both else result
+
+_liuhe = _relation_matrix('六')
+_chong = _relation_matrix('冲')
+_xing = _relation_matrix('刑', both=True)
+_gan_he = np.zeros((10, 10), dtype=bool)
+_gan_he[np.arange(10), gan_he_table] = True
+
+
+def _adjacent(matrix, items):
+    '''相邻两柱满足关系时两柱都标记'''
+    pairs = matrix[items[:, :-1], items[:, 1:]]
+    flags = np.zeros(items.shape, dtype=bool)
+    flags[:, :-1] |= pairs
+    flags[:, 1:] |= pairs
+    return flags
+
+
+def compute_charts_batch(pillars):
+    '''批量计算八字的静态结果。
+
+    Args:
+        pillars: N×8 整数数组，每行为 年干 年支 月干 月支 日干 日支 时干 时支 的编号
+
+    Returns:
+        dict，值都是第一维为 N 的数组:
+            gan_shen_ids [N,4]（日柱为 NONE）、zhi_shen_ids [N,4]、
+            element_scores [N,5]（按 ELEMENTS）、gan_score_list [N,10]、
+            strong [N]、weak [N]、temps_scores [N]、
+            zhi_6he、zhi_6chong、gan_he、zhi_xing [N,4]
+    '''
+    pillars = np.asarray(pillars, dtype=np.intp)
+    if pillars.ndim != 2 or pillars.shape[1] != 8:
+        raise ValueError("pillars 应为 N×8 的数组")
+    gans = pillars[:, 0::2]
+    zhis = pillars[:, 1::2]
+    me = gans[:, 2:3]
+
+    gan_shen_ids = _gan_shen[me, gans]
+    gan_shen_ids[:, 2] = NONE
+    zhi_shen_ids = _zhi_shen[me, zhis]
+
+    # 五行分数：天干各 5 分，地支按藏干，月令加倍
+    zhis_month = np.concatenate([zhis, zhis[:, 1:2]], axis=1)
+    element_scores = _hidden_element_scores[zhis_month].sum(axis=1)
+    np.add.at(element_scores, (np.arange(len(pillars))[:, None], _gan_elements[gans]), 5)
+    gan_score_list = _hidden_gan_scores[zhis_month].sum(axis=1)
+    np.add.at(gan_score_list, (np.arange(len(pillars))[:, None], gans), 5)
+
+    # 子平真诠的强弱：日干在地支有长生、帝旺、临官，或比肩超过2个
+    weak = ~np.isin(_zhi_status[me, zhis], _root_statuses).any(axis=1)
+    bis = (gan_shen_ids == _BI).sum(axis=1) + (zhi_shen_ids == _BI).sum(axis=1)
+    weak &= bis <= 2
+
+    strong = (gan_score_list * _strong_shens[me[:, 0]]).sum(axis=1)
+    temps_scores = _gan_temps[gans].sum(axis=1) + _zhi_temps[zhis].sum(axis=1) + _zhi_temps[zhis[:, 1]]
+
+    return {
+        'gan_shen_ids': gan_shen_ids,
+        'zhi_shen_ids': zhi_shen_ids,
+        'element_scores': element_scores,
+        'gan_score_list': gan_score_list,
+        'strong': strong,
+        'weak': weak,
+        'temps_scores': temps_scores,
+        'zhi_6he': _adjacent(_liuhe, zhis),
+        'zhi_6chong': _adjacent(_chong, zhis),
+        'gan_he': _adjacent(_gan_he, gans),
+        'zhi_xing': _adjacent(_xing, zhis),
+    }
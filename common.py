@@ -5,14 +5,60 @@
 
 import argparse
 import collections
+import contextlib
+import os
 import pprint
 import datetime
+import tempfile
 
 from bidict import bidict
 
+try:
+    import fcntl
+except ImportError:
+    # Windows 上不加锁，同时生成时各写各的临时文件，只是多算几遍
+    fcntl = None
+
 from datas import *
 from ganzhi import *
-from sizi import summarys
+
+def data_path(name):
+    '''生成的数据文件路径，目录默认为代码目录下的 data，可用环境变量 BAZI_DATA_DIR 指定'''
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    return os.path.join(os.environ.get('BAZI_DATA_DIR', default), name)
+
+@contextlib.contextmanager
+def atomic_write(path):
+    '''with atomic_write(路径) as f: 写入同目录下单独的临时文件，写完后改名为 path；
+    几个进程同时生成同一个文件时各写各的，读到的总是完整的文件，出错时删掉临时文件'''
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+        # mkstemp 建的文件只有本用户可读
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+@contextlib.contextmanager
+def build_lock(path):
+    '''with build_lock(路径): 生成 path 前加的文件锁（path.lock），同时启动的几个进程只有一个在生成，
+    其余的等它写完；拿到锁后应先看文件是否已经生成'''
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path + '.lock', 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
 def check_gan(gan, gans):
     result = ''
@@ -28,14 +74,14 @@ def yinyang(item):
     else:
         return '＋' if Zhi.index(item)%2 == 0 else '－'
     
-def yinyangs(zhis):
+def yinyangs(zhis, out=print):
     result = []
     for item in zhis:
         result.append(yinyang(item))
     if set(result) == set('＋'):
-        print("四柱全阳")
+        out("四柱全阳")
     if set(result) == set('－'):
-        print("四柱全阴")
+        out("四柱全阴")
     
     
     
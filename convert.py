@@ -4,7 +4,8 @@
 # CreateDate: 2019-2-21
 
 import argparse
-import subprocess
+
+import bazi
 
 description = '''
 '''
@@ -22,4 +23,4 @@ for item in zip(options.gans, options.zhis):
 
 #subprocess.call("cls", shell=True)
 print(result)
-print(subprocess.check_output("python bazi.py -b " + result, shell=True).decode('gbk'))
+bazi.main(['-b'] + result.split())
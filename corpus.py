@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 古籍断语：《三命通会》（sizi.summarys）和《穷通宝鉴》（yue.months）打包为一个文件，
+# 按偏移索引读取，一次排盘只解码用到的两段，不必导入 sizi.py、yue.py（约 260KB 源码）。
+# 文件头记录 sizi.py、yue.py 的大小和修改时间（与 .pyc 相同），源码改动后自动重新生成；目录不可写时直接导入这两个模块。
+#
+# 生成: python corpus.py [-o 输出文件]
+
+import argparse
+import functools
+import mmap
+import os
+import struct
+
+from common import atomic_write, data_path
+
+MAGIC = b'BZCP'
+VERSION = 1
+# magic, version, 条数, 键区字节数, sizi.py 和 yue.py 的大小和修改时间
+HEADER = struct.Struct('<4sIII32s')
+# 类别, 键的偏移, 键的长度, 正文的偏移, 正文的长度；偏移和长度按字节计，
+# 记录之后是键区和正文区，打开时只读键区，正文用到时才读
+RECORD = struct.Struct('<BIHII')
+SUMMARY, MONTH = 0, 1
+SOURCES = ('sizi.py', 'yue.py')
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+
+def default_path():
+    return os.environ.get('BAZI_CORPUS', data_path('corpus.bin'))
+
+
+def sources_digest():
+    '''不读源码，只比较大小和修改时间'''
+    stats = [os.stat(os.path.join(BASE, name)) for name in SOURCES]
+    return b''.join(struct.pack('<qq', item.st_size, item.st_mtime_ns) for item in stats)
+
+
+def _tables():
+    '''从源码模块导入两部书'''
+    from sizi import summarys
+    from yue import months
+    return summarys, months
+
+
+def build(path):
+    records = []
+    keys = bytearray()
+    texts = bytearray()
+    for kind, table in enumerate(_tables()):
+        for key, text in table.items():
+            key, text = key.encode('utf-8'), text.encode('utf-8')
+            records.append(RECORD.pack(kind, len(keys), len(key), len(texts), len(text)))
+            keys += key
+            texts += text
+
+    with atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(records), len(keys), sources_digest()))
+        f.write(b''.join(records))
+        f.write(keys)
+        f.write(texts)
+
+
+class Corpus:
+    '''mmap 打开的古籍文件，index 为 {(类别, 键): (偏移, 长度)}'''
+
+    def __init__(self, path, digest=None):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, key_size, stored = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError("{} 不是古籍文件".format(path))
+        if digest is not None and stored != digest:
+            self.mm.close()
+            raise ValueError("{} 与 sizi.py、yue.py 不一致".format(path))
+        base = HEADER.size + count * RECORD.size
+        keys = self.mm[base:base + key_size]
+        base += key_size
+        self.index = {}
+        for kind, key_at, key_len, text_at, text_len in RECORD.iter_unpack(self.mm[HEADER.size:base - key_size]):
+            self.index[kind, keys[key_at:key_at + key_len].decode('utf-8')] = (base + text_at, text_len)
+
+    def get(self, kind, key):
+        item = self.index.get((kind, key))
+        if item is None:
+            return None
+        return self.mm[item[0]:item[0] + item[1]].decode('utf-8')
+
+
+class _Modules:
+    '''没有古籍文件时直接用源码模块中的字典'''
+
+    def __init__(self):
+        self.tables = _tables()
+
+    def get(self, kind, key):
+        return self.tables[kind].get(key)
+
+
+_corpus = None
+
+def get_corpus():
+    '''默认路径的古籍文件，缺失或过期时重新生成，无法生成时导入源码模块'''
+    global _corpus
+    if _corpus is None:
+        path = default_path()
+        digest = sources_digest()
+        try:
+            _corpus = Corpus(path, digest)
+        except (OSError, ValueError):
+            try:
+                build(path)
+                _corpus = Corpus(path, digest)
+            except OSError:
+                _corpus = _Modules()
+    return _corpus
+
+
+@functools.lru_cache(maxsize=int(os.environ.get('BAZI_CORPUS_CACHE', 256)))
+def _text(kind, key):
+    return get_corpus().get(kind, key)
+
+
+def get_summary(day_gan, hour_pillar):
+    '''《三命通会》日干与时柱的断语，如 get_summary('甲', '甲子')，没有时返回 None'''
+    return _text(SUMMARY, day_gan + '日' + hour_pillar)
+
+
+def get_month_text(day_gan, month_zhi):
+    '''《穷通宝鉴》日干与月支的论述，如 get_month_text('甲', '寅')，没有时返回 None'''
+    return _text(MONTH, day_gan + month_zhi)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='打包《三命通会》《穷通宝鉴》断语')
+    parser.add_argument('-o', '--output', default=default_path(), help='输出文件')
+    options = parser.parse_args()
+    build(options.output)
+    print("写入", options.output)
+
+
+if __name__ == '__main__':
+    main()
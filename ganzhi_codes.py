@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 干支的整数编码：天干 0-9，地支 0-11，六十甲子 0-59（甲子为0）。
+# 下面的表都由 ganzhi.py、datas.py 中的汉字表推导，用元组按编号直接取值，
+# 排盘内部只用编号，汉字只在显示时通过 GANS、ZHIS、SHENS 等名称表转换。
+
+from datas import *
+
+GANS = tuple(Gan)
+ZHIS = tuple(Zhi)
+# 十神、十二长生、五行的编号
+SHENS = ('比', '劫', '食', '伤', '才', '财', '杀', '官', '枭', '印')
+STATUSES = ('长', '沐', '冠', '建', '帝', '衰', '病', '死', '墓', '绝', '胎', '养')
+ELEMENTS = ('金', '木', '水', '火', '土')
+# 地支关系，与 zhi_atts 中的顺序相同
+ZHI_RELATIONS = ('冲', '刑', '被刑', '合', '会', '害', '破', '六', '暗')
+# 天干五行与地支五行的生克符号
+ELEMENT_MARKS = ('=', '→', '↓', '←', '↑')
+
+NONE = -1
+
+gan_ids = {item: seq for seq, item in enumerate(GANS)}
+zhi_ids = {item: seq for seq, item in enumerate(ZHIS)}
+
+
+def ganzhi_id(gan, zhi):
+    '''天干、地支编号对应的六十甲子编号'''
+    return (6 * gan - 5 * zhi) % 60
+
+
+def ganzhi_name(seq):
+    return GANS[seq % 10] + ZHIS[seq % 12]
+
+
+# 十神: gan_shen_table[日干][天干]
+gan_shen_table = tuple(tuple(SHENS.index(ten_deities[me][gan]) for gan in GANS) for me in GANS)
+# 十二长生: zhi_status_table[天干][地支]
+zhi_status_table = tuple(tuple(STATUSES.index(ten_deities[gan][zhi]) for zhi in ZHIS) for gan in GANS)
+# 禄: 天干的临官之位
+lu_table = tuple(zhi_ids[ten_deities[gan].inverse['建']] for gan in GANS)
+gan_he_table = tuple(gan_ids[ten_deities[gan]['合']] for gan in GANS)
+gan_chong_table = tuple(gan_ids.get(ten_deities[gan]['冲'], NONE) for gan in GANS)
+
+gan_elements = tuple(ELEMENTS.index(gan5[gan]) for gan in GANS)
+zhi_elements = tuple(ELEMENTS.index(zhi_wuhangs[zhi]) for zhi in ZHIS)
+element_mark_table = tuple(tuple(ELEMENT_MARKS.index(relations[(gan_element, zhi_element)])
+                                 for zhi_element in ELEMENTS) for gan_element in ELEMENTS)
+gan_temps = tuple(temps[gan] for gan in GANS)
+zhi_temps = tuple(temps[zhi] for zhi in ZHIS)
+
+# 藏干: hidden_table[地支] = ((天干, 分数), ...)，第一个为本气
+hidden_table = tuple(tuple((gan_ids[gan], zhi5[zhi][gan]) for gan in zhi5[zhi]) for zhi in ZHIS)
+# 主气: zhi5 中分数最高的藏干
+main_gan_table = tuple(gan_ids[max(zhi5[zhi], key=zhi5[zhi].get)] for zhi in ZHIS)
+
+# 地支关系: zhi_relation_table[地支][关系] = (地支, ...)
+zhi_relation_table = tuple(tuple(tuple(zhi_ids[item] for item in zhi_atts[zhi][type_])
+                                 for type_ in ZHI_RELATIONS) for zhi in ZHIS)
+# 地支关系矩阵: zhi_relation_matrix[地支a][地支b] 的第 t 位为 1 表示 b 在 a 的 ZHI_RELATIONS[t] 中
+zhi_relation_matrix = tuple(tuple(sum(1 << type_ for type_, values in enumerate(zhi_relation_table[zhi1]) if zhi2 in values)
+                                  for zhi2 in range(12)) for zhi1 in range(12))
+# 掩码中的关系编号: relation_types[掩码] = (关系, ...)，从低位到高位
+relation_types = tuple(tuple(type_ for type_ in range(len(ZHI_RELATIONS)) if mask >> type_ & 1)
+                       for mask in range(1 << len(ZHI_RELATIONS)))
+gong_he_table = tuple(tuple(zhi_ids[gong_he[zhi1 + zhi2]] if zhi1 + zhi2 in gong_he else NONE
+                            for zhi2 in ZHIS) for zhi1 in ZHIS)
+
+# 纳音和空亡按六十甲子编号
+NAYINS = tuple(dict.fromkeys(nayins.values()))
+nayin_table = tuple(NAYINS.index(nayins[(GANS[seq % 10], ZHIS[seq % 12])]) for seq in range(60))
+empty_table = tuple(tuple(zhi_ids[item] for item in empties[(GANS[seq % 10], ZHIS[seq % 12])])
+                    for seq in range(60))
+
+wang_table = tuple(zhi_ids[wangs[zhi]] for zhi in ZHIS)
+jiesha_table = tuple(zhi_ids[jieshas[zhi]] for zhi in ZHIS)
+
+# 神煞：按年支、月令、日支、日干查
+SHENSHA_YEAR, SHENSHA_MONTH, SHENSHA_DAY, SHENSHA_GAN = range(4)
+SHENSHAS = tuple(year_shens) + tuple(month_shens) + tuple(day_shens) + tuple(g_shens)
+shensha_kinds = (SHENSHA_YEAR,) * len(year_shens) + (SHENSHA_MONTH,) * len(month_shens) + \
+    (SHENSHA_DAY,) * len(day_shens) + (SHENSHA_GAN,) * len(g_shens)
+
+
+def _masks(values, names):
+    return tuple(sum(1 << seq for seq, name in enumerate(names) if name in value) for value in values)
+
+
+def _shensha_masks():
+    gan_masks = []
+    zhi_masks = []
+    for table in (year_shens, month_shens, day_shens, g_shens):
+        keys = GANS if table is g_shens else ZHIS
+        for item in table:
+            values = [table[item][key] for key in keys]
+            gan_masks.append(_masks(values, GANS) if table is month_shens else (0,) * len(keys))
+            zhi_masks.append(_masks(values, ZHIS))
+    return tuple(gan_masks), tuple(zhi_masks)
+
+
+# shensha_gan_masks[神煞][查表用的干支] 为命中的天干位图，shensha_zhi_masks 为地支位图
+shensha_gan_masks, shensha_zhi_masks = _shensha_masks()
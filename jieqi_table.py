@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 交节时刻表：每年立春起的 12 个节（立春、惊蛰……小寒）的交节时刻，为北京时间的 JD，
+# 按时间顺序存为 float64 数组。起运时二分查找出生前后的节，不再每次推算节气。
+# 交节时刻取自 calendar_backend（默认为由 lunar_python 生成的历法表），与排盘的四柱、节气相同；
+# 表缺失或格式不对时自动生成，年份超出范围时用 calendar_backend 现算，结果相同。
+#
+# 生成: python jieqi_table.py [-o 输出文件] [--start 1800] [--end 2200]
+
+import argparse
+import array
+import bisect
+import datetime
+import os
+import struct
+
+import calendar_backend
+from calendar_backend import to_jd, from_jd
+from common import atomic_write, data_path
+
+MAGIC = b'BZJQ'
+VERSION = 2
+# magic, version, 起始年, 结束年；其后为 (结束年-起始年+1)*12 个 float64
+HEADER = struct.Struct('<4sIii')
+START = 1800
+END = 2200
+
+
+def year_jies(year):
+    '''year 年立春起的 12 个节的交节时刻'''
+    calendar = calendar_backend.get_backend()
+    # 立春在 2 月 3 日至 5 日，从 2 月 1 日之前的节气往后数
+    term = calendar.prev_jieqi(datetime.datetime(year, 2, 1))
+    items = []
+    while len(items) < 12:
+        term = calendar.next_jieqi(term.moment)
+        if term.index % 2 == 1 and (items or term.index == calendar_backend.LI_CHUN):
+            items.append(to_jd(term.moment))
+    return items
+
+
+def build(path, start=START, end=END):
+    if end < start:
+        raise ValueError("年份范围不对：{}-{}".format(start, end))
+    items = array.array('d')
+    for year in range(start, end + 1):
+        items.extend(year_jies(year))
+
+    with atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, start, end))
+        f.write(struct.pack('<{}d'.format(len(items)), *items))
+
+
+class JieqiTable:
+    '''交节时刻表，items 为 JD 的 array('d')'''
+
+    def __init__(self, start, end, items):
+        self.start = start
+        self.end = end
+        self.items = items
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, start, end = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} 不是交节时刻表".format(path))
+        count = (end - start + 1) * 12
+        if len(data) != HEADER.size + count * 8:
+            raise ValueError("{} 长度不对".format(path))
+        return cls(start, end, array.array('d', struct.unpack_from('<{}d'.format(count), data, HEADER.size)))
+
+    def around(self, jd):
+        '''jd 之前（含）和之后的交节时刻，超出范围时返回 None'''
+        i = bisect.bisect_right(self.items, jd)
+        if i == 0 or i == len(self.items):
+            return None
+        return self.items[i - 1], self.items[i]
+
+
+def default_path():
+    return os.environ.get('BAZI_JIEQI_TABLE', data_path('jieqi.bin'))
+
+
+_table = None
+
+def get_table():
+    '''默认路径的表，缺失或格式不对时重新生成，无法生成时返回 None'''
+    global _table
+    if _table is None:
+        path = default_path()
+        try:
+            _table = JieqiTable.load(path)
+        except (OSError, ValueError):
+            try:
+                build(path)
+                _table = JieqiTable.load(path)
+            except (OSError, ValueError):
+                _table = False
+    return _table or None
+
+
+def around(moment):
+    '''出生时刻 moment 之前（含）和之后的节，返回两个 datetime'''
+    jd = to_jd(moment)
+    table = get_table()
+    pair = table.around(jd) if table is not None else None
+    if pair is None:
+        items = year_jies(moment.year - 1) + year_jies(moment.year) + year_jies(moment.year + 1)
+        pair = JieqiTable(moment.year - 1, moment.year + 1, items).around(jd)
+    return from_jd(pair[0]), from_jd(pair[1])
+
+
+def _zhi_index(moment):
+    '''时辰编号，与 lunar_python 相同：23 点算亥时'''
+    return 11 if moment.hour == 23 else (moment.hour + 1) // 2 % 12
+
+
+def _add_months(moment, months):
+    '''加若干个月，日超过当月天数时取月末'''
+    year, month = divmod(moment.month - 1 + months, 12)
+    year += moment.year
+    month += 1
+    days = (datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.date(year, month, 1)).days
+    return moment.replace(year=year, month=month, day=min(moment.day, days))
+
+
+def qi_yun(moment, forward, sect=1):
+    '''起运，moment 为出生时刻（北京时间），forward 为是否顺排。
+
+    sect 为 1 时按日数和时辰数计：三天为一年，一天为四个月，一个时辰为十天；
+    sect 为 2 时按分钟数计：4320 分钟为一年，360 分钟为一个月，12 分钟为一天，1 分钟为两小时。
+    两种算法与 lunar_python 的 getYun 相同。
+
+    Returns:
+        (年, 月, 日, 时, 起运时刻)
+    '''
+    prev_jie, next_jie = around(moment)
+    start, end = (moment, next_jie) if forward else (prev_jie, moment)
+    hour = 0
+    if sect == 2:
+        start_minutes = start.toordinal() * 1440 + start.hour * 60 + start.minute
+        minutes = end.toordinal() * 1440 + end.hour * 60 + end.minute - start_minutes
+        year, minutes = divmod(minutes, 4320)
+        month, minutes = divmod(minutes, 360)
+        day, minutes = divmod(minutes, 12)
+        hour = minutes * 2
+    else:
+        hour_diff = _zhi_index(end) - _zhi_index(start)
+        day_diff = end.toordinal() - start.toordinal()
+        if hour_diff < 0:
+            hour_diff += 12
+            day_diff -= 1
+        month_diff = hour_diff * 10 // 30
+        month = day_diff * 4 + month_diff
+        day = hour_diff * 10 - month_diff * 30
+        year, month = divmod(month, 12)
+
+    # 与 lunar_python 相同，先加年再加月，每步都把日限制在当月之内
+    result = moment.replace(second=0, microsecond=0)
+    result = _add_months(_add_months(result, year * 12), month)
+    result += datetime.timedelta(days=day, hours=hour)
+    return year, month, day, hour, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成交节时刻表')
+    parser.add_argument('-o', '--output', default=default_path(), help='输出文件')
+    parser.add_argument('--start', type=int, default=START, help='起始年')
+    parser.add_argument('--end', type=int, default=END, help='结束年（含）')
+    options = parser.parse_args()
+    build(options.output, options.start, options.end)
+    print("写入", options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,95 +4,20 @@
 # 代码地址 https://github.com/china-testing/python-api-tesing/blob/master/bazi/luohou.py
 # 鸣谢 https://github.com/yuangu/sxtwl_cpp/tree/master/python
 # CreateDate: 2019-2-21
+#
+# 逐日计算罗喉日、年猴、月罗、季猴、日九星和时飞星。days(start, end) 一次推算整段日期：
+# 日柱逐日加一，年柱、月柱和季节只在交节那天更新，农历只在月末查一次，夏至、冬至每年只查一次，
+# 历法由 calendar_backend 提供（默认查表），每天产生一条 LuoHou 记录，命令行和 bazi-api 的 /luohou 都用它。
+#
+#     $ python luohou.py -d "2019 6 16" -n 32
 
 import argparse
-import sxtwl
-import time
-import datetime
 import collections
+import datetime
 
-from lunar_python import Lunar
-from colorama import init
-
-from ganzhi import Gan, Zhi, ymc, rmc, zhi_time, jis, zhi_atts, get_jizhu, datouxiu, xiaotouxiu
-
-def get_hou(d, xiazhi, dongzhi):
-    cal_day = sxtwl.fromSolar(d.year, d.month, d.day)
-    lunar = Lunar.fromYmd(cal_day.getLunarYear(), cal_day.getLunarMonth(), cal_day.getLunarDay())
-    ba = lunar.getEightChar()
-    yun = ba.getYun(1)
-    
-    #　计算甲干相合    
-    gz = cal_day.getHourGZ(10)
-    yTG = cal_day.getYearGZ()
-    mTG = cal_day.getMonthGZ()
-    dTG  = cal_day.getDayGZ()
-    
-    
-    gans = Gans(year=Gan[yTG.tg], month=Gan[mTG.tg], 
-                day=Gan[dTG.tg])
-    zhis = Zhis(year=Zhi[yTG.dz], month=Zhi[mTG.dz], 
-                day=Zhi[dTG.dz])
-    
-    
-    print("公历:", end='')
-    print("{}年{}月{}日".format(d.year, d.month, d.day), end='')
-    
-    Lleap = "闰" if cal_day.isLunarLeap() else ""
-    print("\t农:", end='')
-    print("{}年{}{}月{}日  ".format(cal_day.getLunarYear(), Lleap,cal_day.getLunarMonth(), cal_day.getLunarDay()), end='')
-    print(' ',end='')
-    print(''.join([''.join(item) for item in zip(gans, zhis)]), end='')
-    
-    print("\t杀:", end='')   
-    for item in shi_hous[zhis[2]]:
-        print(item + zhi_time[item], end='')
-    
-    
-    day_ganzhi = gans[2] + zhis[2]
-    
-    if day_ganzhi == year_hous[zhis[0]]:
-        print(" 年猴:{}年{}日".format(zhis[0], day_ganzhi), end=' ')
-    
-    if zhis[2] == yue_hous[cal_day.getLunarMonth()]:
-        print(" 月罗:{}日".format(zhis[2]), end=' ')
-    
-    if day_ganzhi in tuple(ji_hous.values()):       
-        birthday = d  
-        for i in range(30):    
-            day_ = sxtwl.fromSolar(birthday.year, birthday.month, birthday.day)
-            if day_.hasJieQi():
-                ji = jis[(day_.getJieQi() + 3)//6]
-                break        
-            birthday += datetime.timedelta(days=-1)
-           
-        if day_ganzhi == ji_hous[ji]:
-            print(" \t季猴:{}季{}日".format(ji, ji_hous[ji]), end=' ')    
-            
-    if d >= xiazhi and d < dongzhi:
-        items = shi_feixings2[Zhi[dTG.dz]]
-    else:
-        items = shi_feixings1[Zhi[dTG.dz]]
-    print()   
-    print(" "*90, lunar.getDayNineStar(), end='')
-    for item in Zhi:
-        print(" {}{}".format(item, items[item]), end='') 
-    print()
-    zeri = ""
-    if zhis.day == zhi_atts[zhis.year]["冲"]:
-        zeri += "\t岁破，大事不宜"
-    elif zhis.day == zhi_atts[zhis.month]["冲"]:
-        zeri += "\t月破，大事不宜" 
-    #print(gans.day + zhis.day)
-    if gans.day + zhis.day in datouxiu:
-        zeri += "\t大偷休" 
-    elif gans.day + zhis.day in xiaotouxiu:
-            zeri += "\t小偷休"    
-    print(zeri)
-
-
+import calendar_backend
+from ganzhi import Gan, Zhi, zhi_time, jis, zhi_atts, get_jizhu, datouxiu, xiaotouxiu
 
-init(autoreset=True)
 
 jiuxings_dsp = '''
     一白水星 —— + 贪狼：事业、人缘与桃花
@@ -158,7 +83,141 @@ Gans = collections.namedtuple("Gans", "year month day")
 Zhis = collections.namedtuple("Zhis", "year month day")
 JiuFeiXing = collections.namedtuple("JiuFeiXing", "中 西北 西 东北 南 北 西南 东 东南")
 
+# 日九星，与 lunar_python 的 NineStar 相同：数、色、五行、北斗星名
+jiuxings = ('一白水天枢', '二黑土天璇', '三碧木天玑', '四绿木天权', '五黄土玉衡',
+            '六白金开阳', '七赤金摇光', '八白土洞明', '九紫火隐元')
+
+# 每天的记录：公历日期，农历（calendar_backend.LunarDate），年月日的干和支（当天交节按整天算），
+# 杀师时的地支，是否年猴、月罗，季猴的季节（不是为空），日九星，子至亥各时的飞星，岁破、月破、大小偷休
+LuoHou = collections.namedtuple(
+    "LuoHou", "date lunar gans zhis shas nian_hou yue_luo ji_hou jiuxing feixings zeri")
+
+
+def _term(calendar, moment, index):
+    '''moment 之后第一个序号为 index 的节气的交节时刻'''
+    term = calendar.next_jieqi(moment)
+    while term.index != index:
+        term = calendar.next_jieqi(term.moment)
+    return term.moment
+
+
+def _jiazi(moment):
+    '''交节那天前后最近的甲子日（之前 29 天至之后 30 天）的公历序数'''
+    ordinal = moment.toordinal()
+    index = calendar_backend.day_pillar(moment)
+    return ordinal + 60 - index if index > 29 else ordinal - index
+
+
+def _jiuxing(ordinal, shun, ni, shun2):
+    '''日九星的序号：冬至后的甲子起顺行，夏至后的甲子起逆行，算法与 lunar_python 的 getDayNineStar 相同'''
+    if shun <= ordinal < ni:
+        return (ordinal - shun) % 9
+    if ni <= ordinal < shun2:
+        return 8 - (ordinal - ni) % 9
+    if ordinal >= shun2:
+        return (ordinal - shun2) % 9
+    return (8 + shun - ordinal) % 9
+
+
+def days(start, end, calendar=None):
+    '''start 至 end（不含）每天的 LuoHou 记录，calendar 默认为 calendar_backend.get_backend()'''
+    calendar = calendar or calendar_backend.get_backend()
+    one_day = datetime.timedelta(days=1)
+    midnight = datetime.datetime(start.year, start.month, start.day)
+    # 年柱、月柱和季节按日算：当天交节则整天用交节后的
+    pillars = calendar.pillars(midnight.replace(hour=23, minute=59, second=59))
+    year, month, day = pillars.year, pillars.month, pillars.day
+    season = jis[(calendar.prev_jieqi(midnight, whole_day=True).index + 3) // 6]
+    term = calendar.next_jieqi(midnight, whole_day=True)
+    lunar = calendar.solar_to_lunar(midnight.date())
+
+    # 每个公历年的夏至、冬至，以及日九星起顺行、逆行的甲子日
+    solstices = {}
+    bases = {}
+
+    def solstice(year_):
+        if year_ not in solstices:
+            solstices[year_] = (_term(calendar, datetime.datetime(year_, 6, 1), 12),
+                                _term(calendar, datetime.datetime(year_, 12, 1), 0))
+        return solstices[year_]
+
+    while midnight.date() < end:
+        if midnight.date() == term.moment.date():
+            if term.index % 2 == 1:
+                month = (month + 1) % 60
+            if term.index == calendar_backend.LI_CHUN:
+                year = (year + 1) % 60
+            season = jis[(term.index + 3) // 6]
+            term = calendar.next_jieqi(term.moment)
+
+        xiazhi, dongzhi = solstice(midnight.year)
+        # 与 lunar_python 相同按公历年取上一年冬至、当年夏至和冬至，春节前的一月也用当年的
+        if midnight.year not in bases:
+            bases[midnight.year] = (_jiazi(solstice(midnight.year - 1)[1]), _jiazi(xiazhi), _jiazi(dongzhi))
+        # 夏至至冬至用阴遁的时飞星
+        feixings = (shi_feixings2 if xiazhi <= midnight < dongzhi else shi_feixings1)[Zhi[day % 12]]
+
+        gans = Gans(Gan[year % 10], Gan[month % 10], Gan[day % 10])
+        zhis = Zhis(Zhi[year % 12], Zhi[month % 12], Zhi[day % 12])
+        ganzhi = gans.day + zhis.day
+        zeri = []
+        if zhis.day == zhi_atts[zhis.year]["冲"]:
+            zeri.append("岁破")
+        elif zhis.day == zhi_atts[zhis.month]["冲"]:
+            zeri.append("月破")
+        if ganzhi in datouxiu:
+            zeri.append("大偷休")
+        elif ganzhi in xiaotouxiu:
+            zeri.append("小偷休")
+        ordinal = midnight.toordinal()
+        yield LuoHou(midnight.date(), lunar, gans, zhis, shi_hous[zhis.day], ganzhi == year_hous[zhis.year],
+                     zhis.day == yue_hous[lunar.month], season if ganzhi == ji_hous[season] else '',
+                     jiuxings[_jiuxing(ordinal, *bases[midnight.year])],
+                     tuple(feixings[item] for item in Zhi), tuple(zeri))
+
+        midnight += one_day
+        day = (day + 1) % 60
+        # 农历 29 日以后才可能换月
+        if lunar.day < 29:
+            lunar = lunar._replace(day=lunar.day + 1)
+        else:
+            lunar = calendar.solar_to_lunar(midnight.date())
+
+
+def show(item):
+    '''按命令行的格式打印一天的记录'''
+    d = item.date
+    gans, zhis = item.gans, item.zhis
+    print("公历:", end='')
+    print("{}年{}月{}日".format(d.year, d.month, d.day), end='')
 
+    Lleap = "闰" if item.lunar.leap else ""
+    print("\t农:", end='')
+    print("{}年{}{}月{}日  ".format(item.lunar.year, Lleap, item.lunar.month, item.lunar.day), end='')
+    print(' ',end='')
+    print(''.join([''.join(pair) for pair in zip(gans, zhis)]), end='')
+
+    print("\t杀:", end='')
+    for zhi in item.shas:
+        print(zhi + zhi_time[zhi], end='')
+
+    day_ganzhi = gans.day + zhis.day
+    if item.nian_hou:
+        print(" 年猴:{}年{}日".format(zhis.year, day_ganzhi), end=' ')
+    if item.yue_luo:
+        print(" 月罗:{}日".format(zhis.day), end=' ')
+    if item.ji_hou:
+        print(" \t季猴:{}季{}日".format(item.ji_hou, ji_hous[item.ji_hou]), end=' ')
+
+    print()
+    print(" "*90, item.jiuxing, end='')
+    for zhi, value in zip(Zhi, item.feixings):
+        print(" {}{}".format(zhi, value), end='')
+    print()
+    zeri = ""
+    for name in item.zeri:
+        zeri += "\t" + name + ("，大事不宜" if name in ("岁破", "月破") else "")
+    print(zeri)
 
 
 description = '''
@@ -167,96 +226,74 @@ $ python luohou.py -d "2019 6 16"
 
 '''
 
-parser = argparse.ArgumentParser(description=description,
-                                 formatter_class=argparse.RawTextHelpFormatter)
-parser.add_argument('-d', action="store", help=u'year',default="")
-parser.add_argument('-n', action="store", help=u'days',default=32, type=int)
-parser.add_argument('--version', action='version',
-                    version='%(prog)s 0.1 Rongzhong xu 2019 05 05')
-options = parser.parse_args()
 
-Gans = collections.namedtuple("Gans", "year month day")
-Zhis = collections.namedtuple("Zhis", "year month day")
+def main():
+    from colorama import init
+    init(autoreset=True)
+
+    parser = argparse.ArgumentParser(description=description,
+                                     formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-d', action="store", help=u'year',default="")
+    parser.add_argument('-n', action="store", help=u'days',default=32, type=int)
+    parser.add_argument('--version', action='version',
+                        version='%(prog)s 0.1 Rongzhong xu 2019 05 05')
+    options = parser.parse_args()
+
+    if options.d:
+        year, month, day = options.d.split()
+        d = datetime.date(int(year), int(month), int(day))
+    else:
+        d = datetime.date.today()
+
+    items = days(d, d + datetime.timedelta(days=max(options.n, 1)))
+    first = next(items)
+    gans, zhis = first.gans, first.zhis
+    mountains[zhis.year] += " 太岁"
+    mountains[zhi_atts[zhis.year]['冲']] += " 岁破"
+
+    # 计算中央位
+    year = d.year
+    index = year % 10 + year // 10 % 10
+    index = index - 9 if index > 9 else index
+    index = 9 - index
+    jius = JiuFeiXing(*fangweis[index:], *fangweis[0:index])
+
+    print(jiuxings_dsp)
+    print('-'*120)
+    print("{}年九宫飞星".format(year))
+    print('-'*120)
+    print("\033[1;36;40m{1:{0}<25s}{2:{0}<25s}{3:{0}<25s}\033[0m".format(
+        chr(12288),
+        "巽 东南：{}".format(jius.东南),
+        '离   南：{}'.format(jius.南),
+        '坤 西南：{}'.format(jius.西南),))
+    print("\033[1;36;40m{1:{0}<25s}{2:{0}<25s}{3:{0}<25s}\033[0m".format(
+        chr(12288),
+        "震   东：{}".format(jius.东),
+        '  中   央：{}'.format(jius.中),
+        '    兑   西：{}'.format(jius.西),))
+    print("\033[1;36;40m{1:{0}<25s}{2:{0}<25s}{3:{0}<25s}\033[0m".format(
+        chr(12288),
+        "艮 东北：{}".format(jius.东北),
+        '坎   北：{}'.format(jius.北),
+        '乾 西北：{}'.format(jius.西北),))
+    print('-'*120)
+
+    print("月份九宫飞星", end=' ')
+    items_ = month_feixings[zhis.year]
+    for i in range(1,13):
+        print(i, items_[i], end=' ')
+    print()
+    year_yas = get_jizhu(gans.year, zhis.year)
+    print("太岁压祭主", year_yas)
+    day_yas = get_jizhu(gans.day, zhis.day)
+    print("日压祭主", day_yas)
+    print('-'*120)
+
+    show(first)
+    for item in items:
+        show(item)
+
 
-if options.d:
-    year, month, day = options.d.split()
-    d = datetime.datetime(int(year), int(month), int(day))
-else:
-    d = datetime.datetime.today()
-    
-cal_day = sxtwl.fromSolar(d.year, d.month, d.day)
-yTG = cal_day.getYearGZ()
-mTG = cal_day.getMonthGZ()
-dTG  = cal_day.getDayGZ()
-
-
-gans = Gans(year=Gan[yTG.tg], month=Gan[mTG.tg], 
-            day=Gan[dTG.tg])
-zhis = Zhis(year=Zhi[yTG.dz], month=Zhi[mTG.dz], 
-            day=Zhi[dTG.dz])
-mountains[zhis.year] += " 太岁"
-mountains[zhi_atts[zhis.year]['冲']] += " 岁破"
-    
-
-# 计算中央位
-year = d.year
-index = year % 10 + year // 10 % 10
-index = index - 9 if index > 9 else index
-index = 9 - index
-#print(index)
-jius = JiuFeiXing(*fangweis[index:], *fangweis[0:index])
-#print(jius)
-
-print(jiuxings_dsp)
-print('-'*120)
-print("{}年九宫飞星".format(year))
-print('-'*120)
-print("\033[1;36;40m{1:{0}<25s}{2:{0}<25s}{3:{0}<25s}\033[0m".format(
-    chr(12288), 
-    "巽 东南：{}".format(jius.东南), 
-    '离   南：{}'.format(jius.南), 
-    '坤 西南：{}'.format(jius.西南),))
-print("\033[1;36;40m{1:{0}<25s}{2:{0}<25s}{3:{0}<25s}\033[0m".format(
-    chr(12288), 
-    "震   东：{}".format(jius.东), 
-    '  中   央：{}'.format(jius.中), 
-    '    兑   西：{}'.format(jius.西),))
-print("\033[1;36;40m{1:{0}<25s}{2:{0}<25s}{3:{0}<25s}\033[0m".format(
-    chr(12288), 
-    "艮 东北：{}".format(jius.东北), 
-    '坎   北：{}'.format(jius.北), 
-    '乾 西北：{}'.format(jius.西北),))
-print('-'*120)
-
-print("月份九宫飞星", end=' ')
-items = month_feixings[Zhi[yTG.dz]]
-for i in range(1,13):
-    print(i, items[i], end=' ')
-print()
-year_yas = get_jizhu(Gan[yTG.tg], Zhi[yTG.dz])
-print("太岁压祭主", year_yas)
-day_yas = get_jizhu(Gan[dTG.tg], Zhi[dTG.dz])
-print("日压祭主", day_yas)
-print('-'*120)
-
-#计算夏至日、冬至日
-lunar = Lunar.fromYmd(d.year, d.month, d.day)
-jieqis = lunar.getJieQiTable()
-#start = datetime.strptime(start_time, "%Y-%m-%d %H:%M:%S")
-#print("去年冬至", jieqis['冬至'].toFullString())
-#print("雨水", jieqis['雨水'].toFullString())
-#print("谷雨", jieqis['谷雨'].toFullString())
-#print("夏至", jieqis['夏至'].toFullString())
-#print("处暑", jieqis['处暑'].toFullString())
-#print("霜降", jieqis['霜降'].toFullString())
-#print("今年冬至", jieqis['DONG_ZHI'].toFullString())
-xiazhi = datetime.datetime.strptime(' '.join(jieqis['夏至'].toFullString().split(' ')[:2]), "%Y-%m-%d %H:%M:%S")
-dongzhi = datetime.datetime.strptime(' '.join(jieqis['DONG_ZHI'].toFullString().split(' ')[:2]), "%Y-%m-%d %H:%M:%S")
-
-
-
-get_hou(d, xiazhi, dongzhi)      
-
-for i in range(1,options.n):
-    d_ = d + datetime.timedelta(days=i)
-    get_hou(d_,  xiazhi, dongzhi)  
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 排盘性能剖析：按名称统计各阶段的次数和耗时（单调时钟），以及计数器，默认关闭。
+# 关闭时 stage() 返回同一个空的上下文，count() 直接返回，只多一次函数调用。
+# 打开：环境变量 BAZI_PROFILE=1，或调用 profiling.enable()；bazi.py --profile 打印各阶段耗时。
+# 阶段可以嵌套，外层的耗时包含内层。
+#
+#     with profiling.stage('chart.findings'):
+#         ...
+#     profiling.count('chart.transits', 99)
+#     print(profiling.report())          # 文字表格
+#     print(profiling.prometheus())      # Prometheus 文本格式
+
+import contextlib
+import cProfile
+import os
+import threading
+import time
+
+enabled = os.environ.get('BAZI_PROFILE', '') not in ('', '0')
+
+# {阶段: [次数, 总秒数, 最大秒数]}
+_stages = {}
+# {计数器: 数值}
+_counters = {}
+_lock = threading.Lock()
+_NULL = contextlib.nullcontext()
+
+
+def enable(value=True):
+    global enabled
+    enabled = value
+
+
+def record(name, seconds):
+    '''记录一次阶段耗时'''
+    with _lock:
+        item = _stages.get(name)
+        if item is None:
+            _stages[name] = [1, seconds, seconds]
+        else:
+            item[0] += 1
+            item[1] += seconds
+            if seconds > item[2]:
+                item[2] = seconds
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+
+
+def stage(name):
+    '''with stage(名称): 计时；关闭时不计'''
+    return _Timer(name) if enabled else _NULL
+
+
+def count(name, value=1):
+    if enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + value
+
+
+def snapshot():
+    '''{'stages': {阶段: [次数, 总秒数, 最大秒数]}, 'counters': {计数器: 数值}}'''
+    with _lock:
+        return {'stages': {name: list(item) for name, item in _stages.items()}, 'counters': dict(_counters)}
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def drain():
+    '''取出当前统计并清零，用于把子进程中的统计交给主进程合并'''
+    with _lock:
+        result = {'stages': dict(_stages), 'counters': dict(_counters)}
+        _stages.clear()
+        _counters.clear()
+    return result
+
+
+def merge(data):
+    '''合并 snapshot() 或 drain() 的结果'''
+    with _lock:
+        for name, (calls, total, longest) in data.get('stages', {}).items():
+            item = _stages.setdefault(name, [0, 0.0, 0.0])
+            item[0] += calls
+            item[1] += total
+            item[2] = max(item[2], longest)
+        for name, value in data.get('counters', {}).items():
+            _counters[name] = _counters.get(name, 0) + value
+
+
+def report(data=None):
+    '''各阶段耗时的文字表格，按总耗时从高到低'''
+    data = snapshot() if data is None else data
+    lines = ["{:<24} {:>8} {:>12} {:>10} {:>10}".format('阶段', '次数', '总计ms', '平均ms', '最大ms')]
+    for name, (calls, total, longest) in sorted(data['stages'].items(), key=lambda item: -item[1][1]):
+        lines.append("{:<24} {:>8} {:>12.3f} {:>10.3f} {:>10.3f}".format(
+            name, calls, total * 1000, total * 1000 / calls, longest * 1000))
+    for name, value in sorted(data['counters'].items()):
+        lines.append("{:<24} {:>8}".format(name, value))
+    return '\n'.join(lines)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus(data=None, prefix='bazi'):
+    '''Prometheus 文本格式（0.0.4）'''
+    data = snapshot() if data is None else data
+    stages = sorted(data['stages'].items())
+    lines = []
+    for metric, kind, help_, index in (
+            ('stage_calls_total', 'counter', '阶段执行次数', 0),
+            ('stage_seconds_total', 'counter', '阶段累计耗时（秒）', 1),
+            ('stage_seconds_max', 'gauge', '阶段单次最长耗时（秒）', 2)):
+        name = '{}_{}'.format(prefix, metric)
+        lines.append('# HELP {} {}'.format(name, help_))
+        lines.append('# TYPE {} {}'.format(name, kind))
+        for stage_, item in stages:
+            value = item[index] if index == 0 else float(item[index])
+            lines.append('{}{{stage="{}"}} {!r}'.format(name, _label(stage_), value))
+    name = prefix + '_events_total'
+    lines.append('# HELP {} 计数器'.format(name))
+    lines.append('# TYPE {} counter'.format(name))
+    for counter, value in sorted(data['counters'].items()):
+        lines.append('{}{{name="{}"}} {}'.format(name, _label(counter), value))
+    return '\n'.join(lines) + '\n'
+
+
+@contextlib.contextmanager
+def profile(path):
+    '''with profile(文件): 用 cProfile 剖析其中的代码，结束时写入 pstats 文件，与 enabled 无关'''
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        profiler.dump_stats(path)
@@ -0,0 +1,1438 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 断语规则引擎：规则写成数据，按特征触发。每个八字先算出一组特征（如 "me:甲"、"day_pillar:庚辰"、
+# "zhi_shen1:比"），每条规则声明触发特征，按触发特征建立索引，排盘时只检查八字特征命中的候选规则，
+# 不必逐条判断。结果为带规则编号的 Finding。
+#
+# 规则字段：
+#   id       规则编号，"段落.名称"
+#   section  段落，chart._findings 在原来的位置按段落输出断语，顺序与规则声明顺序相同
+#   any_of   任一特征存在即可，空时不限
+#   all_of   特征须全部存在
+#   texts    断语文本，每项一行
+#   test     可选，test(chart) 为真才命中，用于特征表达不了的条件（如分数比较）
+#   ge       命中时加入 all_ges 的格
+#   end      每行文本的结尾，默认换行，同一行接着输出的为 ' '
+#   pillars  逐柱规则检查的柱，此时 test(chart, seq) 按柱判断，每个命中的柱一条 Finding
+#   loop     逐柱规则的组名，同组的几条规则（须连续声明）先按柱、再按声明顺序输出，
+#            与一个 for 循环里的几个判断相同；不同组或不分组的逐柱规则一条输出完再输出下一条
+# 规则按 any_of 的每个特征建索引，没有 any_of 时按 all_of 的第一个特征（应写最少见的那个），
+# 都没有时每次都检查。
+#
+#     python rules.py 1977 8 11 19 -g     列出命中的规则
+
+import argparse
+import collections
+
+from common import get_empty, yinyang
+from datas import (Gan, Zhi, ten_deities, zhi5, zhengs, kus, empties, emptie4s, day_shens,
+                   shang_guans, tianyuans, lu_ku_cai)
+from ganzhi_codes import SHENS, NONE, lu_table, gan_shen_table
+
+Rule = collections.namedtuple("Rule", "id section any_of all_of texts test ge end pillars loop",
+                              defaults=((), (), (), None, None, '\n', (), None))
+Finding = collections.namedtuple("Finding", "rule section texts ge end pillar")
+
+
+def chart_features(chart):
+    '''八字的特征集合，每个特征只算一次'''
+    gans, zhis = chart.gans, chart.zhis
+    gan_shens, zhi_shens, statuses = chart.gan_shens, chart.zhi_shens, chart.statuses
+    me = gans.day
+    items = ['me:' + me, 'yang' if chart.gan_ids[2] % 2 == 0 else 'yin', 'female' if chart.female else 'male',
+             'year:' + zhis.year, 'month:' + zhis.month, 'day:' + zhis.day, 'time:' + zhis.time,
+             'day_pillar:' + me + zhis.day, 'time_pillar:' + gans.time + zhis.time, 'ge:' + chart.ge]
+    counts = collections.Counter(zhis)
+    for zhi, count in counts.items():
+        items.append('zhi:' + zhi)
+        if count > 1:
+            items.append('zhi2:' + zhi)
+    for seq in range(4):
+        if seq != 2:
+            items.append('gan_shen{}:{}'.format(seq, gan_shens[seq]))
+            items.append('gan_shen:' + gan_shens[seq])
+            items.append('shen:' + gan_shens[seq])
+        items.append('zhi_shen{}:{}'.format(seq, zhi_shens[seq]))
+        items.append('zhi_shen:' + zhi_shens[seq])
+        items.append('shen:' + zhi_shens[seq])
+        # 柱中天干或地支本气的十神
+        items.append('pillar{}:{}'.format(seq, gan_shens[seq]))
+        items.append('pillar{}:{}'.format(seq, zhi_shens[seq]))
+        items.append('zhu_shen:' + gan_shens[seq] + zhi_shens[seq])
+        for _, shen in chart.hidden_ids[seq]:
+            items.append('hidden{}:{}'.format(seq, SHENS[shen]))
+            items.append('hidden:' + SHENS[shen])
+            items.append('shen2:' + SHENS[shen])
+        # 日主在该地支的长生状态，如 "status2:建" 为日坐禄
+        items.append('status{}:{}'.format(seq, statuses[seq]))
+    for item in gan_shens:
+        items.append('shen2:' + item)
+    # 各十神的禄在地支中，如 "lu:印" 为印的禄支出现
+    shens = gan_shen_table[chart.gan_ids[2]]
+    for gan in range(10):
+        if lu_table[gan] != NONE and lu_table[gan] in chart.zhi_ids:
+            items.append('lu:' + SHENS[shens[gan]])
+    return frozenset(items)
+
+
+class RuleSet:
+    '''按触发特征索引的规则'''
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        ids = [rule.id for rule in self.rules]
+        if len(set(ids)) != len(ids):
+            raise ValueError("规则编号重复：{}".format(sorted(item for item, count in collections.Counter(ids).items()
+                                                          if count > 1)))
+        self.index = {}
+        self.always = []
+        # 输出顺序：同一 loop 组的规则共用组内第一条的序号，再按柱、按声明顺序
+        self.blocks = []
+        starts = {}
+        for seq, rule in enumerate(self.rules):
+            if rule.pillars and rule.test is None:
+                raise ValueError("逐柱规则须有 test：{}".format(rule.id))
+            if rule.loop is None:
+                self.blocks.append(seq)
+            elif not rule.pillars:
+                raise ValueError("loop 只用于逐柱规则：{}".format(rule.id))
+            elif rule.loop in starts and self.rules[seq - 1].loop != rule.loop:
+                raise ValueError("同一 loop 的规则须连续：{}".format(rule.id))
+            else:
+                self.blocks.append(starts.setdefault(rule.loop, seq))
+            keys = rule.any_of or rule.all_of[:1]
+            if not keys:
+                self.always.append(seq)
+            for key in keys:
+                self.index.setdefault(key, []).append(seq)
+
+    def candidates(self, features):
+        '''特征命中的规则序号，按声明顺序'''
+        seqs = set(self.always)
+        for feature in features:
+            seqs.update(self.index.get(feature, ()))
+        return sorted(seqs)
+
+    def _pillars(self, rule, chart):
+        '''规则 test 成立的柱，整体规则成立时为 (None,)'''
+        if not rule.pillars:
+            return (None,) if rule.test is None or rule.test(chart) else ()
+        return tuple(seq for seq in rule.pillars if rule.test(chart, seq))
+
+    def _finding(self, seq, pillar):
+        rule = self.rules[seq]
+        key = (self.blocks[seq], -1 if pillar is None else pillar, seq)
+        return key, Finding(rule.id, rule.section, rule.texts, rule.ge, rule.end, pillar)
+
+    def match(self, chart, features=None):
+        '''命中的规则，[Finding]，按声明顺序，同一 loop 组内按柱'''
+        features = chart_features(chart) if features is None else features
+        result = []
+        for seq in self.candidates(features):
+            rule = self.rules[seq]
+            if ((not rule.any_of or not features.isdisjoint(rule.any_of))
+                    and all(item in features for item in rule.all_of)):
+                result.extend(self._finding(seq, pillar) for pillar in self._pillars(rule, chart))
+        result.sort(key=lambda item: item[0])
+        return [finding for _, finding in result]
+
+    def match_batch(self, charts):
+        '''一批八字各自命中的规则。先按特征把八字分组，每条规则只在触发特征对应的八字中检查。
+
+        Returns:
+            [[Finding]]，与 charts 顺序一致，每个八字的结果与 match 相同
+        '''
+        charts = list(charts)
+        features = [chart_features(chart) for chart in charts]
+        groups = collections.defaultdict(set)
+        for seq, items in enumerate(features):
+            for item in items:
+                groups[item].add(seq)
+        everyone = set(range(len(charts)))
+        result = [[] for _ in charts]
+        for rule_seq, rule in enumerate(self.rules):
+            if rule.any_of:
+                seqs = set().union(*(groups.get(item, ()) for item in rule.any_of))
+            else:
+                seqs = everyone
+            for item in rule.all_of:
+                seqs = seqs & groups.get(item, set())
+                if not seqs:
+                    break
+            for seq in sorted(seqs):
+                result[seq].extend(self._finding(rule_seq, pillar) for pillar in self._pillars(rule, charts[seq]))
+        for items in result:
+            items.sort(key=lambda item: item[0])
+        return [[finding for _, finding in items] for items in result]
+
+
+# 规则条件用到的判断，原来在 chart.py 中
+
+def jin_jiao(first, second):
+    return True if Zhi.index(second) - Zhi.index(first) == 1 else False
+
+def is_ku(zhi):
+    return True if zhi in "辰戌丑未" else False
+
+def zhi_ku(zhi, items):
+    return True if is_ku(zhi) and min(zhi5[zhi], key=zhi5[zhi].get) in items else False
+
+def gan_ke(gan1, gan2):
+    return True if ten_deities[gan1]['克'] == ten_deities[gan2]['本'] or ten_deities[gan2]['克'] == ten_deities[gan1]['本'] else False
+
+
+# 日主的十神对应的天干、天干的长生状态对应的地支，即 ten_deities[...].inverse，先算好
+_SHEN_GANS = {me: {ten_deities[me][gan]: gan for gan in Gan} for me in Gan}
+_STATUS_ZHIS = {gan: {ten_deities[gan][zhi]: zhi for zhi in Zhi} for gan in Gan}
+
+_PILLARS = (0, 1, 2, 3)
+_ELEMENTS = (('木', 'mu'), ('火', 'huo'), ('土', 'tu'), ('金', 'jin'), ('水', 'shui'))
+
+
+def _gan(chart, shen):
+    '''十神为 shen 的天干，如 _gan(chart, '财') 为日主的正财'''
+    return _SHEN_GANS[chart.me][shen]
+
+
+def _status(chart, status):
+    '''日主长生状态为 status 的地支，如 '绝'、'胎' '''
+    return _STATUS_ZHIS[chart.me][status]
+
+
+def _lu(chart, shen='比'):
+    '''十神 shen 的禄支（建），默认为日主的禄'''
+    return _STATUS_ZHIS[_gan(chart, shen)]['建']
+
+
+def _di(chart, shen='比'):
+    '''十神 shen 的帝旺支，日主为阳干时即阳刃'''
+    return _STATUS_ZHIS[_gan(chart, shen)]['帝']
+
+
+def _ku(chart, shen='比'):
+    '''十神 shen 的库，日主的库即比劫库'''
+    return ten_deities[_gan(chart, shen)]['库'][0]
+
+
+def _zuo(chart, seq):
+    '''第 seq 柱天干坐地支的长生状态'''
+    return ten_deities[chart.gans[seq]][chart.zhis[seq]]
+
+
+def _element_gans(element):
+    '''日主五行为 element 的特征'''
+    return tuple('me:' + gan for gan in Gan if ten_deities[gan]['本'] == element)
+
+
+def _san_qi(*gans):
+    '''年月日或月日时的天干依次为 gans'''
+    return lambda chart: gans in (tuple(chart.gans)[:3], tuple(chart.gans)[1:])
+
+
+def _yang_ren(*items):
+    return ('zhi_shen1:劫', 'yang') + items
+
+
+def _bi_many(chart):
+    return chart.shens2.count('比') > 2
+
+
+def _xiao_day(chart):
+    '''日支为偏印或偏印的禄'''
+    return chart.zhi_shens[2] == '枭' or chart.zhis.day == _lu(chart, '枭')
+
+
+def _xiao_time(chart):
+    '''时支偏印成格'''
+    return chart.zhis.time == _lu(chart, '枭') and chart.zhi_shens[3] == '枭' and '枭' in chart.gan_shens
+
+
+def _cai_lu_day(chart):
+    return chart.zhis.day in (_lu(chart, '财'), _di(chart, '财'))
+
+
+def _cai_day(chart):
+    return chart.zhis.day == _lu(chart, '财') or chart.zhi_shens[2] == '财'
+
+
+def _cai_lu_time(chart):
+    return chart.zhis[3] in (_di(chart, '财'), _lu(chart, '财'))
+
+
+def _guan_day(chart):
+    return chart.zhis.day == _lu(chart, '官') or chart.zhi_shens[2] == '官'
+
+
+def _sha_ge(chart):
+    '''三合局或所有格中有杀'''
+    return '杀' in chart.jus or ('杀' in chart.gan_shens and '杀' in chart.zhi_shens2)
+
+
+# 华盖：日支所在三合局的库
+_HUAGAI = {'申': '辰', '子': '辰', '辰': '辰', '丑': '丑', '巳': '丑', '酉': '丑',
+           '寅': '戌', '午': '戌', '戌': '戌', '亥': '未', '卯': '未', '未': '未'}
+
+
+RULES = RuleSet([
+    # 缺四生、三奇、胎绝、四大空亡等
+    Rule('general.que_sisheng', 'general', test=lambda c: not set('寅申巳亥') & set(c.zhis),
+         texts=("缺四生：一生不敢作为",)),
+    Rule('general.que_sizheng', 'general', test=lambda c: not set('子午卯酉') & set(c.zhis),
+         texts=("缺四柱地支缺四正，一生避是非",)),
+    Rule('general.que_siku', 'general', test=lambda c: not set('辰戌丑未') & set(c.zhis),
+         texts=("四柱地支缺四库，一生没有潜伏性凶灾。",)),
+    Rule('general.sanqi_di', 'general', any_of=('me:戊', 'me:庚'), test=_san_qi('甲', '戊', '庚'),
+         texts=("地上三奇：白天生有申佳，需身强四柱有贵人。",)),
+    Rule('general.sanqi_ren', 'general', any_of=('me:壬', 'me:癸'), test=_san_qi('辛', '壬', '癸'),
+         texts=("人间三奇，需身强四柱有贵人。",)),
+    Rule('general.sanqi_tian', 'general', any_of=('me:丙', 'me:丁'), test=_san_qi('乙', '丙', '丁'),
+         texts=("天上三奇：晚上生有亥佳，需身强四柱有贵人。",)),
+    Rule('general.wangshen2', 'general', test=lambda c: c.zhi_shens2.count('亡神') > 1,
+         texts=("二重亡神，先丧母；",)),
+    Rule('general.time_empty', 'general', test=lambda c: get_empty(c.zhus[2], c.zhis.time),
+         texts=("时坐空亡，子息少。 母法P24-41 母法P79-4：损破祖业，后另再成就。",)),
+    Rule('general.tai_jue', 'general',
+         test=lambda c: c.zhis.count(_status(c, '绝')) + c.zhis.count(_status(c, '胎')) > 2,
+         texts=("胎绝超过3个：夭或穷。母法P24-44 丁未 壬子 丙子 戊子",)),
+    Rule('general.yin_bijie_ku', 'general', all_of=('yin',),
+         test=lambda c: zhi_ku(c.zhis[2], (c.me, _gan(c, '劫'))) and zhi_ku(c.zhis[3], (c.me, _gan(c, '劫'))),
+         texts=("阴日主时日支入比劫库：性格孤独，难发达。母法P28-112 甲申 辛未 辛丑 己丑 母法P55-11 为人孤独，且有灾疾",)),
+    Rule('general.no_cai_lu', 'general',
+         test=lambda c: not set(c.zhis[1:]) & {_lu(c, '才'), _lu(c, '财'), _di(c, '才'), _di(c, '财')},
+         texts=("月日时支没有财或偏财的禄旺。",)),
+    Rule('general.no_guan_lu', 'general', test=lambda c: not set(c.zhis[1:]) & {_lu(c, '官'), _di(c, '官')},
+         texts=("月日时支没有官的禄旺。",)),
+    Rule('general.female_chen', 'general', all_of=('zhi:辰', 'female'), test=lambda c: '戌' not in c.zhis,
+         texts=("女命有辰无戌：孤。",)),
+    Rule('general.female_xu', 'general', all_of=('zhi:戌', 'female'), test=lambda c: '辰' not in c.zhis,
+         texts=("女命有戌无辰：带禄。",)),
+    Rule('general.sida_kong', 'general',
+         test=lambda c: emptie4s.get(c.zhus[2], 0) != 0 and c.scores[emptie4s[c.zhus[2]]] == 0,
+         texts=("四大空亡：33岁以前身体不佳！",)),
+
+    # 女命
+    Rule('female.title', 'female', all_of=('female',), texts=("#" * 20 + " 女命",)),
+    Rule('female.yima2', 'female', all_of=('female',), test=lambda c: c.all_shens_list.count("驿马") > 1,
+         texts=("二逢驿马，母家荒凉。P110 丙申 丙申 甲寅 丁卯",)),
+    Rule('female.year_shang', 'female', all_of=('gan_shen0:伤', 'female'),
+         texts=("年上伤官：带疾生产。P110 戊寅 戊午 丁未 丁未",)),
+
+    # 特殊格局
+    Rule('special.diwang', 'special', all_of=('zhi:辰', 'zhi:巳'),
+         texts=("地网：地支辰巳。天罗：戌亥。天罗地网全凶。",)),
+    Rule('special.tianluo', 'special', all_of=('zhi:戌', 'zhi:亥'),
+         texts=("天罗：戌亥。地网：地支辰巳。天罗地网全凶。",)),
+    Rule('special.kuigang', 'special',
+         any_of=('day_pillar:庚辰', 'day_pillar:庚戌', 'day_pillar:壬辰', 'day_pillar:戊戌'),
+         texts=("魁罡格：基础96，日主庚辰,庚戌,壬辰, 戊戌，重叠方有力。日主强，无刑冲佳。",
+                "魁罡四柱曰多同，贵气朝来在此中，日主独逢冲克重，财官显露祸无穷。魁罡重叠是贵人，天元健旺喜临身，财官一见生灾祸，刑煞俱全定苦辛。")),
+    Rule('special.jinshen', 'special', any_of=('time_pillar:乙丑', 'time_pillar:己巳', 'time_pillar:癸酉'),
+         texts=("金神格：基础97，时柱乙丑、己巳、癸酉。只有甲和己日，甲日为主，甲子、甲辰最突出。月支通金火2局为佳命。不通可以选其他格",)),
+    Rule('special.liuyin', 'special', all_of=('me:辛', 'time:子'),
+         texts=("六阴朝阳格：基础98，辛日时辰为子。",)),
+    Rule('special.liuyi', 'special', all_of=('me:乙', 'time:子'),
+         texts=("六阴朝阳格：基础99，乙日时辰为子。忌讳午冲，丑合，不适合有2个子。月支最好通木局，水也可以，不适合金火。申酉大运有凶，午也不行。夏季为伤官。入其他格以格局论。",)),
+    Rule('special.cong', 'special', test=lambda chart: max(chart.element_scores) > 25,
+         texts=("有五行大于25分，需要考虑专格或者从格。", "从旺格：安居远害、退身避位、淡泊名利,基础94;从势格：日主无根。")),
+
+    # 日时、相邻柱的干支关系
+    Rule('relation.lianzhu', 'relation',
+         test=lambda c: c.zhi_6he[3] and abs(Gan.index(c.gans[3]) - Gan.index(c.gans[2])) == 1,
+         texts=("日时干邻支合：连珠得合：妻贤子佳，与事业无关。母法总则P21-11",)),
+    Rule('relation.cai_jieku', 'relation', any_of=('gan_shen:才', 'gan_shen:财'), pillars=_PILLARS,
+         test=lambda c, i: c.zhis[i] == _ku(c) and c.gan_shens[i] in ('才', '财'),
+         texts=("财坐劫库，大破败。母法P61-4 戊寅 丙辰 壬辰 庚子",)),
+    Rule('relation.tianbi_dichong', 'relation', test=lambda c: c.zhi_6chong[3] and c.gans[3] == c.me,
+         texts=("日时天比地冲：女为家庭辛劳，男艺术宗教。 母法P61-5 己丑 丙寅 甲辰 甲戌",)),
+    Rule('relation.tianke_dixing', 'relation', test=lambda c: c.zhi_xing[3] and gan_ke(c.me, c.gans[3]),
+         texts=("日时天克地刑：破败祖业、自立发展、后无终局。 母法P61-7 己丑 丙寅 甲午 庚午",)),
+    Rule('relation.fucai_yinlu', 'relation',
+         test=lambda c: (_gan(c, '财'), _lu(c, '印')) in c.zhus and _gan(c, '财') not in c.zhi_shens2,
+         texts=("浮财坐印禄:破祖之后，自己也败。 母法P78-29 辛丑 丁酉 壬寅 庚子",)),
+    Rule('relation.yin_tianke_dixing', 'relation', all_of=('yin',), pillars=(0, 1, 2),
+         test=lambda c, i: c.zhi_xing[i] and c.zhi_xing[i+1] and gan_ke(c.gans[i], c.gans[i+1]),
+         texts=("阴日主天克地刑：孤独、双妻。 母法P61-7 己丑 丙寅 甲午 庚午",)),
+
+    # 建禄格
+    Rule('jianlu.ge', 'jianlu', all_of=('zhi_shen1:比',), ge='建',
+         texts=("建禄格：最好天干有财官。如果官杀不成格，有兄弟，且任性。有争财和理财的双重性格。如果创业独自搞比较好，如果合伙有完善的财务制度也可以。",)),
+    Rule('jianlu.nian_bijie', 'jianlu', any_of=('gan_shen0:比', 'gan_shen0:劫'), all_of=('zhi_shen1:比',),
+         texts=("\t建禄年透比劫凶",)),
+    Rule('jianlu.caiguan', 'jianlu', all_of=('zhi_shen1:比', 'gan_shen:财', 'gan_shen:官'),
+         test=lambda chart: chart.gan_shens[0] not in ('比', '劫'),
+         texts=("\t建禄财官双透，吉",)),
+    Rule('jianlu.jiayi', 'jianlu', any_of=('me:甲', 'me:乙'), all_of=('zhi_shen1:比',),
+         texts=("\t甲乙建禄四柱劫财多，无祖财，克妻，一生不聚财，做事虚诈，为人大模大样，不踏实。乙财官多可为吉。甲壬申时佳；乙辛巳时佳；",)),
+    Rule('jianlu.bing', 'jianlu', all_of=('me:丙', 'zhi_shen1:比'), texts=("\t丙：己亥时辰佳；",)),
+    Rule('jianlu.ding', 'jianlu', all_of=('me:丁', 'zhi_shen1:比'),
+         texts=("\t丁：阴男克1妻，阳男克3妻。财官多可为吉。庚子时辰佳；",)),
+    Rule('jianlu.wu', 'jianlu', all_of=('me:戊', 'zhi_shen1:比'),
+         texts=("\t戊：四柱无财克妻，无祖业，后代多事端。如合申子辰，子息晚，有2子。甲寅时辰佳；",)),
+    Rule('jianlu.ji', 'jianlu', all_of=('me:己', 'zhi_shen1:比'),
+         texts=("\t己：即使官财出干成格，妻也晚。偏财、杀印成格为佳。乙丑时辰佳；",)),
+    Rule('jianlu.geng', 'jianlu', all_of=('me:庚', 'zhi_shen1:比'),
+         texts=("\t庚：上半月生难有祖财，下半月较好，财格比官杀要好。丙戌时辰佳；",)),
+    Rule('jianlu.xin', 'jianlu', all_of=('me:辛', 'zhi_shen1:比'), texts=("\t辛：干透劫财，妻迟财少；丁酉时辰佳；",)),
+    Rule('jianlu.ren', 'jianlu', all_of=('me:壬', 'zhi_shen1:比'), texts=("\t 壬：戊申时辰佳；",)),
+    Rule('jianlu.gui', 'jianlu', all_of=('me:癸', 'zhi_shen1:比'), texts=("\t 癸：己亥时辰佳",)),
+
+    # 日主
+    Rule('day_master.jia_chenxu', 'day_master', any_of=('zhi2:辰', 'zhi2:戌'), all_of=('me:甲',),
+         texts=("甲日：辰或戌多、性能急躁不能忍。",)),
+    Rule('day_master.jiazi', 'day_master', all_of=('day_pillar:甲子',), texts=("甲子：调候要火。",)),
+    Rule('day_master.jiayin', 'day_master', all_of=('day_pillar:甲寅',), texts=("甲寅：有主见之人，需要财官旺支。",)),
+    Rule('day_master.jiachen', 'day_master', all_of=('day_pillar:甲辰',), texts=("甲辰：印库、性柔和而有实权。",)),
+    Rule('day_master.jiawu', 'day_master', all_of=('day_pillar:甲午',), texts=("甲午：一生有财、调候要水。",)),
+    Rule('day_master.jiaxu', 'day_master', all_of=('day_pillar:甲戌',), texts=("甲戌：自坐伤官，不易生财，为人仁善。",)),
+    Rule('day_master.dongjin', 'day_master', any_of=('me:庚', 'me:辛'), all_of=('zhi2:子', 'month:子'),
+         texts=("冬金子月，再有一子字，孤克。 母法P28-106 甲戌 丙子 庚子 丁丑",)),
+
+    # 比肩分析
+    Rule('bi.gan', 'bi', all_of=('gan_shen:比',),
+         texts=("比：同性相斥。讨厌自己。老是想之前有没有搞错。没有持久性，最多跟你三五年。 散财，月上比肩，做事没有定性，不看重钱，感情不持久。不怀疑人家，人心很好。善意好心惹麻烦。年上问题不大。",)),
+    Rule('bi.year_month', 'bi', all_of=('gan_shen0:比', 'gan_shen1:比'),
+         texts=("比肩年月天干并现：不是老大，出身平常。女仪容端庄，有自己的思想；不重视钱财,话多不能守秘。30随以前是非小人不断。",)),
+    Rule('bi.month_pillar', 'bi', all_of=('gan_shen1:比', 'hidden1:比'),
+         texts=("月柱干支比肩：争夫感情丰富。30岁以前钱不够花。",)),
+    Rule('bi.year_gan', 'bi', all_of=('gan_shen0:比',), texts=("年干比：上面有哥或姐，出身一般。",)),
+    Rule('bi.female_day', 'bi', all_of=('zhi_shen2:比', 'gan_shen:比'), texts=("基52女坐比透比:夫妻互恨 丙辰 辛卯 辛酉 甲午。",)),
+    Rule('bi.gan2', 'bi', all_of=('gan_shen:比',), test=lambda c: c.gan_shens.count('比') > 1,
+         texts=("----基51:天干2比\n"
+                "        自我排斥，易后悔、举棋不定、匆促决定而有失；男倾向于群力，自己决策容易孤注一掷，小事谨慎，大事决定后不再重复考虑。\n"
+                "        女有自己的思想、容貌佳，注意细节，喜欢小孩重过丈夫。轻视老公。对丈夫多疑心，容易吃醋冲动。\n"
+                "        男不得女欢心.\n"
+                "        难以保守秘密，不适合多言；\n"
+                "        地支有根，一生小是非不断。没官杀制，无耐心。 END",)),
+    Rule('bi.many', 'bi', all_of=('gan_shen:比', 'zhi_shen:比'), test=_bi_many,
+         texts=("----比肩过多基51：\n"
+                "        女的爱子女超过丈夫；轻易否定丈夫。 换一种说法：有理想、自信、贪财、不惧内。男的双妻。\n"
+                "        兄弟之间缺乏帮助。夫妻有时不太和谐。好友知交相处不会很久。\n"
+                "        即使成好格局，也是劳累命，事必躬亲。除非有官杀制服。感情烦心。\n"
+                "        基53：善意多言，引无畏之争；难以保守秘密，不适合多言；易犯无事忙的自我表现；不好意思拒绝他人;累积情绪而突然放弃。\n"
+                "        比肩过多，女：你有帮夫运，多协助他的事业，多提意见，偶尔有争执，问题也不大。女：感情啰嗦\n"
+                "        对人警惕性低，乐天知命;情感过程多有波折\n"
+                "        ",)),
+    Rule('bi.many_no_guansha', 'bi', all_of=('gan_shen:比', 'zhi_shen:比'),
+         test=lambda c: _bi_many(c) and '官' not in c.shens and '杀' not in c.shens,
+         texts=("基51: 比肩多，四柱无正官七杀，性情急躁。",)),
+    Rule('bi.many_jie', 'bi', all_of=('gan_shen:劫', 'gan_shen:比', 'zhi_shen:比'), test=_bi_many,
+         texts=("天干比劫并立，比肩地支专位，女命感情丰富，多遇争夫。基52",)),
+    Rule('bi.many_year', 'bi', all_of=('gan_shen0:比', 'zhi_shen:比'), test=_bi_many,
+         texts=("年干为比，不是长子，父母缘较薄，晚婚。",)),
+    Rule('bi.many_time', 'bi', all_of=('gan_shen3:比', 'zhi_shen:比'), test=_bi_many,
+         texts=("母法总则P21-6：时干为比，如日时地支冲，男的对妻子不利，女的为夫辛劳，九流艺术、宗教则关系不大。",)),
+    Rule('bi.many_month_shi', 'bi', all_of=('gan_shen1:比', 'zhi_shen1:食', 'zhi_shen:比'), test=_bi_many,
+         texts=("月柱比坐食，易得贵人相助。",)),
+    Rule('bi.many_month_shang', 'bi', all_of=('gan_shen1:比', 'zhi_shen1:伤', 'zhi_shen:比'), test=_bi_many,
+         texts=("月柱比坐伤，一生只有小财气，难富贵。",)),
+    Rule('bi.many_month_bi', 'bi', all_of=('gan_shen1:比', 'zhi_shen1:比'), test=_bi_many,
+         texts=("月柱比坐比，单亲家庭，一婚不能到头。地支三合或三会比，天干2比也如此。",)),
+    Rule('bi.many_month_cai', 'bi', all_of=('gan_shen1:比', 'zhi_shen1:财', 'zhi_shen:比'), test=_bi_many,
+         texts=("月柱比坐财，不利妻，也主父母身体不佳。因亲友、人情等招财物的无谓损失。",)),
+    Rule('bi.many_month_sha', 'bi', all_of=('gan_shen1:比', 'zhi_shen1:杀', 'zhi_shen:比'), test=_bi_many,
+         texts=("月柱比坐杀，稳重。",)),
+    Rule('bi.zuo_kong', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhis[i] in empties[c.zhus[2]],
+         texts=("基51:比肩坐空亡，不利父亲与妻。年不利父，月不利父和妻，在时则没有关系。甲戌 丙寅 甲子 己巳\n\t基52女：夫妻缘分偏薄，在年只是不利父，在月30岁以前夫妻缘薄 E",)),
+    Rule('bi.zuo_bi', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_shens[i] == '比',
+         texts=("比坐比-平吉：与官杀对立，无主权。养子：克偏财，泄正印。吉：为朋友尽力；凶：受兄弟朋友拖累。父缘分薄，自我孤僻，男多迟婚",)),
+    Rule('bi.zuo_jie', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_shens[i] == '劫',
+         texts=("女比肩坐劫:夫妻互恨，基52丁丑 壬子 壬戌 壬寅。\n\t还有刑冲且为羊刃，女恐有不测之灾：比如车祸、开刀和意外等。基52丙午 庚子 丙戌 丙申",
+                "比坐劫-大凶：为忌亲友受损，合作事业中途解散，与妻子不合。如年月3见比，父缘薄或已死别。")),
+    Rule('bi.zuo_jue', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_shens[i] == '劫' and _zuo(c, i) == '绝' and i < 2,
+         texts=("比肩坐绝，兄弟不多，或者很难谋面。戊己和壬癸的准确率偏低些。",)),
+    Rule('bi.zuo_cai', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_shens[i] == '财',
+         texts=("比肩坐财：因亲人、人情等原因引起无谓损失。",)),
+    Rule('bi.zuo_sha', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_shens[i] == '杀',
+         texts=("比肩坐杀:稳重。",)),
+    Rule('bi.zuo_xiao', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_shens[i] == '枭',
+         texts=("比肩坐偏印：三五年发达，后面守成。",)),
+    Rule('bi.zuo_ren', 'bi', all_of=('gan_shen:比', 'yang'), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_shens[i] == '劫',
+         texts=("比肩坐阳刃：父亲先亡，基于在哪柱判断时间。基51：丙午 丙申 丙申 丁酉。E在年不利父，在其他有刀伤、车祸、意外灾害。\t基52女命年克父亲，月若30岁以前结婚不利婚姻",)),
+    Rule('bi.zuo_bijie', 'bi', all_of=('gan_shen:劫', 'gan_shen:比'), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_shens[i] in ('劫', '比'),
+         texts=("天干比劫并立，比肩又坐比劫，女多遇争夫，个性强，不易协调。",)),
+    Rule('bi.zuo_xing', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_xing[i],
+         texts=("比肩坐刑(注意不是半刑)，幼年艰苦，白手自立长。 甲申 己巳 甲寅 庚午 基51",)),
+    Rule('bi.zuo_xing_jie', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_xing[i] and c.zhi_shens[i] == '劫',
+         texts=("比肩坐刑劫,兄弟不合、也可能与妻子分居。",)),
+    Rule('bi.zuo_chong', 'bi', all_of=('gan_shen:比',), pillars=_PILLARS, loop='bi.zuo',
+         test=lambda c, i: c.gan_shens[i] == '比' and c.zhi_6chong[i],
+         texts=("比肩冲，手足不和，基于柱定时间 甲申 己巳 甲寅 庚午 基51。女命忌讳比劫和合官杀，多为任性引发困难之事。",)),
+    # 比肩所在的柱
+    Rule('bi.day_zhi', 'bi', all_of=('zhi_shen2:比',),
+         texts=("日支比：1-39对家务事有家长式领导；钱来得不容易且有时有小损财。e 自我，如有刑冲，不喜归家！",)),
+    Rule('bi.time_zhi', 'bi', all_of=('zhi_shen3:比',), texts=("时支比：子女为人公正倔强、行动力强，能得资产。",)),
+    Rule('bi.month', 'bi', all_of=('pillar1:比',),
+         texts=("月柱比：三十岁以前难有成就。冒进、不稳定。女友不持久、大男子主义。",)),
+    Rule('bi.time', 'bi', all_of=('pillar3:比',), texts=("时柱比：与亲人意见不合。",)),
+    Rule('bi.bijie', 'bi', any_of=('gan_shen:比', 'gan_shen:劫', 'zhi_shen:比', 'zhi_shen:劫'),
+         test=lambda chart: chart.shens.count('比') + chart.shens.count('劫') > 1,
+         texts=("比劫大于2，男：感情阻碍、事业起伏不定。",)),
+
+    # 日坐禄、时坐禄、日库
+    Rule('lu.day_shuang', 'lu', all_of=('status2:建',),
+         test=lambda c: (c.zhis.count(_lu(c)) > 1 and _lu(c, '印') in c.zhis
+                         and ('比' in c.gan_shens or '劫' in c.gan_shens)),
+         texts=("双禄带比印（专旺）、孤克之命。比论孤，劫论凶。母法总则P20-3。比禄印劫不可合见四位",)),
+    Rule('lu.day_he_yin', 'lu', all_of=('status2:建', 'gan_shen:比'),
+         test=lambda c: c.zhi_6he[2] and _lu(c, '印') in c.zhis,
+         texts=("透比，坐禄六合，有印专旺：官非、残疾。六合近似劫财，如地支会印，法死。 母法总则P20-4",)),
+    Rule('lu.day_he', 'lu', all_of=('status2:建', 'gan_shen:比'), test=lambda c: c.zhi_6he[2],
+         texts=("透比，坐禄六合，如地支会印，法死。 母法总则P20-4",)),
+    Rule('lu.day_cai_he_xing', 'lu', all_of=('status2:建',),
+         test=lambda c: ((c.zhi_xing[3] and c.gan_he[3] and c.gan_shens[3] == '财')
+                         or (c.zhi_xing[2] and c.gan_he[2] and c.zhi_xing[1] and c.gan_he[1]
+                             and c.gan_shens[1] == '财')),
+         texts=("日禄与正财干合支刑：克妻子，即便是吉命，也无天伦之乐。 母法总则P22-21",)),
+    Rule('lu.san', 'lu', test=lambda c: c.zhis.count(_lu(c)) > 2, texts=("禄有三，孤。 母法总则P23-36",)),
+    Rule('lu.time_ku_cai', 'lu', any_of=('gan_shen:财', 'gan_shen:才'), test=lambda c: c.zhis[3] == _ku(c),
+         texts=("时支日库，透财：清高、艺术九流。 母法总则P59-5 己未 辛未 丁巳 庚戌 P61-8 丁未 壬寅 癸卯 丙辰",)),
+    Rule('lu.time_ku_piancai', 'lu', test=lambda c: c.zhis[3] == _ku(c) and _lu(c, '才') == c.zhis[2],
+         texts=("时支日库，坐偏财：吉祥近贵，但亲属淡薄。 母法总则P59-6 辛未 辛卯 丁酉 庚戌",)),
+    Rule('lu.time_shang', 'lu', all_of=('status3:建', 'gan_shen:伤', 'hidden:伤'),
+         texts=("时禄，伤官格，晚年吉。 母法总则P56-26 己未 丙寅 乙丑 己卯",)),
+    Rule('lu.time_sha', 'lu', all_of=('gan_shen3:杀', 'status3:建'),
+         texts=("杀坐时禄：为人反复不定。 母法总则P56-28 己未 丙寅 乙丑 己卯",)),
+    Rule('lu.day_ku_sha', 'lu', all_of=('gan_shen3:杀', 'hidden3:杀'), test=lambda c: c.zhis[2] == _ku(c),
+         texts=("自坐劫库,时杀格，贵！母法总则P30-143 辛未 辛卯 壬辰 戊申 母法总则P55-14 P60-22",)),
+    Rule('lu.day_ku_guan', 'lu', all_of=('gan_shen3:官', 'hidden3:官'), test=lambda c: c.zhis[2] == _ku(c),
+         texts=("自坐劫库,正官格，孤贵！母法总则P56-24 辛未 辛卯 壬辰 戊申 母法总则P55-14",)),
+    Rule('lu.day_ku_caiku', 'lu',
+         test=lambda c: c.zhis[2] == _ku(c) and zhi_ku(c.zhis[3], (_gan(c, '财'), _gan(c, '才'))),
+         texts=("自坐劫库,时财库，另有刃禄孤刑艺术，无者辛劳！母法总则P30-149 母法总则P56-17 56-18",)),
+    Rule('lu.day_ku_cai', 'lu', all_of=('gan_shen3:财', 'hidden3:财'), test=lambda c: c.zhis[2] == _ku(c),
+         texts=("自坐劫库，时正财格，双妻，丧妻。 母法总则P55-13 己酉 戊寅 壬辰 丁未 P61-6 乙酉 戊寅 壬辰 丁未",)),
+    Rule('lu.day_ku_yinlu', 'lu', test=lambda c: c.zhis[2] == _ku(c) and (_gan(c, '印'), _lu(c)) in c.zhus,
+         texts=("自坐劫库,即便吉，也会猝亡 母法总则P61-9 丁丑 甲辰 壬辰 辛亥",)),
+
+    # 劫财分析
+    Rule('jie.gan', 'jie', all_of=('gan_shen:劫',),
+         texts=("劫财扶助，无微不至。劫财多者谦虚之中带有傲气。凡事先理情，而后情理。先细节后全局。性刚强、精明干练、女命不适合干透支藏。",
+                "务实，不喜欢抽象性的空谈。不容易认错，比较倔。有理想，但是不够灵活。不怕闲言闲语干扰。不顾及别人面子。",
+                "合作事业有始无终。太重细节。做小领导还是可以的。有志向，自信。杀或食透干可解所有负面。女命忌讳比劫和合官杀，多为任性引发困难之事。")),
+    Rule('jie.year_month', 'jie', all_of=('gan_shen0:劫', 'gan_shen1:劫'),
+         texts=("劫年月天干并现：喜怒形于色，30岁以前大失败一次。过度自信，精明反被精明误。",)),
+    Rule('jie.month_pillar', 'jie', all_of=('gan_shen1:劫', 'hidden1:劫'),
+         texts=("月柱干支劫：与父亲无缘，30岁以前任性，早婚防分手，自我精神压力极其重。",)),
+    Rule('jie.month_cai_lu', 'jie', all_of=('gan_shen1:劫',),
+         test=lambda c: c.zhis[1] == _lu(c, '财') and c.zhis.count(_lu(c, '印')) > 1,
+         texts=("月干劫：月支财禄，如地支2旺印，旺财不敌，官非、刑名意外。",)),
+    Rule('jie.many', 'jie', all_of=('gan_shen:劫',), test=lambda c: c.shens2.count('劫') > 2,
+         texts=('----劫财过多, 婚姻不好',)),
+    Rule('jie.day_zhi_gan', 'jie', all_of=('zhi_shen2:劫', 'gan_shen:劫'),
+         texts=("日坐劫财，透天干。在年父早亡，在月夫妻关系不好。比如财产互相防范；鄙视对方；自己决定，哪怕对方不同意；老夫少妻；身世有差距；斤斤计较；敢爱敢恨的后遗症\n\t以上多针对女。男的一般有双妻。天干有杀或食可解。基54丁未 己酉 丙午 己丑",)),
+    # 劫财所在的柱
+    Rule('jie.zhuanwei', 'jie', any_of=('day_pillar:壬子', 'day_pillar:丙午', 'day_pillar:戊午'),
+         texts=("日主专位劫财，壬子和丙午，晚婚。不透天干，一般是眼光高、独立性强。对配偶不利，互相轻视；若刑冲，做事立场不明遭嫉妒，但不会有大灾。女性婚后通常还有自己的事业,能办事。",)),
+    Rule('jie.shang', 'jie', any_of=('zhu_shen:劫伤', 'zhu_shen:伤劫'),
+         texts=("同一柱中，劫财、阳刃伤官都有，外表华美，富屋穷人，婚姻不稳定，富而不久；年柱不利家长，月柱不利婚姻，时柱不利子女。伤官的狂妄。基55丙申 丁酉 甲子 丁卯",)),
+    Rule('jie.year_gan', 'jie', all_of=('gan_shen0:劫',),
+         texts=("年干劫财：家运不济。克父，如果坐劫财，通常少年失父；反之要看地支劫财根在哪一柱子。",)),
+    Rule('jie.month', 'jie', all_of=('pillar1:劫',), texts=("月柱劫：容易孤注一掷，30岁以前难稳定。男早婚不利。",)),
+    Rule('jie.time', 'jie', all_of=('pillar3:劫',), texts=("时柱劫：只要不是去经济大权还好。",)),
+    Rule('jie.day_zhi', 'jie', all_of=('zhi_shen2:劫',),
+         texts=("日支劫：男的克妻，一说是家庭有纠纷，对外尚无重大损失。如再透月或时天干，有严重内忧外患。",)),
+    Rule('jie.yin_bijieyin', 'jie', all_of=('zhi_shen:比', 'shen2:劫', 'shen2:印', 'yin'),
+         texts=("阴干比劫印齐全，单身，可入道！",)),
+    Rule('jie.year_ren', 'jie', all_of=('zhi_shen0:劫', 'yang'), texts=("年阳刃：得不到长辈福；不知足、施恩反怨。",)),
+    Rule('jie.time_ren', 'jie', all_of=('zhi_shen3:劫', 'yang'),
+         texts=("时阳刃：与妻子不和，晚无结果，四柱再有比刃，有疾病与外灾。",)),
+
+    # 阳刃格
+    Rule('yangren.ge', 'yangren', all_of=_yang_ren(), ge='刃',
+         texts=("阳刃格：喜七杀或三四个官。基础90 甲戊庚逢冲多祸，壬丙逢冲还好。",)),
+    Rule('yangren.geng_ren_wu', 'yangren', any_of=('me:庚', 'me:壬', 'me:戊'), all_of=_yang_ren(),
+         texts=("阳刃'庚', '壬','午'忌讳正财运。庚逢辛酉凶，丁酉吉，庚辰和丁酉六合不凶。壬逢壬子凶，戊子吉；壬午和戊子换禄不凶。",)),
+    Rule('yangren.jia_bing', 'yangren', any_of=('me:甲', 'me:丙'), all_of=_yang_ren(),
+         texts=("阳刃'甲', '丙',忌讳杀运，正财偏财财库运还好。甲：乙卯凶，辛卯吉；甲申与丁卯暗合吉。丙：丙午凶，壬午吉。丙子和壬午换禄不凶。",)),
+    Rule('yangren.yin_lu', 'yangren', all_of=_yang_ren('gan_shen1:劫', 'lu:印'),
+         texts=("阳刃格月干为劫：如果印禄位有2个，过旺，凶灾。不透劫财，有一印禄,食伤泄，仍然可以吉。 母法总则P20-1",)),
+    Rule('yangren.time_xiao', 'yangren', all_of=_yang_ren('gan_shen3:枭', 'hidden3:枭'),
+         texts=("阳刃格:时柱成偏印格，贫、夭、带疾。 母法总则P28-107 癸未 辛酉 庚寅 戊寅",)),
+    Rule('yangren.shuang_day_yin', 'yangren', all_of=('yang',),
+         test=lambda c: c.zhi_shens.count('劫') > 1 and c.zhis.day == _lu(c, '印'),
+         texts=("双阳刃，自坐印专位：刑妻、妨子。凶终、官非、意外灾害。母法总则P21-13",)),
+    Rule('yangren.day_yin_bijie', 'yangren', all_of=('yang',),
+         test=lambda c: (c.zhi_shens[1:].count('劫') > 0 and c.zhis.day == _lu(c, '印')
+                         and ('劫' in c.gan_shens or '比' in c.gan_shens)),
+         texts=("阳刃，自坐印专位，透比或劫：刑妻。母法总则P36-8 己酉 丁卯 甲子 乙亥",)),
+    Rule('yangren.lu_ren', 'yangren',
+         test=lambda c: c.zhis[2] in (_lu(c), _di(c)) and c.zhis[3] in (_lu(c), _di(c)),
+         texts=("日时禄刃全，如没有官杀制，刑伤父母，妨碍妻子。母法总则P30-151 丁酉 癸卯 壬子 辛亥 母法总则P31-153 ",)),
+    Rule('yangren.jie_cai_lu', 'yangren', all_of=('gan_shen:劫',), pillars=_PILLARS, loop='yangren.jie',
+         test=lambda c, i: c.gan_shens[i] == '劫' and c.zhis[i] in (_lu(c, '财'), _lu(c, '才')),
+         texts=("劫财坐财禄，如逢冲，大凶。先冲后合和稍缓解！母法总则P21-7 书上实例不准！",)),
+    Rule('yangren.jie_cai_he', 'yangren', all_of=('gan_shen:劫',), pillars=_PILLARS, loop='yangren.jie',
+         test=lambda c, i: (c.gan_shens[i] == '劫' and c.zhis[i] in (_lu(c, '财'), _lu(c, '才'))
+                            and c.zhi_shens[i] == '财' and c.zhi_6he[i]),
+         texts=("劫财坐六合财支：久疾暗病！母法总则P28-113 乙未 丙戌 辛亥 庚寅！",)),
+    Rule('yangren.month_jie_cai_lu', 'yangren', all_of=('gan_shen1:劫',),
+         test=lambda c: c.zhis[1] in (_lu(c, '财'), _lu(c, '才')) and c.zhis.count(_lu(c, '印')) > 1,
+         texts=("月干劫坐财禄，有2印禄，劫透，财旺也败：官非、刑名、意外灾害！  母法总则P20-2",)),
+    Rule('yangren.day_cai_lu', 'yangren', all_of=('hidden2:劫', 'yang'),
+         test=lambda c: c.zhis[2] in zhengs and c.zhis[3] in (_lu(c, '财'), _lu(c, '才')),
+         texts=("坐阳刃,时支财禄，吉祥但是妻子性格不受管制！母法总则P30-137 丁未 庚戌 壬子 乙巳",)),
+    Rule('yangren.day_cai_ku', 'yangren', all_of=('hidden2:劫', 'yang'),
+         test=lambda c: c.zhis[2] in zhengs and zhi_ku(c.zhis[3], (_gan(c, '财'), _gan(c, '才'))),
+         texts=("坐阳刃,时支财库，名利时进时退！母法总则P30-148 丙寅 壬寅 壬子 庚戌",)),
+    Rule('yangren.day_sha', 'yangren', all_of=('hidden2:劫', 'yang', 'gan_shen3:杀', 'hidden3:杀'),
+         test=lambda c: c.zhis[2] in zhengs,
+         texts=("坐阳刃,时杀格，贵人提携而富贵！母法总则P30-143 甲戌 丙寅 壬子 戊申",)),
+
+    # 偏印分析
+    Rule('xiao.gan', 'xiao', all_of=('gan_shen:枭',),
+         texts=("----偏印在天干如成格：偏印在前，偏财(财次之)在后，有天月德就是佳命(偏印格在日时，不在月透天干也麻烦)。忌讳倒食，但是坐绝没有这能力。",
+                "经典认为：偏印不能扶身，要身旺；偏印见官杀未必是福；喜伤官，喜财；忌日主无根；   女顾兄弟姐妹；男六亲似冰",
+                "偏印格干支有冲、合、刑，地支是偏印的绝位也不佳。")),
+    Rule('xiao.month_pillar', 'xiao', all_of=('gan_shen1:枭', 'hidden1:枭'),
+         texts=("枭月重叠：福薄慧多，青年孤独，有文艺宗教倾向。",)),
+    Rule('xiao.gen2', 'xiao', all_of=('gan_shen:枭',), test=lambda c: c.zhi_shens2.count('枭') > 1,
+         texts=("偏印根透2柱，孤独有色情之患难。做事有始无终，女声誉不佳！pd40",)),
+    Rule('xiao.ge', 'xiao', all_of=('gan_shen:枭', 'hidden:枭'), ge='枭',
+         texts=("偏印成格基础89生财、配印；最喜偏财同时成格，偏印在前，偏财在后。最忌讳日时坐实比劫刃。",)),
+    Rule('xiao.many', 'xiao', all_of=('gan_shen:枭',), test=lambda c: c.shens2.count('枭') > 2,
+         texts=("偏印过多，性格孤僻，表达太含蓄，要别人猜，说话有时带刺。偏悲观。有偏财和天月德贵人可以改善。有艺术天赋。做事大多有始无终。如四柱全阴，女性声誉不佳。",
+                "对兄弟姐妹不错。男的因才干受子女尊敬。女的偏印多，子女不多。第1克伤食，第2艺术性。")),
+    Rule('xiao.many_shang', 'xiao', all_of=('gan_shen:枭', 'gan_shen:伤'), test=lambda c: c.shens2.count('枭') > 2,
+         texts=("女命偏印多，又与伤官同透，夫离子散。有偏财和天月德贵人可以改善。",)),
+    Rule('xiao.gan2', 'xiao', all_of=('gan_shen:枭',), test=lambda c: c.gan_shens.count('枭') > 1,
+         texts=("天干两个偏印：迟婚，独身等，婚姻不好。三偏印，家族人口少，亲属不多建。基56甲午 甲戌 丙午 丙申",)),
+    Rule('xiao.year_pillar', 'xiao', all_of=('gan_shen0:枭', 'zhi_shen0:枭'),
+         texts=("偏印在年，干支俱透，不利于长辈。偏母当令，正母无权，可能是领养，庶出、同父异母等。 基56乙卯 甲申 丁丑 丁未",)),
+    Rule('xiao.month_zhuan', 'xiao', all_of=('gan_shen:枭',), test=lambda c: c.zhi_shen3[1] == ['枭'],
+         texts=("月专位偏印：有手艺。坐衰其貌不扬。",)),
+    Rule('xiao.zuo_jue', 'xiao', any_of=('gan_shen:枭', 'zhi_shen:枭'), pillars=_PILLARS, loop='xiao.zuo',
+         test=lambda c, i: (c.zhi_shens[i] == '枭' or c.gan_shens[i] == '枭') and _zuo(c, i) == '绝',
+         texts=("偏印坐绝，或者天干坐偏印为绝，难以得志。费力不讨好。基56辛酉 辛卯 丁巳 甲辰  丁卯 丁未 己丑 丁卯",)),
+    Rule('xiao.zuo_xiao', 'xiao', all_of=('gan_shen:枭',), pillars=_PILLARS, loop='xiao.zuo',
+         test=lambda c, i: c.gan_shens[i] == '枭' and '枭' in c.zhi_shen3[i],
+         texts=("干支都与偏印，克夫福薄！",)),
+    Rule('xiao.zuo_bi', 'xiao', all_of=('gan_shen:枭',), pillars=_PILLARS, loop='xiao.zuo',
+         test=lambda c, i: c.gan_shens[i] == '枭' and '比' in c.zhi_shen3[i],
+         texts=("偏印坐比：劳心劳力，常遇阴折 pd41",)),
+    Rule('xiao.zuo_shang', 'xiao', all_of=('gan_shen:枭',), pillars=_PILLARS, loop='xiao.zuo',
+         test=lambda c, i: c.gan_shens[i] == '枭' and c.zhi_shens[i] == '伤',
+         texts=("偏印坐伤官：克夫丧子 pd41",)),
+    Rule('xiao.year_time', 'xiao', all_of=('gan_shen0:枭', 'zhi_shen3:枭'),
+         texts=("偏印透年干-时支，一直受家里影响。",)),
+    Rule('xiao.year', 'xiao', all_of=('pillar0:枭',),
+         texts=("偏印在年：少有富贵家庭；有宗教素养，不喜享乐，第六感强。",)),
+    Rule('xiao.month', 'xiao', all_of=('pillar1:枭',), texts=("偏印在月：有慧少福，能舍己为人。",)),
+    Rule('xiao.month_zhi', 'xiao', all_of=('zhi_shen1:枭',), test=lambda c: c.zhis[1] in "子午卯酉",
+         texts=("偏印专位在月支：比较适合音乐，艺术，宗教等。子午卯酉。22-30之间职业定型。基56：壬午 癸卯 丁丑 丁未",)),
+    Rule('xiao.month_zhi_gan', 'xiao', all_of=('zhi_shen1:枭', 'gan_shen1:枭'), test=lambda c: c.zhis[1] in "子午卯酉",
+         texts=("干支偏印月柱，专位入格，有慧福浅，不争名利。基57:戊子 辛酉 癸未 丁巳",)),
+    Rule('xiao.time', 'xiao', all_of=('pillar3:枭',),
+         texts=("偏印在时：女与后代分居；男50以前奠定基础，晚年享清福。",)),
+    Rule('xiao.day', 'xiao', test=_xiao_day, texts=("偏印在日支：家庭生活沉闷",)),
+    Rule('xiao.day_chong', 'xiao', test=lambda c: _xiao_day(c) and (c.zhi_6chong[2] or c.zhi_xing[2]),
+         texts=("偏印在日支(专位？),有冲刑：孤独。基57：甲午 癸酉 丁卯 丁未 母法总则P55-5： 辛丑 辛卯 癸酉 戊午 P77-13",)),
+    Rule('xiao.day_zhuan', 'xiao', any_of=('day_pillar:丁卯', 'day_pillar:癸酉'), test=_xiao_day,
+         texts=("日专坐偏印：丁卯和癸酉。婚姻不顺。又刑冲，因性格而起争端而意外伤害。 基56",)),
+    Rule('xiao.day_time_jue', 'xiao', all_of=('status3:绝',), test=_xiao_day,
+         texts=("日坐偏印，日支绝：无亲人依靠，贫乏。 母法总则P55-5：丙辰 丙申 丁卯 壬子。pd41 专位偏印：男女姻缘都不佳。",)),
+    Rule('xiao.day_time_ren', 'xiao', all_of=('gan_shen:枭', 'yang'),
+         test=lambda c: _xiao_day(c) and c.zhis.time == _di(c),
+         texts=("日坐偏印成格，时支阳刃：不利妻子，自身有疾病。 母法总则P55-6：甲子 甲戌 丙寅 甲午",)),
+    Rule('xiao.day_time_jie', 'xiao', all_of=('gan_shen3:劫', 'zhi_shen3:劫'), test=_xiao_day,
+         texts=("日坐偏印，时干支劫：因自己性格而引灾。 母法总则P57-34：甲子 甲戌 丙寅 甲午",)),
+    Rule('xiao.day_ren2', 'xiao', all_of=('yang',), test=lambda c: _xiao_day(c) and c.zhis.count(_di(c)) > 1,
+         texts=("日坐偏印，地支双阳刃：性格有极端倾向。 母法总则P57-35：甲申 庚午 丙寅 甲午",)),
+    Rule('xiao.time_cai', 'xiao', all_of=('zhi_shen3:枭', 'gan_shen:枭'),
+         test=lambda c: _xiao_time(c) and ('财' in c.shens2 or '才' in c.shens2),
+         texts=("时支偏印成格有财：因机智引凶。 母法总则P60-18：甲申 乙亥 丁亥 癸卯",)),
+    Rule('xiao.time_no_cai', 'xiao', all_of=('zhi_shen3:枭', 'gan_shen:枭'),
+         test=lambda c: _xiao_time(c) and not ('财' in c.shens2 or '才' in c.shens2),
+         texts=("时支偏印成格无财：顽固引凶。 母法总则P60-17：甲子 乙亥 丁亥 癸卯",)),
+
+    # 印分析
+    Rule('yin.ge', 'yin', all_of=('gan_shen:印', 'hidden:印'), ge='印',
+         texts=("基础82，成格喜官杀、身弱、忌财克印。合印留财，见利忘义.透财官杀通关或印生比劫；合冲印若无他格或调候破格。日主强凶，禄刃一支可以食伤泄。",)),
+    Rule('yin.month_pillar', 'yin', all_of=('gan_shen1:印', 'hidden1:印'),
+         texts=("印月重叠：女迟婚，月阳刃者离寡，能独立谋生，有修养的才女。",)),
+    Rule('yin.year_gan', 'yin', all_of=('gan_shen0:印',), texts=("年干印为喜：出身于富贵之家。",)),
+    Rule('yin.many', 'yin', all_of=('gan_shen:印',), test=lambda c: c.shens2.count('印') > 2,
+         texts=("正印多的：聪明有谋略，比较含蓄，不害人，识时务。正印不怕日主死绝，反而怕太强。日主强，正印多，孤寂，不善理财。 pd41男的克妻，子嗣少。女的克母。",)),
+    Rule('yin.zuo_jue', 'yin', all_of=('gan_shen:印',), pillars=_PILLARS, loop='yin.zuo',
+         test=lambda c, i: c.gan_shens[i] == '印' and _zuo(c, i) in ('绝', '死') and i < 3,
+         texts=("正印坐死绝，或天干正印地支有冲刑，不利母亲。时柱不算。",)),
+    Rule('yin.zuo_cai', 'yin', all_of=('gan_shen:印',), pillars=_PILLARS, loop='yin.zuo',
+         test=lambda c, i: c.gan_shens[i] == '印' and c.zhi_shens[i] == '财',
+         texts=("男正印坐正财，夫妻不好。月柱正印坐正财专位，必离婚。在时柱，50多岁才有正常婚姻。(男) 基59 乙酉 己卯 庚子 丁亥  庚申 庚辰 庚午 己卯",)),
+    Rule('yin.zuo_yin', 'yin', all_of=('gan_shen:印',), pillars=_PILLARS, loop='yin.zuo',
+         test=lambda c, i: c.gan_shens[i] == '印' and c.zhi_shens[i] == '印',
+         texts=("正印坐正印，专位，过于自信。基59：戊辰 乙卯 丙申 丙申。务实，拿得起放得下。女的话大多晚婚。母长寿；女子息迟，头胎恐流产。女四柱没有官杀，没有良缘。男的搞艺术比较好，经商则孤僻，不聚财。",)),
+    Rule('yin.zuo_xiao', 'yin', all_of=('gan_shen:印',), pillars=_PILLARS, loop='yin.zuo',
+         test=lambda c, i: c.gan_shens[i] == '印' and c.zhi_shens[i] == '枭' and len(zhi5[c.zhis[i]]) == 1,
+         texts=("正印坐偏印专位：基59壬寅 壬子 乙酉 甲申。有多种职业;家庭不吉：亲人有疾或者特别嗜好。子息迟;财务双关。明一套，暗一套。女的双重性格。",)),
+    Rule('yin.zuo_shang', 'yin', all_of=('gan_shen:印',), pillars=_PILLARS, loop='yin.zuo',
+         test=lambda c, i: c.gan_shens[i] == '印' and c.zhi_shens[i] == '伤',
+         texts=("正印坐伤官：适合清高的职业。不适合追逐名利，女的婚姻不好。基59辛未 丁酉 戊子 丙辰",)),
+    Rule('yin.zuo_ren', 'yin', all_of=('gan_shen:印',), pillars=_PILLARS, loop='yin.zuo',
+         test=lambda c, i: c.gan_shens[i] == '印' and c.zhi_shens[i] == '劫' and c.me in ('甲', '庚', '壬'),
+         texts=("正印坐阳刃，身心多伤，心疲力竭，偶有因公殉职。主要指月柱。工作看得比较重要。",)),
+    Rule('yin.sha_ren', 'yin', all_of=('gan_shen:印', 'gan_shen:杀', 'zhi_shen:劫'),
+         test=lambda c: c.me in ('甲', '庚', '壬'),
+         texts=("正印、七杀、阳刃全：基60癸巳 庚申 甲寅 丁卯：女命宗教人，否则独身，清高，身体恐有隐疾，性格狭隘缺耐心。男小疾多，纸上谈兵，婚姻不佳，恐非婚生子女，心思细腻对人要求也高。",)),
+    Rule('yin.guansha', 'yin', any_of=('gan_shen:官', 'gan_shen:杀'), all_of=('gan_shen:印',),
+         texts=("身弱官杀和印都透天干，格局佳。",)),
+    Rule('yin.alone', 'yin', all_of=('gan_shen:印',),
+         test=lambda c: not ('官' in c.gan_shens or '杀' in c.gan_shens),
+         texts=("单独正印主秀气、艺术、文才。性格保守",)),
+    Rule('yin.bu_pa_cai', 'yin', any_of=('gan_shen:官', 'gan_shen:杀', 'gan_shen:比'), all_of=('gan_shen:印',),
+         texts=("正印多者，有比肩在天干，不怕财。有官杀在天干也不怕。财不强也没关系。",)),
+    Rule('yin.pa_cai', 'yin', all_of=('gan_shen:印',),
+         test=lambda c: not ('官' in c.gan_shens or '杀' in c.gan_shens or '比' in c.gan_shens),
+         texts=("正印怕财。",)),
+    Rule('yin.cai', 'yin', all_of=('gan_shen:印', 'gan_shen:财'),
+         texts=("印和财都透天干，都有根，最好先财后印，一生吉祥。先印后财，能力不错，但多为他人奔波。(男)",)),
+    Rule('yin.month_zhi', 'yin', all_of=('zhi_shen1:印',), texts=("月支印：女命觉得丈夫不如自己，分居是常态，自己有能力。",)),
+    Rule('yin.month_both', 'yin', all_of=('zhi_shen1:印', 'gan_shen1:印'),
+         texts=("月干支印：男权重于名，女命很自信，与夫平权。pd41:聪明有权谋，自我",)),
+    Rule('yin.month_both_bi', 'yin', all_of=('zhi_shen1:印', 'gan_shen1:印', 'gan_shen:比'),
+         texts=("月干支印格，透比，有冲亡。",)),
+    Rule('yin.day_time_piancai', 'yin', all_of=('zhi_shen2:印', 'gan_shen3:才', 'hidden3:才'),
+         texts=("坐印，时偏财格：他乡发迹，改弦易宗，妻贤子孝。 母法总则：P55-1 丁丑 丁未 甲子 戊辰",)),
+    Rule('yin.day_time_cai', 'yin', all_of=('zhi_shen2:印', 'gan_shen3:财'),
+         test=lambda c: '财' in c.zhi_shen3[3] or c.zhis[3] in (_di(c, '财'), _lu(c, '财')),
+         texts=("坐印，时财正格：晚年发达，妻贤子不孝。 母法总则：P55-2 乙酉 丙申 甲子 己巳",)),
+    Rule('yin.time_zhuan', 'yin', all_of=('zhi_shen3:印',), test=lambda c: c.zhis[3] in zhengs,
+         texts=("时支专位正印。男忙碌到老。女的子女各居一方。亲情淡薄。",)),
+    Rule('yin.time_pillar', 'yin', all_of=('gan_shen3:印', 'hidden3:印'),
+         texts=("时柱正印格，不论男女，老年辛苦。女的到死都要控制家产。子女无缘。",)),
+    Rule('yin.yin_xiao_gan', 'yin', test=lambda c: c.gan_shens.count('印') + c.gan_shens.count('枭') > 1,
+         texts=("印枭在年干月干，性格迂腐，故作清高，女子息迟，婚姻有阻碍。印枭在时干，不利母子，性格不和谐。",)),
+    Rule('yin.month_lu', 'yin', test=lambda c: c.zhis[1] in (_lu(c, '印'), _lu(c, '枭')),
+         texts=("印或枭在月支，有压制丈夫的心态。",)),
+    Rule('yin.time_lu', 'yin', test=lambda c: c.zhis[3] in (_lu(c, '印'), _lu(c, '枭')),
+         texts=("印或枭在时支，夫灾子寡。",)),
+    Rule('yin.day_ku_many', 'yin',
+         test=lambda c: zhi_ku(c.zhis[2], (_gan(c, '印'), _gan(c, '枭'))) and c.shens2.count('印') > 2,
+         texts=("母法总则P21-5: 日坐印库，又成印格，意外伤残，凶终。过旺。",)),
+    Rule('yin.day_ku_ren', 'yin', all_of=('zhi_shen3:劫',),
+         test=lambda c: zhi_ku(c.zhis[2], (_gan(c, '印'), _gan(c, '枭'))),
+         texts=("自坐印库，时阳刃。带比禄印者贫，不带吉。 母法总则P21-14",)),
+    Rule('yin.month_wang', 'yin', all_of=('gan_shen1:印', 'zhi_shen1:印', 'gan_shen:比'),
+         test=lambda c: c.zhis.count("印") > 1,
+         texts=("月干支印，印旺，透比，旺而不久，冲亡。母法总则P21-8",)),
+    Rule('yin.month_lu_cai', 'yin',
+         test=lambda c: (c.zhis[1] == _lu(c, '印')
+                         and (('财' in c.gan_shens and '财' in c.zhi_shens)
+                              or ('才' in c.gan_shens and '才' in c.zhi_shens))),
+         texts=("母法总则P22-18 自坐正印专旺，成财格，移他乡易宗，妻贤子孝。",)),
+
+    # 偏财分析
+    Rule('piancai.gan', 'piancai', all_of=('gan_shen:才',),
+         texts=("偏财明现天干，不论是否有根:财富外人可见;实际财力不及外观一半。没钱别人都不相信;协助他人常超过自己的能力",
+                "偏财出天干，又与天月德贵人同一天干者。在年月有声明远扬的父亲，月时有聪慧的红颜知己。喜奉承。",
+                "偏财透天干，四柱没有刑冲，长寿。女子为孝顺女，主要针对年月。时柱表示中年以后有自己的事业，善于理财。")),
+    Rule('piancai.ge', 'piancai', all_of=('gan_shen:才', 'hidden:才'), ge='才',
+         texts=("财格基础80:比劫用食伤通关或官杀制；身弱有比劫仍然用食伤通关。如果时柱坐实比劫，晚年破产。",)),
+    Rule('piancai.gan_yuanze', 'piancai', all_of=('gan_shen:才',),
+         texts=("偏财透天干，讲究原则，不拘小节。喜奉承，善于享受。财格基础80",)),
+    Rule('piancai.bijie', 'piancai', all_of=('gan_shen:才',),
+         test=lambda c: '比' in c.gan_shens or '劫' in c.gan_shens and c.gan_shens[3] == '才',
+         texts=("年月比劫，时干透出偏财。祖业凋零，再白手起家。有刑冲为千金散尽还复来",)),
+    Rule('piancai.sha', 'piancai', all_of=('gan_shen:才', 'gan_shen:杀', 'zhi_shen:杀'),
+         texts=("偏财和七杀并位，地支又有根，父子外合心不合。因为偏财生杀攻身。偏财七杀在日时，则为有难伺候的女朋友。 基62壬午 甲辰 戊寅 癸亥",)),
+    Rule('piancai.year', 'piancai', all_of=('zhi_shen0:才', 'gan_shen:才'),
+         texts=("偏财根透年柱，家世良好，且能承受祖业。",)),
+    Rule('piancai.zuo_ren', 'piancai', all_of=('gan_shen:才',), pillars=_PILLARS, loop='piancai.zuo',
+         test=lambda c, i: '劫' in c.zhi_shen3[i] and c.zhis[i] in zhengs,
+         texts=("偏财坐阳刃劫财,可做父缘薄，也可幼年家贫。也可以父先亡，要参考第一大运。偏财坐专位阳刃劫财,父亲去他乡.基61壬午 壬寅 戊子 丁巳",)),
+    Rule('piancai.zuo_kong', 'piancai', all_of=('gan_shen:才',), pillars=_PILLARS, loop='piancai.zuo',
+         test=lambda c, i: get_empty(c.zhus[2], c.zhis[i]) == '空',
+         texts=("偏财坐空亡，财官难求。",)),
+    Rule('piancai.many', 'piancai', test=lambda c: c.shens2.count('才') > 2,
+         texts=("偏财多的人慷慨，得失看淡。花钱一般不会后悔。偏乐观，甚至是浮夸。生活习惯颠倒。适应能力强。有团队精神。得女性欢心。小事很少失信。",
+                "乐善好施，有团队精神，女命偏财，听父亲的话。时柱偏财女，善于理财，中年以后有事业。")),
+    Rule('piancai.day_time_zhuan', 'piancai', any_of=('zhi_shen2:才', 'zhi_shen3:才'),
+         test=lambda c: ((c.zhi_shens[2] == '才' and len(zhi5[c.zhis[2]]) == 1)
+                         or (c.zhi_shens[3] == '才' and len(zhi5[c.zhis[3]]) == 1)),
+         texts=("日时地支坐专位偏财。不见刑冲，时干不是比劫，大运也没有比劫刑冲，晚年发达。",)),
+
+    # 财分析
+    Rule('cai.month_pillar', 'cai',
+         test=lambda c: ((c.gan_shens[0] in ('财', '才') and c.gan_shens[1] in ('财', '才'))
+                         or (c.gan_shens[1] in ('财', '才')
+                             and ('财' in c.zhi_shen3[1] or '才' in c.zhi_shen3[1]))),
+         texts=("财或偏财月重叠：女职业妇女，有理财办事能力。因自己理财能力而影响婚姻。一财得所，红颜失配。男的双妻。",)),
+    Rule('cai.ge', 'cai', all_of=('gan_shen:财', 'hidden:财'), ge='财'),
+    Rule('cai.he', 'cai', all_of=('gan_shen:财', 'yang'), texts=("男日主合财星，夫妻恩爱。如果争合或天干有劫财，双妻。",)),
+    Rule('cai.gen', 'cai', all_of=('gan_shen:财', 'zhi_shen:财'),
+         texts=("财格基础80:比劫用食伤通关或官杀制；身弱有比劫仍然用食伤通关。",)),
+    Rule('cai.guan', 'cai', all_of=('gan_shen:财', 'gan_shen:官'), texts=("正官正财并行透出，(身强)出身书香门第。",)),
+    Rule('cai.guansha', 'cai', any_of=('gan_shen:官', 'gan_shen:杀'), all_of=('gan_shen:财',),
+         texts=("官或杀与财并行透出，女压夫，财生官杀，老公压力大。",)),
+    Rule('cai.year_gan', 'cai', all_of=('gan_shen0:财',), texts=("年干正财若为喜，富裕家庭，但不利母亲。",)),
+    Rule('cai.gen_guansha', 'cai', any_of=('gan_shen:官', 'gan_shen:杀'), all_of=('gan_shen:财', 'zhi_shen:财'),
+         texts=("男财旺透官杀，女厌夫。",)),
+    Rule('cai.gan2', 'cai', all_of=('gan_shen:财',), test=lambda c: c.gan_shens.count('财') > 1,
+         texts=("天干两正财，财源多，大多做好几种生意，好赶潮流，人云亦云。有时会做自己外行的生意。",)),
+    Rule('cai.gan2_xu', 'cai', all_of=('gan_shen:财',),
+         test=lambda c: c.gan_shens.count('财') > 1 and '财' not in c.zhi_shens2,
+         texts=("正财多而无根虚而不踏实。重财不富。",)),
+    Rule('cai.zuo_yima', 'cai', all_of=('gan_shen:财',), pillars=_PILLARS, loop='cai.zuo',
+         test=lambda c, i: ((c.gan_shens[i] == '财' or c.zhis[i] == '财')
+                            and c.zhis[i] in day_shens['驿马'][c.zhis.day] and i != 2),
+         texts=("女柱有财+驿马，动力持家。",)),
+    Rule('cai.zuo_taohua', 'cai', all_of=('gan_shen:财',), pillars=_PILLARS, loop='cai.zuo',
+         test=lambda c, i: ((c.gan_shens[i] == '财' or c.zhis[i] == '财')
+                            and c.zhis[i] in day_shens['桃花'][c.zhis.day] and i != 2),
+         texts=("女柱有财+桃花，不吉利。",)),
+    Rule('cai.zuo_kong', 'cai', all_of=('gan_shen:财',), pillars=_PILLARS, loop='cai.zuo',
+         test=lambda c, i: (c.gan_shens[i] == '财' or c.zhis[i] == '财') and c.zhis[i] in empties[c.zhus[2]],
+         texts=("财坐空亡，不持久。",)),
+    Rule('cai.zuo_jue', 'cai', all_of=('gan_shen:财',), pillars=_PILLARS, loop='cai.zuo',
+         test=lambda c, i: (c.gan_shens[i] == '财' or c.zhis[i] == '财') and _zuo(c, i) in ('绝', '墓'),
+         texts=("男财坐绝或墓，不利婚姻。",)),
+    Rule('cai.many', 'cai', test=lambda c: c.shens2.count('财') > 2, texts=("正财多者，为人端正，有信用，简朴稳重。",)),
+    Rule('cai.many_gen', 'cai', all_of=('hidden:财',),
+         test=lambda c: c.shens2.count('财') > 2 and c.me not in c.zhi_shens2,
+         texts=("正财多而有根，日主不在生旺库，身弱惧内。",)),
+    Rule('cai.female_month', 'cai', all_of=('zhi_shen1:财', 'female'), texts=("女命月支正财，有务实的婚姻观。",)),
+    Rule('cai.month', 'cai', all_of=('zhi_shen1:财',),
+         texts=("月令正财，无冲刑，有贤内助，但是母亲与妻子不和。生活简朴，多为理财人士。",)),
+    Rule('cai.time_zhuan', 'cai', all_of=('zhi_shen3:财',), test=lambda c: len(zhi5[c.zhis[3]]) == 1,
+         texts=("时支正财，一般两个儿子。",)),
+    Rule('cai.wuzi', 'cai', any_of=('day_pillar:戊子', 'time_pillar:戊子'),
+         texts=("日支专位正财，得勤俭老婆。即戊子。日时专位支正财，又透正官，中年以后发达，独立富贵。",)),
+    Rule('cai.day_caiguanyin', 'cai', any_of=('day_pillar:壬午', 'day_pillar:癸巳'),
+         texts=("坐财官印，只要四柱没有刑冲，大吉！",)),
+    Rule('cai.jiaxu_yihai', 'cai', any_of=('day_pillar:甲戌', 'day_pillar:乙亥'),
+         texts=("女('甲','戌'),('乙','亥'） 晚婚 -- 不准！",)),
+    Rule('cai.time', 'cai', all_of=('pillar3:财',),
+         texts=("未必准确：时柱有正财，口快心直，不喜拖泥带水，刑冲则浮躁。阳刃也不佳.反之有美妻佳子",)),
+    Rule('cai.none', 'cai', test=lambda c: '财' not in c.shens2 and '才' not in c.shens2,
+         texts=("四柱无财，即便逢财运，也是虚名虚利. 男的晚婚",)),
+    Rule('cai.day_lu_ren', 'cai', all_of=('yang',),
+         test=lambda c: _cai_lu_day(c) and (c.zhi_shens[1] == '劫' or c.zhi_shens[3] == '劫'),
+         texts=("自坐财禄，月支或时支为阳刃，凶。无冲是非多，冲刑主病灾。 母法总则P22-15  母法总则P36-4 丙寅 戊戌 甲午 丁卯 P56-32 己未 丙寅 丙申 甲午",)),
+    Rule('cai.day_lu_jie', 'cai', all_of=('gan_shen:劫', 'zhi_shen:劫', 'yang'), test=_cai_lu_day,
+         texts=("自坐财禄，透劫财，有阳刃，刑妻无结局。 母法总则P36-7 戊子 乙卯 甲午 乙亥",)),
+    Rule('cai.day_lu_huotu', 'cai', any_of=('me:甲', 'me:乙'),
+         test=lambda c: _cai_lu_day(c) and ('戊' in c.gans or '己' in c.gans),
+         texts=("火土代用财，如果透财，多成多败，早年灰心。 母法总则P22-19 辛未 癸巳 甲午 戊辰",)),
+    Rule('cai.day_lu_xiao', 'cai', all_of=('gan_shen3:枭',), test=_cai_lu_day,
+         texts=("财禄时干偏印：主亲属孤独 母法总则P31-158 丁丑 丙午 甲辰 己巳",)),
+    Rule('cai.day_lu_xiao_ge', 'cai', all_of=('gan_shen3:枭', 'hidden3:枭'), test=_cai_lu_day,
+         texts=("财禄时干偏印格：财虽吉、人丁孤单、性格艺术化 母法总则P56-20 己巳 丙辰 甲午 壬申",)),
+    Rule('cai.day_lu_time_yin', 'cai', test=lambda c: _cai_lu_day(c) and c.zhis[3] == _lu(c, '印'),
+         texts=("坐财禄，时支印禄：先难后易 母法总则P30-147 甲申 己巳 壬午 己酉 母法总则P55-16",)),
+    Rule('cai.he_jinjiao', 'cai',
+         test=lambda c: ((c.gan_he[3] and c.gan_shens[3] == '财' and jin_jiao(c.zhis[2], c.zhis[3]))
+                         or (c.gan_he[2] and c.gan_he[1] and c.gan_shens[1] == '财'
+                             and jin_jiao(c.zhis[1], c.zhis[2]))),
+         texts=("日主合财且进角合：一生吉祥、平安有裕！ 母法总则P22-22 丁丑 丙午 甲辰 己巳",)),
+    Rule('cai.day_time_xiao', 'cai', all_of=('gan_shen3:枭',),
+         test=lambda c: _cai_day(c) and ('枭' in c.zhi_shen3[3] or c.zhis[3] == _lu(c, '枭')),
+         texts=("日坐财，时偏印格：他乡有成，为人敦厚。母法总则P55-4 甲寅 辛未 甲午 壬申",)),
+    Rule('cai.day_chong', 'cai', test=lambda c: _cai_day(c) and (c.zhi_6chong[2] or c.zhi_xing[2]),
+         texts=("日坐财，有冲或刑：财吉而有疾。母法总则P55-10 丙寅 戊戌 甲午 甲子",)),
+    Rule('cai.time_ri_ku', 'cai', all_of=('gan_shen3:财',), test=lambda c: zhi_ku(c.zhis[3], (c.me, _gan(c, '劫'))),
+         texts=("正财坐日库于时柱:孤独、难为父母，但事业有成。 母法总则P31-156 丁丑 丙午 甲辰 己巳",)),
+    Rule('cai.day_ku_jieku', 'cai', test=lambda c: c.zhis[2] == _ku(c, '财') and c.zhis[3] == _ku(c),
+         texts=("自坐财库,时劫库：有财而孤单。 母法总则P30-136 丁丑 丙午 甲辰 己巳 母法总则P55-11 P61-5 甲子 己巳 壬戌 甲辰",)),
+    Rule('cai.day_ku_time', 'cai', test=lambda c: c.zhis[2] == _ku(c, '财') and c.zhis[2] == c.zhis[3],
+         texts=("自坐财库,时坐财库：妻有灾，妻反被妾制服。 母法总则P30-150 辛酉 乙未 壬戌 庚戌 母法总则P56-19",)),
+    Rule('cai.day_ku_sha', 'cai', all_of=('gan_shen3:杀', 'hidden3:杀'), test=lambda c: c.zhis[2] == _ku(c, '财'),
+         texts=("自坐财库,时杀格，财生杀，凶！母法总则P30-147 甲寅 己巳 壬戌 戊申 有可能是时柱有杀就算。 母法总则P55-15",)),
+    Rule('cai.time_ku_shang', 'cai', all_of=('gan_shen:伤', 'zhi_shen:伤'),
+         test=lambda c: zhi_ku(c.zhis[3], (_gan(c, '财'), _gan(c, '才'))),
+         texts=("时坐财库,伤官生财:财好，体弱，旺处寿倾倒！母法总则P59-8 戊申 辛酉 戊子 丙辰",)),
+    Rule('cai.time_ge', 'cai', all_of=('gan_shen3:财', 'hidden3:财'),
+         texts=("时上正财格:不必财旺，因妻致富。 母法总则P30-140 丙午 戊戌 壬寅 丁未 母法总则P60-21",)),
+    Rule('cai.time_ge_jieku', 'cai', all_of=('gan_shen3:财', 'hidden3:财'), test=lambda c: c.zhis[3] == _ku(c),
+         texts=("时上正财格坐比劫库，克妻。 母法总则P30-141 丙午 戊戌 壬寅 丁未",)),
+    Rule('cai.time_ge_caiku', 'cai', all_of=('gan_shen3:财', 'hidden3:财'), test=lambda c: c.zhis[2] == _ku(c, '财'),
+         texts=("时上正财格自坐财库，妻佳，中年丧妻，续弦也佳。 母法总则P30-142 庚子 辛巳 壬戌 丁未 P61-7",)),
+    Rule('cai.time_lu_he', 'cai', test=lambda c: _cai_lu_time(c) and c.gan_he[3],
+         texts=("时财禄，天干日时双合，损妻家财。 母法总则P31-157 庚戌 戊寅 癸酉 戊午",)),
+    Rule('cai.time_lu_shang', 'cai', all_of=('gan_shen3:伤', 'hidden:伤'), test=_cai_lu_time,
+         texts=("时支正财时干伤成格：虽富有也刑克。 母法总则P59-1 丁丑 壬寅 丁巳 戊申",)),
+    Rule('cai.time_lu_shang_ku', 'cai',
+         test=lambda c: (_cai_lu_time(c) and zhi_ku(c.zhis[1], (_gan(c, '食'), _gan(c, '伤')))
+                         and c.zhis[3] == _lu(c, '财')),
+         texts=("时支正财禄，月支伤入墓：生财极为辛勤。 母法总则P59-4 甲子 戊辰 庚戌 己卯",)),
+    Rule('cai.time_lu_chong', 'cai',
+         test=lambda c: c.zhis[3] == _lu(c, '财') and (c.zhi_xing[3] or c.zhi_6chong[3]),
+         texts=("时支正财禄有冲刑：得女伴且文学清贵。 母法总则P60-11 丁丑 辛亥 己巳 乙亥",)),
+    Rule('cai.time_lu_other_chong', 'cai',
+         test=lambda c: c.zhis[3] == _lu(c, '财') and (any(c.zhi_xing[:3]) or any(c.zhi_6chong[:3])),
+         texts=("时支正财禄,它支有冲刑：刑妻、孤高、艺术、近贵人。 母法00总则P60-19 乙未 己丑 庚寅 己卯",)),
+    Rule('cai.time_lu_gan', 'cai', all_of=('gan_shen:财',),
+         test=lambda c: c.zhis[3] == _lu(c, '财') and c.gan_shens.count('财') > 1,
+         texts=("时支正财禄,天干财星多：孤雅、九流、表面风光。 母法总则P60-20 乙酉 乙酉 庚辰 己卯",)),
+
+    # 官分析
+    Rule('guan.ge', 'guan', all_of=('gan_shen:官', 'hidden:官'), ge='官',
+         texts=("官若成格：忌伤；忌混杂；基础78。有伤用财通关或印制。混杂用合或者身官两停。日主弱则不可扶。",)),
+    Rule('guan.ge_bijie', 'guan', any_of=('gan_shen:比', 'gan_shen:劫'), all_of=('gan_shen:官', 'hidden:官'),
+         texts=("官格透比或劫：故做清高或有洁癖的文人。",)),
+    Rule('guan.ge_shang', 'guan', all_of=('gan_shen:伤', 'gan_shen:官', 'hidden:官'), texts=("官格透伤：表里不一。",)),
+    Rule('guan.ge_cai', 'guan', any_of=('gan_shen:财', 'gan_shen:才'), all_of=('gan_shen:官', 'hidden:官'),
+         texts=("官格透财：聚财。",)),
+    Rule('guan.ge_yin', 'guan', all_of=('gan_shen:印', 'gan_shen:官', 'hidden:官'), texts=("官格透印：人品清雅。",)),
+    Rule('guan.ge_du', 'guan', all_of=('gan_shen:官', 'hidden:官'),
+         test=lambda c: not ('印' in c.gan_shens or '财' in c.gan_shens or '才' in c.gan_shens),
+         texts=("官独透成格：敦厚人。",)),
+    Rule('guan.month_pillar', 'guan', all_of=('gan_shen:官',),
+         test=lambda c: ((c.gan_shens[0] == '官' and c.gan_shens[1] == '官')
+                         or (c.gan_shens[1] == '官' and '官' in c.zhi_shen3[1])),
+         texts=("官月重叠：女易离婚，早婚不吉利。为人性格温和。",)),
+    Rule('guan.time_zhuan', 'guan', all_of=('gan_shen3:官',), test=lambda c: len(zhi5[c.zhis[3]]) == 1,
+         texts=("官专位时坐地支，男有得力子息。",)),
+    Rule('guan.year_gan', 'guan', all_of=('gan_shen0:官',), texts=("年干为官，身强有可能出身书香门第。",)),
+    Rule('guan.year_time', 'guan', all_of=('gan_shen0:官', 'gan_shen3:官'),
+         texts=("男命年干，时干都为官，对后代和头胎不利。",)),
+    Rule('guan.du', 'guan', all_of=('gan_shen:官',),
+         test=lambda c: '财' not in c.gan_shens and '印' not in c.gan_shens,
+         texts=("官独透天干成格，四柱无财或印，为老实人。",)),
+    Rule('guan.shang', 'guan', all_of=('gan_shen:官', 'gan_shen:伤'),
+         texts=("正官伤官通根透，又无其他格局，失策。尤其是女命，异地分居居多，婚姻不美满。基64:辛未 丁酉 甲戌 辛未 ",)),
+    Rule('guan.sha', 'guan', all_of=('gan_shen:官', 'gan_shen:杀'),
+         texts=("年月干杀和偏官，30以前婚姻不稳定。月时多为体弱多病。",)),
+    Rule('guan.yin', 'guan', all_of=('gan_shen:官', 'gan_shen:印', 'hidden:印', 'hidden:官'),
+         texts=("官印同根透，无刑冲合，吉。",)),
+    Rule('guan.yin_cai', 'guan', all_of=('gan_shen:官', 'gan_shen:印', 'hidden:印', 'hidden:官', 'gan_shen:财', 'hidden:财'),
+         texts=("财官印同根透，无刑冲合，吉。",)),
+    Rule('guan.month_mu', 'guan', all_of=('gan_shen:官',),
+         test=lambda c: c.gan_shens[1] == '官' in ten_deities[c.me][c.zhis[1]] in ('绝', '墓'),
+         texts=("官在月坐墓绝，不是特殊婚姻就是迟婚。如果与天月德同柱，依然不错。丈夫在库中：1，老夫少妻；2，不为外人所知的亲密感情；3，特殊又合法的婚姻。",)),
+    Rule('guan.month_guan', 'guan', all_of=('zhi_shen1:官', 'gan_shen1:官'), texts=("月柱正官坐正官，婚变。月柱不宜通。坐禄的。",)),
+    Rule('guan.zuo_bijie', 'guan', all_of=('gan_shen:官',), pillars=_PILLARS, loop='guan.zuo',
+         test=lambda c, i: c.gan_shens[i] == '官' and c.zhi_shens[i] in ('劫', '比'),
+         texts=("天干正官，地支比肩或劫财，亲友之间不适合合作，但是他适合经营烂摊子。",)),
+    Rule('guan.zuo_sha', 'guan', all_of=('gan_shen:官',), pillars=_PILLARS, loop='guan.zuo',
+         test=lambda c, i: c.gan_shens[i] == '官' and c.zhi_shens[i] == '杀',
+         texts=("正官坐七杀，男命恐有诉讼之灾。女命婚姻不佳。月柱尤其麻烦，二度有感情纠纷。年不算，时从轻。 基64 壬子 壬子 丁丑 癸卯",)),
+    Rule('guan.zuo_ren', 'guan', all_of=('gan_shen:官', 'yang'), pillars=_PILLARS, loop='guan.zuo',
+         test=lambda c, i: c.gan_shens[i] == '官' and c.zhi_shens[i] == '劫',
+         texts=("官坐羊刃：要杀才能制服阳刃，有力不从心之事情。 辛卯 丁酉 庚午 庚辰 基65",)),
+    Rule('guan.zuo_yin', 'guan', all_of=('gan_shen:官',), pillars=_PILLARS, loop='guan.zuo',
+         test=lambda c, i: c.gan_shens[i] == '官' and c.zhi_shens[i] == '印',
+         texts=("官坐印，无刑冲合，吉",)),
+    Rule('guan.many', 'guan', all_of=('gan_shen:官', 'hidden:官'), test=lambda c: c.shens2.count('官') > 2,
+         texts=("正官多者，虚名。为人性格温和，比较实在。做七杀看",)),
+    Rule('guan.day', 'guan', test=_guan_day, texts=("日坐正官专位，淑女。 基65 庚申 癸未 丙子 乙未",)),
+    Rule('guan.day_time_ren', 'guan', all_of=('yang',), test=lambda c: _guan_day(c) and c.zhis.time == _di(c),
+         texts=("日坐正官，时支阳刃：先富后败，再东山再起。 子平母法 P55-7",)),
+    Rule('guan.gan3', 'guan', all_of=('gan_shen:官',), test=lambda c: c.gan_shens.count('官') > 2,
+         texts=("天干2官，女下有弟妹要照顾，一生为情所困。",)),
+    Rule('guan.month_shang', 'guan', all_of=('zhi_shen1:官', 'hidden:伤'),
+         texts=("月支正官，又成伤官格，难做真正夫妻。有实，无名。 基66辛丑 辛卯 戊子 辛酉",)),
+
+    # 杀分析
+    Rule('sha.gan', 'sha', all_of=('gan_shen:杀',),
+         texts=("七杀是非多。但是对男人有时是贵格。比如毛主席等。成格基础85可杀生印或食制印、身杀两停、阳刃驾杀。",)),
+    Rule('sha.ge', 'sha', all_of=('gan_shen:杀', 'hidden:杀'), ge='杀',
+         texts=("杀格：喜食神制，要食在前，杀在后。阳刃驾杀：杀在前，刃在后。身杀两停：比如甲寅日庚申月。杀印相生，忌食同成格。",)),
+    Rule('sha.ge_bijie', 'sha', any_of=('gan_shen:比', 'gan_shen:劫'), all_of=('gan_shen:杀', 'hidden:杀'),
+         texts=("杀格透比或劫：性急但还有分寸。",)),
+    Rule('sha.ge_sha', 'sha', all_of=('gan_shen:杀', 'hidden:杀'), texts=("杀格透官：精明琐屑，不怕脏。",)),
+    Rule('sha.ge_shishang', 'sha', any_of=('gan_shen:食', 'gan_shen:伤'), all_of=('gan_shen:杀', 'hidden:杀'),
+         texts=("杀格透食伤：外表宁静，内心刚毅。",)),
+    Rule('sha.ge_yin', 'sha', all_of=('gan_shen:印', 'gan_shen:杀', 'hidden:杀'), texts=("杀格透印：圆润、精明干练。",)),
+    Rule('sha.year_month_gan', 'sha', all_of=('gan_shen0:杀', 'gan_shen1:杀'),
+         texts=("杀月干年干重叠：不是老大，出身平常，多灾，为人不稳重。",)),
+    Rule('sha.month_pillar', 'sha', all_of=('gan_shen1:杀', 'hidden1:杀'),
+         texts=("杀月重叠：女易离婚，其他格一生多病。",)),
+    Rule('sha.year_gan', 'sha', all_of=('gan_shen0:杀',), texts=("年干七杀，早年不好。或家里穷或身体不好。",)),
+    Rule('sha.year_month', 'sha', all_of=('gan_shen0:杀', 'gan_shen1:杀'), texts=("年月天干七杀，家庭复杂。",)),
+    Rule('sha.guan', 'sha', all_of=('gan_shen:杀', 'gan_shen:官'),
+         texts=("官和杀同见天干不佳。女在年干月干，30以前婚姻不佳，或体弱多病。基65 甲寅 乙亥 戊子 丙辰",)),
+    Rule('sha.month', 'sha', all_of=('gan_shen1:杀', 'zhi_shen1:杀'),
+         texts=("月柱都是七杀，克得太过。有福不会享。六亲福薄。时柱没关系。",)),
+    Rule('sha.month_fu', 'sha', all_of=('gan_shen1:杀', 'zhi_shen1:杀'), test=lambda c: '杀' not in c.zhi_shens2,
+         texts=("七杀年月浮现天干，性格好变，不容易定下来。30岁以前不行。",)),
+    Rule('sha.gen_ren', 'sha', all_of=('gan_shen:杀', 'zhi_shen:杀', 'zhi_shen:劫'),
+         texts=("七杀地支有根时要有阳刃强为佳。杀身两停。",)),
+    Rule('sha.month_time', 'sha', all_of=('gan_shen1:杀', 'gan_shen3:杀'), texts=("月时天干为七杀：体弱多病",)),
+    Rule('sha.year_time', 'sha', all_of=('gan_shen0:杀', 'gan_shen3:杀'),
+         texts=("七杀年干时干：男头胎麻烦（概率），女婚姻有阻碍。",)),
+    Rule('sha.time_gan', 'sha', all_of=('gan_shen3:杀',), texts=("七杀在时干，固执有毅力。基67",)),
+    Rule('sha.yin', 'sha', all_of=('gan_shen:杀', 'gan_shen:印'), texts=("身弱杀生印，不少是精明练达的商人。",)),
+    Rule('sha.cai', 'sha', any_of=('gan_shen:财', 'gan_shen:才'), all_of=('gan_shen:杀',),
+         texts=("财生杀，如果不是身弱有印，不佳。",)),
+    Rule('sha.cai_gen', 'sha', any_of=('gan_shen:财', 'gan_shen:才'), all_of=('gan_shen:杀',), pillars=_PILLARS,
+         test=lambda c, i: set((_gan(c, '杀'), _gan(c, '财'))) in set(zhi5[c.zhis[i]]),
+         texts=("杀不喜与财同根透出，这样杀的力量太强。",)),
+    Rule('sha.zuo_sha', 'sha', any_of=('gan_shen:杀', 'zhi_shen:杀'), pillars=_PILLARS, loop='sha.zuo',
+         test=lambda c, i: c.gan_shens[i] == '杀' and '杀' in c.zhi_shen3[i] and i != 3,
+         texts=("七杀坐七杀，六亲福薄。",)),
+    Rule('sha.zuo_kong', 'sha', any_of=('gan_shen:杀', 'zhi_shen:杀'), pillars=_PILLARS, loop='sha.zuo',
+         test=lambda c, i: ((c.gan_shens[i] == '杀' or c.zhi_shens[i] == '杀')
+                            and get_empty(c.zhus[2], c.zhis[i]) == '空'),
+         texts=("七杀坐空亡，女命夫缘薄。 基68 壬申 庚戌 甲子 丙寅",)),
+    Rule('sha.zuo_shi', 'sha', any_of=('gan_shen:杀', 'zhi_shen:杀'), pillars=_PILLARS, loop='sha.zuo',
+         test=lambda c, i: (c.gan_shens[i] == '杀' or c.zhi_shens[i] == '杀') and c.zhis[i] == '食',
+         texts=("七杀坐食：易有错误判断。",)),
+    Rule('sha.zuo_xing', 'sha', any_of=('gan_shen:杀', 'zhi_shen:杀'), pillars=_PILLARS, loop='sha.zuo',
+         test=lambda c, i: ((c.gan_shens[i] == '杀' or c.zhi_shens[i] == '杀')
+                            and (c.zhi_xing[i] or c.zhi_6chong[i])),
+         texts=("七杀坐刑或对冲，夫妻不和。",)),
+    Rule('sha.many', 'sha', test=lambda c: c.shens2.count('杀') > 2,
+         texts=("杀多者如果无制，性格刚强。打抱不平，不易听人劝。女的喜欢佩服的人。",)),
+    Rule('sha.day_zhuan', 'sha', all_of=('zhi_shen2:杀',), test=lambda c: len(zhi5[c.zhis[2]]) == 1,
+         texts=("天元坐杀：乙酉，己卯，如无食神，阳刃，性急，聪明，对人不信任。如果七杀还透出月干无制，体弱多病，甚至夭折。如果在时干，晚年不好。",)),
+    Rule('sha.taohua', 'sha', any_of=('day_pillar:丁卯', 'day_pillar:丁亥', 'day_pillar:丁未'), all_of=('time:子',),
+         texts=("七杀坐桃花，如有刑冲，引感情引祸。忌讳午运。",)),
+    Rule('sha.gan3', 'sha', all_of=('gan_shen:杀',), test=lambda c: c.gan_shens.count('杀') > 2,
+         texts=("天干2杀，不是老大、性格浮躁不持久。",)),
+    Rule('sha.female_lu', 'sha', all_of=('female',), test=lambda c: _lu(c, '伤') in c.zhis,
+         texts=("女地支有杀的禄：丈夫条件还可以。对外性格急，对丈夫还算顺从。",)),
+
+    # 自坐绝、时坐绝
+    Rule('jue.day', 'jue', all_of=('status2:绝',), texts=("#" * 10 + " 自坐绝",)),
+    Rule('jue.day_he', 'jue', all_of=('status2:绝',), test=lambda c: c.zhi_6he[2],
+         texts=("自己坐绝（天元坐杀）：日支与它支合化、双妻，子息迟。母法总则P21-9 P56-30 d第10点暂未编码。",)),
+    Rule('jue.day_hehui', 'jue', all_of=('status2:绝',),
+         texts=("自己坐绝支，绝支合会，先贫后富。母法总则P57-3 母法总则P23-33",)),
+    Rule('jue.day_time', 'jue', all_of=('status2:绝',), test=lambda c: c.zhis[3] == c.zhis[2],
+         texts=("日主日时绝，旺达则有刑灾。母法总则P57-2 母法总则P24-43 戊午 癸亥 乙酉 乙酉",)),
+    Rule('jue.day_month_time', 'jue', all_of=('status2:绝',), test=lambda c: c.zhis[3] == c.zhis[2] == c.zhis[1],
+         texts=("日主月日时绝，旺达则有刑灾，平常人不要紧。母法总则P57-1",)),
+    Rule('jue.day_bijie', 'jue', all_of=('status2:绝',),
+         test=lambda c: c.zhi_shens.count('比') + c.zhi_shens.count('劫') > 1,
+         texts=("自坐绝，地支比劫大于1，旺衰巨变，凶：母法总则P22-16。 母法总则P36-5月支或时支都为阳刃，凶。",)),
+    Rule('jue.day_month', 'jue', all_of=('status2:绝', 'status1:绝'), texts=("日主月日绝，有格也疾病夭。母法总则P23-35",)),
+    Rule('jue.day_cai_lu', 'jue', all_of=('status2:绝',), test=lambda c: c.zhis[3] == _lu(c, '财'),
+         texts=(" 母法总则P59-2  自坐绝，月支财禄:身弱财旺有衰困时，克妻子。书上例子不对",)),
+    Rule('jue.day_cai_di', 'jue', all_of=('status2:绝',), test=lambda c: c.zhis[3] == _di(c, '财'),
+         texts=(" 母法总则P59-3  自坐绝，月支偏财禄:有困顿时娶背景不佳妻。书上例子不对",)),
+    Rule('jue.time', 'jue', all_of=('status3:绝',),
+         texts=("#" * 10 + " 自己时坐绝: 母法总则P57-4: 若成伤官格，难求功名，适合艺术九流。",)),
+    Rule('jue.time_day_xiao', 'jue', all_of=('status3:绝', 'zhi_shen2:枭'),
+         texts=("母法总则P57-5: 自时支坐绝，自坐枭: 不是生意人，清贫艺术九流人士。",)),
+    Rule('jue.time_month_cai', 'jue', all_of=('status3:绝',),
+         test=lambda c: c.zhis[1] in (_di(c, '财'), _lu(c, '财')),
+         texts=(" 母法总则P57-6  自时支坐绝，月支坐财:先富，晚年大败，刑破。 癸未 庚申 丁巳 庚子",)),
+    Rule('jue.time_month_lu', 'jue', any_of=('status1:建', 'status1:帝'), all_of=('status3:绝',),
+         texts=(" 母法总则P28-114  自时支坐绝，月支帝:刑妻克子。 甲子 癸酉 辛丑 辛卯 -- 阴干也算阳刃？",)),
+    Rule('jue.time_cai', 'jue', all_of=('status3:绝',), test=_cai_lu_time,
+         texts=(" 母法总则P57-8  自时支坐绝，时支财:中年发后无作为。 甲子 癸酉 辛丑 辛卯",)),
+
+    # 杀禄
+    Rule('sha_lu.day', 'sha_lu',
+         test=lambda c: c.zhis[2] == _lu(c, '杀') and zhi_ku(c.zhis[3], (_gan(c, '官'), _gan(c, '杀'))),
+         texts=("自坐杀禄，时支为官杀库，一生有疾，生计平常。 母法总则P21-12 母法总则P55-8 甲子 丙寅 乙酉 己丑 P56-31",)),
+    Rule('sha_lu.time_xing', 'sha_lu',
+         test=lambda c: c.zhis[3] == _lu(c, '杀') and (c.zhi_xing[3] or c.zhi_6chong[3]),
+         texts=("时支杀禄带刑冲：纵然吉命也带疾不永寿。 母法总则P60-15 乙未 乙酉 戊申 甲寅",)),
+    Rule('sha_lu.time_cai', 'sha_lu', all_of=('gan_shen3:杀',), test=_cai_lu_time,
+         texts=("七杀时柱坐财禄旺：性格严肃。 母法总则P59-7 母法总则P79-3 双妻，子息迟。 ",)),
+    Rule('sha_lu.time_chong', 'sha_lu',
+         test=lambda c: c.zhis[3] == _lu(c, '杀') and (c.zhi_6chong[3] or c.zhi_xing[3]),
+         texts=("七杀时禄旺：遇刑冲寿夭带疾。 母法总则P28-118 冲别的柱也算？ 乙未 戊寅 辛丑 甲午 ",)),
+    Rule('sha_lu.time_month', 'sha_lu', test=lambda c: c.zhis[3] == _lu(c, '杀') and c.zhis[1] == _lu(c, '杀'),
+         texts=("七杀时月禄旺：体疾。 母法总则P28-119 甲寅 庚午 辛丑 甲午  母法总则P60-16",)),
+    Rule('sha_lu.day_ku', 'sha_lu',
+         test=lambda c: zhi_ku(c.zhis[2], (_gan(c, '官'), _gan(c, '杀'))) and set(c.zhis).issubset(set('辰戌丑未')),
+         texts=("自坐七杀入墓：地支都为库，孤独艺术。 母法总则P57-33  丙辰 戊戌 乙丑 庚辰",)),
+    Rule('sha_lu.gen2', 'sha_lu', all_of=('gan_shen:杀',), test=lambda c: c.zhi_shens.count('杀') > 1,
+         texts=("七杀透干，地支双根，不论贫富，亲属离散。母法总则P79-6 乙未 丙戌 戊寅 甲寅",)),
+
+    # 杀格：三合局或所有格中有杀
+    Rule('sha_ge.bijie', 'sha_ge', any_of=('gan_shen:比', 'gan_shen:劫'), test=_sha_ge,
+         texts=("杀格透比或劫：性急但还有分寸。",)),
+    Rule('sha_ge.sha', 'sha_ge', all_of=('gan_shen:杀',), test=_sha_ge, texts=("杀格透官：精明琐屑，不怕脏。",)),
+    Rule('sha_ge.shishang', 'sha_ge', any_of=('gan_shen:食', 'gan_shen:伤'), test=_sha_ge,
+         texts=("杀格透食伤：外表宁静，内心刚毅。",)),
+    Rule('sha_ge.yin', 'sha_ge', all_of=('gan_shen:印',), test=_sha_ge, texts=("杀格透印：圆润、精明干练。",)),
+
+    # 食分析
+    Rule('shi.ge', 'shi', all_of=('gan_shen:食', 'hidden:食'), ge='食',
+         texts=("食神成格的情况下，寿命比较好。食神和偏财格比较长寿。食神厚道，为人不慷慨。食神有口福。成格基础84，喜财忌偏印(只能偏财制)。",
+                "食神无财一生衣食无忧，无大福。有印用比劫通关或财制。")),
+    Rule('shi.month_pillar', 'shi', all_of=('gan_shen:食',),
+         test=lambda c: ((c.gan_shens[0] == '食' and c.gan_shens[1] == '食')
+                         or (c.gan_shens[1] == '食' and '食' in c.zhi_shen3[1])),
+         texts=("食月重叠：生长安定环境，性格仁慈、无冲刑长寿。女早年得子。无冲刑偏印者是佳命。",)),
+    Rule('shi.xiao', 'shi', all_of=('gan_shen:食', 'gan_shen:枭'),
+         texts=("男的食神碰到偏印，身体不好。怕偏印，正印要好一点。四柱透出偏财可解。",)),
+    Rule('shi.xiao_jie', 'shi', all_of=('gan_shen:食', 'gan_shen:枭', 'gan_shen:劫'),
+         texts=("食神不宜与劫财、偏印齐出干。体弱多病。基69",)),
+    Rule('shi.xiao_sha', 'shi', all_of=('gan_shen:食', 'gan_shen:枭', 'gan_shen:杀'),
+         texts=("食神不宜与杀、偏印齐成格。体弱多病。",)),
+    Rule('shi.gen', 'shi', all_of=('gan_shen:食', 'zhi_shen:食'),
+         texts=("食神天透地藏，女命阳日主适合社会性职业，阴日主适合上班族。",)),
+    Rule('shi.no_cai', 'shi', all_of=('gan_shen:食',),
+         test=lambda c: '财' not in c.gan_shens and '才' not in c.gan_shens,
+         texts=("食神多，要食伤生财才好，无财难发。",)),
+    Rule('shi.shang', 'shi', all_of=('gan_shen:食', 'gan_shen:伤'),
+         texts=("食伤混杂：食神和伤官同透天干：志大才疏。",)),
+    Rule('shi.sha', 'shi', all_of=('gan_shen:食', 'gan_shen:杀'), texts=("食神制杀，杀不是主格，施舍后后悔。",)),
+    Rule('shi.zuo_ren', 'shi', all_of=('gan_shen:食',), pillars=_PILLARS,
+         test=lambda c, i: c.gan_shens[i] == '食' and c.zhi_shens[i] == '劫',
+         texts=("食神坐阳刃，辛劳。基69 戊申 戊午 丙子 丙申",)),
+    Rule('shi.many', 'shi', test=lambda c: c.shens2.count('食') > 2,
+         texts=("食神四个及以上的为多，做伤官处理。食神多，要食伤生财才好，无财难发。",)),
+    Rule('shi.many_bijie', 'shi', any_of=('gan_shen:劫', 'gan_shen:比'), test=lambda c: c.shens2.count('食') > 2,
+         texts=("食神带比劫，好施舍，乐于做社会服务。",)),
+    Rule('shi.sha_pillar', 'shi', any_of=('zhu_shen:杀食', 'zhu_shen:食杀'),
+         texts=("食神与七杀同一柱，易怒。食神制杀，最好食在前。有一定概率。基69辛未 丁酉 乙未 戊寅",)),
+    Rule('shi.xiao_pillar', 'shi', any_of=('zhu_shen:枭食', 'zhu_shen:食枭'),
+         texts=("女命最怕食神偏印同一柱。不利后代，时柱尤其重要。基69庚午 己卯 丁未 丁未",)),
+    Rule('shi.day_zhuan', 'shi', all_of=('hidden2:食',), test=lambda c: c.zhis[2] in zhengs,
+         texts=("日支食神专位容易发胖，有福。只有2日：癸卯，己酉。男命有有助之妻。",)),
+    Rule('shi.day_sha', 'shi', all_of=('zhi_shen2:食', 'zhi_shen2:杀'),
+         texts=("自坐食神，时支杀专，二者不出天干，多成败，最后失局。",)),
+    Rule('shi.day', 'shi', all_of=('zhi_shen2:食',),
+         texts=("自坐食神，相敬相助，即使透枭也无事，不过心思不定，做事毅力不足，也可能假客气。专位容易发胖，有福。",)),
+    Rule('shi.day_lu_time_sha', 'shi',
+         test=lambda c: (c.zhis[2] == _lu(c, '食') and c.zhis[3] == _lu(c, '杀')
+                         and _gan(c, '杀') not in c.gan_shens),
+         texts=("自坐食，时支专杀不透干：多成败，终局失制。母法总则P56-22 丙子 庚寅 己酉 丁卯",)),
+    Rule('shi.time_xiao', 'shi', all_of=('hidden3:食',), test=lambda c: '枭' in c.zhi_shen3[3] + c.gan_shens[3],
+         texts=("时支食神逢偏印：体弱，慢性病，女的一婚不到头。",)),
+    Rule('shi.day_ku', 'shi', test=lambda c: c.zhis[2] in kus and c.zhi_shen3[2][2] in ('食', '伤'),
+         texts=("自坐食伤库：总觉得钱不够。",)),
+    Rule('shi.year', 'shi', all_of=('pillar0:食',), texts=("年柱食：可三代同堂。",)),
+    Rule('shi.time_ku_month', 'shi',
+         test=lambda c: (zhi_ku(c.zhis[3], (_gan(c, '食'), _gan(c, '伤')))
+                         and ('食' in c.zhi_shen3[1] or '伤' in c.zhi_shen3[1])),
+         texts=("时食库，月食当令，孤克。",)),
+    Rule('shi.day_ku_time_guan', 'shi',
+         test=lambda c: zhi_ku(c.zhis[2], (_gan(c, '食'), _gan(c, '伤'))) and c.zhis[3] == _lu(c, '官'),
+         texts=("坐食伤库：时支官，发达时接近寿终。 母法总则P60-13 乙丑 丙戌 庚辰 壬午",)),
+    Rule('shi.time_ku_month_lu', 'shi',
+         test=lambda c: (zhi_ku(c.zhis[3], (_gan(c, '食'), _gan(c, '伤')))
+                         and c.zhis[1] in (_di(c, '食'), _lu(c, '食'))),
+         texts=("坐食伤库：月支食伤当令，吉命而孤克。 母法总则P60-14 甲戌 丙子 辛卯 壬辰",)),
+
+    # 伤分析
+    Rule('shang.gan', 'shang', all_of=('gan_shen:伤',), texts=("伤官有才华，但是清高。要生财，或者印制。",)),
+    Rule('shang.ge', 'shang', all_of=('gan_shen:伤', 'hidden:伤'), ge='伤',
+         texts=("食神重成伤官，不适合伤官配印。金水、土金、木火命造更高。火土要调候，容易火炎土燥。伤官和七杀的局不适合月支为库。",
+                "伤官成格基础87生财、配印。不考虑调候逆用比顺用好，调候更重要。生正财用偏印，生偏财用正印。\n伤官配印，如果透杀，透财不佳。伤官七杀同时成格，不透财为上好命局。")),
+    Rule('shang.month_pillar', 'shang', all_of=('gan_shen:伤',),
+         test=lambda c: ((c.gan_shens[0] == '伤' and c.gan_shens[1] == '伤')
+                         or (c.gan_shens[1] == '伤' and '伤' in c.zhi_shen3[1])),
+         texts=("父母兄弟均无缘。孤苦，性刚毅好掌权。30岁以前有严重感情苦重，适合老夫少妻，继室先同居后结婚。",)),
+    Rule('shang.yin', 'shang', all_of=('gan_shen:伤', 'gan_shen:印'), test=lambda c: '财' not in c.gan_shens,
+         texts=("伤官配印，无财，有手艺，但是不善于理财。有一定个性",)),
+    Rule('shang.year_month', 'shang', all_of=('gan_shen0:伤', 'gan_shen1:伤'),
+         test=lambda c: '伤' not in c.zhi_shens2, texts=("年月天干都浮现伤官，亲属少。",)),
+    Rule('shang.month_zhuan', 'shang', all_of=('zhi_shen1:伤', 'gan_shen1:伤'), test=lambda c: len(zhi5[c.zhis[1]]) == 1,
+         texts=("月柱：伤官坐专位伤官，夫缘不定。假夫妻。比如老板和小蜜。",)),
+    Rule('shang.zuo_ren', 'shang', all_of=('gan_shen:伤',), pillars=_PILLARS,
+         test=lambda c, i: c.gan_shens[i] == '伤' and c.zhi_shens[i] == '劫',
+         texts=("伤官地支坐阳刃，力不从心 基70己酉 丁卯 甲午 辛未。背禄逐马，克官劫财。影响15年。伤官坐劫财：只适合纯粹之精明商人或严谨掌握财之人。",)),
+    Rule('shang.many_female', 'shang', all_of=('female',), test=lambda c: c.shens2.count('伤') > 2,
+         texts=("女命伤官多，即使不入伤官格，也缘分浅，多有苦情。",)),
+    Rule('shang.many_gan', 'shang', all_of=('gan_shen:伤',),
+         test=lambda c: c.shens2.count('伤') > 2 and c.gan_shens.count('伤') > 2,
+         texts=("天干2伤官：性骄，六亲不靠。婚前诉说家人，婚后埋怨老公。30岁以前为婚姻危机期。",)),
+    Rule('shang.day_zhuan', 'shang', all_of=('zhi_shen2:伤',), test=lambda c: len(zhi5[c.zhis[2]]) == 1,
+         texts=("女命婚姻宫伤官：强势克夫。男的对妻子不利。只有庚子日。",)),
+    Rule('shang.time_lu', 'shang', all_of=('gan_shen3:伤', 'status3:建'),
+         texts=("伤官坐时禄：六亲不靠，无冲刑晚年发，有冲刑不发。 母法P27-96己未 壬申 己亥 庚午, 可以参三命。",)),
+    Rule('shang.month_time', 'shang',
+         test=lambda c: (c.zhis[3] in (_lu(c, '伤'), _di(c, '伤'))
+                         and c.zhis[1] in (_lu(c, '伤'), _di(c, '伤'))),
+         texts=("月支时支食伤当令：日主无根，泄尽日主，凶。 母法P28-104 甲午 乙亥 庚戌 丙子  母法P60-104",)),
+    Rule('shang.female_lu', 'shang', all_of=('female',), test=lambda c: _lu(c, '伤') in c.zhis,
+         texts=("女命地支伤官禄：婚姻受不得穷。",)),
+
+    # 出身
+    Rule('birth.good', 'birth', test=lambda c: _gan(c, '财') in c.gans[:2] and _gan(c, '官') in c.gans[:2],
+         texts=("出身: 不错",)),
+    Rule('birth.plain', 'birth',
+         test=lambda c: not (_gan(c, '财') in c.gans[:2] and _gan(c, '官') in c.gans[:2]),
+         texts=("出身: 一般",)),
+
+    # 食神格
+    Rule('ge_shi.title', 'ge_shi', all_of=('ge:食',),
+         texts=("\n****食神分析****: 格要日主食神俱生旺，无冲破。有财辅助财有用。  食神可生偏财、克杀",
+                " 阳日食神暗官星，阴日食神暗正印。食神格人聪明、乐观、优雅、多才多艺。食居先，煞居后，功名显达。",
+                "=" * 38,
+                "\n    喜:身旺 宜行财乡 逢食看财  忌:身弱 比 倒食(偏印)  一名进神　　二名爵星　　三名寿星\n"
+                "    月令建禄最佳，时禄次之，更逢贵人运\n    ")),
+    Rule('ge_shi.many', 'ge_shi', all_of=('ge:食',), test=lambda c: c.shens.count("食") > 2, end=' ',
+         texts=("食神过多:食神重见，变为伤官，令人少子，纵有，或带破拗性. 行印运",)),
+    Rule('ge_shi.zu', 'ge_shi', all_of=('ge:食',), end=' ',
+         test=lambda c: set(('财', '食')) in set(c.gan_shens[:2] + c.zhi_shens[:2]),
+         texts=("祖父荫业丰隆",)),
+    Rule('ge_shi.qi', 'ge_shi', all_of=('ge:食',), end=' ',
+         test=lambda c: set(('财', '食')) in set(c.gan_shens[2:] + c.zhi_shens[2:]),
+         texts=("妻男获福，怕母子俱衰绝，两皆无成",)),
+    Rule('ge_shi.cai_many', 'ge_shi', all_of=('ge:食',), test=lambda c: c.shens.count("财") > 1, end=' ',
+         texts=("财多则不清，富而已",)),
+    Rule('ge_shi.mu', 'ge_shi', all_of=('ge:食',), pillars=_PILLARS,
+         test=lambda c, i: c.gan_shens[i] == '食' and _zuo(c, i) == '墓',
+         texts=("食入墓，即是伤官入墓，住寿难延。",)),
+    Rule('ge_shi.kong', 'ge_shi', all_of=('ge:食',), pillars=_PILLARS,
+         test=lambda c, i: (c.gan_shens[i] == '食' or c.zhi_shens[i] == '食') and get_empty(c.zhus[2], c.zhis[i]),
+         texts=("大忌空亡，更有官煞显露，为太医师巫术数九流之士，若食神逢克，又遇空亡，则不贵，再行死绝或枭运，则因食上气上生灾，翻胃噎食，缺衣食，忍饥寒而已",)),
+    # 倒食：偏印与日支的主要成分没有天干合
+    Rule('ge_shi.dao_shi', 'ge_shi', all_of=('ge:食', 'shen:枭'),
+         test=lambda c: (c.me not in ['庚', '辛', '壬'] and ten_deities[c.me] != '建'
+                         and all(ten_deities[c.me]['合'] != item for item in zhi5[c.zhis.day])),
+         texts=("倒食:凡命带倒食，福薄寿夭，若有制合没事，主要为地支为天干的杀;日支或者偏印的坐支为日主的建禄状态。偏印和日支的主要成分天干合",
+                "凡命有食遇枭，犹尊长之制我，不得自由，作事进退悔懒，有始无终，财源屡成屡败，容貌欹斜，身品琐小，胆怯心虚，凡事无成，克害六亲，幼时克母，长大伤妻子",
+                "身旺遇此方为福")),
+    Rule('ge_shi.end', 'ge_shi', all_of=('ge:食',), texts=("", "-" * 120)),
+
+    # 伤官格
+    Rule('ge_shang.title', 'ge_shang', all_of=('ge:伤',),
+         texts=("\n****伤官分析****: 喜:身旺,财星,印绶,伤尽 忌:身弱,无财,刑冲,入墓枭印　",
+                " 多材艺，傲物气高，心险无忌惮，多谋少遂，弄巧成拙，常以天下之人不如己，而人亦惮之、恶之。 一名剥官神　　二名羊刃煞",
+                " 身旺用财，身弱用印。用印不忌讳官煞。用印者须去财方能发福",
+                "官星隐显，伤之不尽，岁运再见官星，官来乘旺，再见刑冲破害，刃煞克身，身弱财旺，必主徒流死亡，五行有救，亦残疾。若四柱无官而遇伤煞重者，运入官乡，岁君又遇，若不目疾，必主灾破。",
+                "娇贵伤不起、谨慎过头了略显胆小，节俭近于吝啬",
+                "=" * 38)),
+    Rule('ge_shang.cai', 'ge_shang', any_of=('shen:财', 'shen:才'), all_of=('ge:伤',), texts=("伤官生财",)),
+    Rule('ge_shang.no_cai', 'ge_shang', all_of=('ge:伤',), test=lambda c: not ('财' in c.shens or '才' in c.shens),
+         texts=("伤官无财，主贫穷",)),
+    Rule('ge_shang.yin', 'ge_shang', any_of=('shen:印', 'shen:枭'), all_of=('ge:伤',),
+         texts=('印能制伤，所以为贵，反要伤官旺，身稍弱，始为秀气;印旺极深，不必多见，偏正叠出，反为不秀，故伤轻身重而印绶多见，贫穷之格也。',)),
+    Rule('ge_shang.yin_cai', 'ge_shang', any_of=('shen:印', 'shen:枭'), all_of=('ge:伤',),
+         test=lambda c: '财' in c.shens or '才' in c.shens,
+         texts=('财印相克，本不并用，只要干头两清而不相碍；又必生财者，财太旺而带印，佩印者印太重而带财，调停中和，遂为贵格',)),
+    *(Rule('ge_shang.guan_' + name, 'ge_shang', any_of=_element_gans(element), all_of=('ge:伤', 'shen:官'),
+           texts=(shang_guans[element],)) for element, name in _ELEMENTS),
+    Rule('ge_shang.guan', 'ge_shang', all_of=('ge:伤', 'shen:官'),
+         texts=('金水独宜，然要财印为辅，不可伤官并透。若冬金用官，而又化伤为财，则尤为极秀极贵。若孤官无辅，或官伤并透，则发福不大矣。',)),
+    Rule('ge_shang.sha', 'ge_shang', all_of=('ge:伤', 'shen:杀'), texts=("煞因伤而有制，两得其宜，只要无财，便为贵格",)),
+    Rule('ge_shang.year', 'ge_shang', all_of=('ge:伤', 'gan_shen0:伤'),
+         texts=("年干伤官最重，谓之福基受伤，终身不可除去，若月支更有，甚于伤身七煞",)),
+    Rule('ge_shang.mu', 'ge_shang', all_of=('ge:伤',), pillars=_PILLARS,
+         test=lambda c, i: c.gan_shens[i] == '伤' and _zuo(c, i) == '墓',
+         texts=("食入墓，即是伤官入墓，住寿难延。",)),
+    Rule('ge_shang.kong', 'ge_shang', all_of=('ge:伤',), pillars=_PILLARS,
+         test=lambda c, i: (c.gan_shens[i] == '食' or c.zhi_shens[i] == '食') and get_empty(c.zhus[2], c.zhis[i]),
+         texts=("大忌空亡，更有官煞显露，为太医师巫术数九流之士，若食神逢克，又遇空亡，则不贵，再行死绝或枭运，则因食上气上生灾，翻胃噎食，缺衣食，忍饥寒而已",)),
+    Rule('ge_shang.end', 'ge_shang', all_of=('ge:伤',), texts=("", "-" * 120)),
+
+    # 劫财（阳刃）格
+    Rule('ge_jie.title', 'ge_jie', all_of=('ge:劫',),
+         texts=("\n****劫财(阳刃)分析****：阳刃冲合岁君,勃然祸至。身弱不作凶。", "=" * 38)),
+    Rule('ge_jie.time', 'ge_jie', all_of=('ge:劫', 'pillar3:劫'),
+         texts=("劫财阳刃,切忌时逢,岁运并临,灾殃立至,独阳刃以时言,重于年月日也。",)),
+    Rule('ge_jie.end', 'ge_jie', all_of=('ge:劫',), texts=("-" * 120,)),
+
+    # 财格
+    Rule('ge_cai.title', 'ge_cai', any_of=('ge:财', 'ge:才'),
+         texts=("\n****财分析 **** 喜:旺,印,食,官 忌:比 羊刃 空绝 冲合   财星,天马星,催官星,壮志神",)),
+    Rule('ge_cai.lu', 'ge_cai', any_of=('ge:财', 'ge:才'),
+         test=lambda c: c.gan_shens.count('财') + c.gan_shens.count('才') > 1,
+         texts=('财喜根深，不宜太露，然透一位以清用，格所最喜，不为之露。即非月令用神，若寅透乙、卯透甲之类，一亦不为过，太多则露矣。',
+                '财旺生官，露亦不忌，盖露不忌，盖露以防劫，生官则劫退，譬如府库钱粮，有官守护，即使露白，谁敢劫之？')),
+    Rule('ge_cai.shang', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('gan_shen:伤',), texts=("有伤官，财不能生官",)),
+    Rule('ge_cai.shi', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('shen:食',),
+         texts=("有财用食生者，身强而不露官，略带一位比劫，益觉有情",)),
+    Rule('ge_cai.shi_yin', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('shen:食',),
+         test=lambda c: '印' in c.shens or '枭' in 'shens', texts=("注意印食冲突",)),
+    Rule('ge_cai.bi', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('shen:比',), texts=("比不吉，但是伤官食神可化!",)),
+    Rule('ge_cai.sha', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('shen:杀',), texts=("不论合煞制煞，运喜食伤身旺之方!",)),
+    Rule('ge_cai.year', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('zhi_shen0:财',),
+         texts=("岁带正马：月令有财或伤食，不犯刑冲分夺，旺祖业丰厚。同类月令且带比，或遇运行伤劫 贫",)),
+    Rule('ge_cai.time', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('zhi_shen3:财',),
+         texts=("时带正马：无冲刑破劫，主招美妻，得外来财物，生子荣贵，财产丰厚，此非父母之财，乃身外之财，招来产业，宜俭不宜奢。",)),
+    Rule('ge_cai.day', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('zhi_shen2:财',),
+         test=lambda c: c.me not in ('壬', '癸'), texts=("天元坐财：喜印食 畏官煞，喜月令旺 ",)),
+    Rule('ge_cai.sheng_guan', 'ge_cai', any_of=('ge:财', 'ge:才'),
+         test=lambda c: '官' not in c.shens and '伤' not in c.shens and '食' not in c.shens,
+         texts=("财旺生官:若月令财无损克，亦主登科",)),
+    Rule('ge_cai.many', 'ge_cai', any_of=('ge:财', 'ge:才'),
+         test=lambda c: (c.shens.count('财') > 2 and '劫' not in c.shens and '比' not in c.shens
+                         and '印' not in c.shens),
+         texts=("财　不重叠多见　财多身弱，柱无印助; 若财多身弱，柱无印助不为福。",)),
+    Rule('ge_cai.yin', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('shen:印',),
+         texts=("先财后印，反成其福，先印后财，反成其辱是也?",)),
+    Rule('ge_cai.guan', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('gan_shen:官',),
+         texts=("官星显露，别无伤损，或更食生印助日主健旺，富贵双全",)),
+    Rule('ge_cai.lu_bai', 'ge_cai', any_of=('ge:财', 'ge:才'), all_of=('gan_shen:财',),
+         test=lambda c: '劫' not in c.shens and '比' not in c.shens, texts=("财不宜明露",)),
+    Rule('ge_cai.zuo_mu', 'ge_cai', any_of=('ge:财', 'ge:才'), pillars=_PILLARS, loop='ge_cai.zuo',
+         test=lambda c, i: c.gan_shens[i] == '财' and _zuo(c, i) == '墓', texts=("财星入墓，必定刑妻",)),
+    Rule('ge_cai.zuo_chang', 'ge_cai', any_of=('ge:财', 'ge:才'), pillars=_PILLARS, loop='ge_cai.zuo',
+         test=lambda c, i: c.gan_shens[i] == '财' and _zuo(c, i) == '长', texts=("财遇长生，田园万顷",)),
+    Rule('ge_cai.bijie', 'ge_cai', any_of=('ge:财', 'ge:才'),
+         test=lambda c: '官' not in c.shens and ('劫' in c.shens or '比' in c.shens),
+         texts=("切忌有姊妹兄弟分夺，柱无官星，祸患百出。",)),
+    Rule('ge_cai.bijie_many', 'ge_cai', any_of=('ge:财', 'ge:才'),
+         test=lambda c: c.shens.count("比") + c.shens.count("劫") > 1, texts=("兄弟辈出: 纵入官乡，发福必渺.",)),
+    Rule('ge_cai.kong', 'ge_cai', any_of=('ge:财', 'ge:才'), pillars=_PILLARS,
+         test=lambda c, i: ((c.zhi_shens[i] == '才' or ten_deities[c.me][c.zhis[i]] == '才')
+                            and get_empty(c.zhus[2], c.zhis[i])),
+         texts=("空亡 官将不成，财将不住",)),
+    Rule('ge_cai.end', 'ge_cai', any_of=('ge:财', 'ge:才'), texts=("-" * 120,)),
+
+    # 财库
+    Rule('cai_ku.mu', 'cai_ku', test=lambda c: ten_deities[_gan(c, '财')]['库'][-1] in c.zhis,
+         texts=("财临库墓: 一生财帛丰厚，因财致官, 天干透土更佳",)),
+    Rule('cai_ku.bijie', 'cai_ku', any_of=('shen:劫', 'shen:比'), test=lambda c: c.shens.count("财") < 2,
+         texts=("财少身强，柱有比劫，不为福",)),
+
+    # 正官格
+    Rule('ge_guan.title', 'ge_guan', all_of=('ge:官',),
+         texts=("\n**** 官分析 ****\n 喜:身旺 财印   忌：身弱 偏官 伤官 刑冲 泄气 贪合 入墓",
+                "一曰正官 二曰禄神 最忌刑冲破害、伤官七煞，贪合忘官，劫财比等等，遇到这些情况便成为破格 财印并存要分开",
+                "运：财旺印衰喜印，忌食伤生财；旺印财衰喜财，喜食伤生财；带伤食用印制；",
+                "带煞伤食不碍。劫合煞财运可行，伤食可行，身旺，印绶亦可行；伤官合煞，则伤食与财俱可行，而不宜逢印",
+                "=" * 38)),
+    Rule('ge_guan.many', 'ge_guan', all_of=('ge:官',), test=lambda c: c.shens.count("官") > 1, texts=("官多变杀，以干为准",)),
+    Rule('ge_guan.cai_yin', 'ge_guan', all_of=('ge:官', 'shen:财', 'shen:印'),
+         test=lambda c: "伤" not in c.shens and "杀" not in c.shens,
+         texts=("官星通过天干显露出来，又得到财、印两方面的扶持，四柱中又没有伤煞，行运再引到官乡，是大富大贵的命。",)),
+    Rule('ge_guan.cai', 'ge_guan', any_of=('shen:财', 'shen:才'), all_of=('ge:官',), texts=("有财辅助",)),
+    Rule('ge_guan.yin', 'ge_guan', any_of=('shen:印', 'shen:枭'), all_of=('ge:官',),
+         texts=("有印辅助　正官带伤食而用印制，运喜官旺印旺之乡，财运切忌。若印绶叠出，财运亦无害矣。",)),
+    Rule('ge_guan.shi', 'ge_guan', all_of=('ge:官', 'shen:食'),
+         texts=("又曰凡论官星，略见一位食神坐实，便能损局，有杀则无妨。惟月令隐禄，见食却为三奇之贵。因为食神和官相合。",)),
+    Rule('ge_guan.shang', 'ge_guan', all_of=('ge:官', 'shen:伤'), texts=("伤官需要印或偏印来抑制，　有杀也无妨",)),
+    Rule('ge_guan.sha', 'ge_guan', all_of=('ge:官', 'shen:杀'),
+         texts=("伤官需要印或偏印来抑制。用劫合煞，则财运可行，伤食可行，身旺，印绶亦可行，只不过复露七煞。若命用伤官合煞，则伤食与财俱可行，而不宜逢印矣。",)),
+    Rule('ge_guan.day_cai_yin', 'ge_guan', any_of=('zhi_shen2:财', 'zhi_shen2:印'), all_of=('ge:官',),
+         texts=("凡用官，日干自坐财印，终显",)),
+    Rule('ge_guan.day_shang_sha', 'ge_guan', any_of=('zhi_shen2:伤', 'zhi_shen2:杀'), all_of=('ge:官',),
+         texts=("自坐伤、煞，终有节病",)),
+    # 天福贵人
+    Rule('ge_guan.tianfu', 'ge_guan', all_of=('ge:官',), test=lambda c: (_gan(c, '官'), _lu(c, '官')) in c.zhus,
+         texts=("天福贵人:主科名巍峨，官职尊崇，多掌丝纶文翰之美!",)),
+    # 天元坐禄
+    Rule('ge_guan.tianyuan', 'ge_guan', all_of=('ge:官',), test=lambda c: _gan(c, '官') in zhi5[c.zhis[2]],
+         texts=("天元作禄: 日主与官星并旺,才是贵命。大多不贵即富,即使是命局中有缺点,行到好的大运时,便能一发如雷。",)),
+    *(Rule('ge_guan.tianyuan_' + name, 'ge_guan', any_of=_element_gans(element), all_of=('ge:官',),
+           test=lambda c: _gan(c, '官') in zhi5[c.zhis[2]], texts=(tianyuans[element],))
+      for element, name in _ELEMENTS),
+    # 岁德正官
+    Rule('ge_guan.suide', 'ge_guan', all_of=('ge:官', 'pillar0:官'),
+         texts=("岁德正官: 必生宦族,或荫袭祖父之职,若月居财官分野,运向财官旺地,日主健旺,贵无疑矣。凡年干遇官,福气最重,发达必早。",)),
+    # 时上正官，原来的条件与岁德正官相同
+    Rule('ge_guan.time', 'ge_guan', all_of=('ge:官', 'pillar0:官'),
+         texts=("时上正官: 正官有用不须多，多则伤身少则和，日旺再逢生印绶，定须平步擢高科。",)),
+    Rule('ge_guan.end', 'ge_guan', all_of=('ge:官',), texts=("", "-" * 120)),
+
+    # 官库
+    Rule('guan_ku.mu', 'guan_ku', test=lambda c: ten_deities[_gan(c, '官')]['库'][-1] in c.zhis, texts=("官临库墓",)),
+    Rule('guan_ku.cai', 'guan_ku',
+         test=lambda c: ten_deities[_gan(c, '官')]['库'][-1] in c.zhis and lu_ku_cai[c.me] in c.zhis,
+         texts=("官印禄库: 有官库，且库中有财",)),
+
+    # 七杀格
+    Rule('ge_sha.title', 'ge_sha', all_of=('ge:杀',),
+         texts=("\n杀(偏官)分析 **** 喜:身旺  印绶  合煞  食制 羊刃  比  逢煞看印及刃  以食为引   忌：身弱  财星  正官  刑冲  入墓",
+                "一曰偏官 二曰七煞 三曰五鬼 四曰将星 五曰孤极星 原有制伏,煞出为福,原无制伏,煞出为祸   性情如虎，急躁如风,尤其是七杀为丙、丁火时。",
+                "坐长生、临官、帝旺,更多带比同类相扶,则能化鬼为官,化煞为权,行运引至印乡,必发富贵。倘岁运再遇煞地,祸不旋踵。",
+                "七杀喜酒色而偏争好斗、爱轩昂而扶弱欺强",
+                "=" * 38)),
+    Rule('ge_sha.cai', 'ge_sha', all_of=('ge:杀', 'shen:财'),
+         texts=("逢煞看财,如身强煞弱,有财星则吉,身弱煞强,有财引鬼盗气,非贫则夭;",)),
+    Rule('ge_sha.bi', 'ge_sha', all_of=('ge:杀', 'shen:比'), texts=("如果比比自己弱，可以先挨杀。",)),
+    Rule('ge_sha.shi', 'ge_sha', all_of=('ge:杀', 'shen:食'), texts=("有食神透制,即《经》云:一见制伏,却为贵本",)),
+    Rule('ge_sha.shi_cai_yin', 'ge_sha', any_of=('shen:财', 'shen:印', 'shen:才', 'shen:枭'), all_of=('ge:杀', 'shen:食'),
+         texts=("煞用食制，不要露财透印，以财能转食生煞，而印能去食护煞也。然而财先食后，财生煞而食以制之，或印先食后，食太旺而印制，则格成大贵。",)),
+    Rule('ge_sha.ren', 'ge_sha', all_of=('ge:杀', 'shen:劫'), texts=("有阳刃配合,即《经》云:煞无刃不显,逢煞看刃是也。",)),
+    Rule('ge_sha.yin', 'ge_sha', all_of=('ge:杀', 'shen:印'), texts=("印: 则煞生印，印生身",)),
+    Rule('ge_sha.many', 'ge_sha', all_of=('ge:杀',), test=lambda c: c.shens.count("杀") > 1, texts=("七煞重逢",)),
+    Rule('ge_sha.cong', 'ge_sha', all_of=('ge:杀',), test=lambda c: c.shens.count("杀") > 1 and c.weak,
+         texts=("弃命从煞，须要会煞从财.四柱无一点比印绶方论，如遇运扶身旺，与煞为敌，从煞不专，故为祸患",
+                "阴干从地支，煞纯者多贵，以阴柔能从物也。阳干从地支，煞纯者亦贵，但次于阴，以阳不受制也。",
+                "水火金土皆从，惟阳木不能从，死木受斧斤，反遭其伤故也。",
+                "古歌曰：五阳坐日全逢煞，弃命相从寿不坚，如是五阴逢此地，身衰煞旺吉堪言。")),
+    Rule('ge_sha.day', 'ge_sha', all_of=('ge:杀', 'zhi_shen2:杀'), texts=("为人心多性急，阴险怀毒，僭伪谋害，不近人情",)),
+    Rule('ge_sha.time', 'ge_sha', any_of=('zhi_shen3:杀', 'gan_shen3:杀'), all_of=('ge:杀',),
+         texts=(" 时杀：月制干强，其煞反为权印。《经》云：时上偏官身要强，阳刃、冲刑煞敢当，制多要行煞旺运，煞多制少必为殃。",
+                " 一位为妙，年、月、日重见，反主辛苦劳碌。若身旺，煞制太过，喜行煞旺运，或三合煞运，如无制伏，要行制伏运方发。但忌身弱，纵得运扶持发福，运过依旧不济。",
+                "《独步》云：时上一位，贵藏在支中，是日，主要旺强名利，方有气。",
+                "《古歌》云：时上偏官喜刃冲，身强制伏禄丰隆。正官若也来相混，身弱财多主困穷。",
+                "时上偏官一位强，日辰自旺喜非常。有财有印多财禄，定是天生作栋梁。",
+                "煞临子位，必招悖逆之儿。")),
+    Rule('ge_sha.year', 'ge_sha', all_of=('ge:杀', 'zhi_shen0:杀'),
+         texts=(" 年上七煞：出身寒微，命有贵子。",
+                "岁煞一位不宜制，四柱重见却宜制，日主生旺，制伏略多，喜行煞旺地，制伏太过，或煞旺身衰，官煞混杂，岁运如之，碌碌之辈。若制伏不及，运至身衰煞旺乡，必生祸患。",
+                "《独步》云：时上一位，贵藏在支中，是日，主要旺强名利，方有气。",
+                "《古歌》云：时上偏官喜刃冲，身强制伏禄丰隆。正官若也来相混，身弱财多主困穷。",
+                "时上偏官一位强，日辰自旺喜非常。有财有印多财禄，定是天生作栋梁。")),
+    Rule('ge_sha.guan', 'ge_sha', all_of=('ge:杀', 'shen:官'), texts=("官煞混杂：身弱多夭贫",)),
+    Rule('ge_sha.chang', 'ge_sha', all_of=('ge:杀',), pillars=_PILLARS,
+         test=lambda c, i: c.gan_shens[i] == '杀' and _zuo(c, i) == '长', texts=("七煞遇长生乙位，女招贵夫。",)),
+    Rule('ge_sha.end', 'ge_sha', all_of=('ge:杀',), texts=("", "-" * 120)),
+
+    # 正印格
+    Rule('ge_yin.title', 'ge_yin', all_of=('ge:印',),
+         texts=("\n印分析 **** 喜:食神 天月德 七煞 逢印看煞 以官为引   忌： 刑冲 伤官 死墓 辰戊印怕木 丑未印不怕木",
+                "一曰正印 二曰魁星 三曰孙极星",
+                "以印绶多者为上,月最要,日时次之,年干虽重,须归禄月、日、时,方可取用,若年露印,月日时无,亦不济事。",
+                "=" * 38)),
+    Rule('ge_yin.guan', 'ge_yin', all_of=('ge:印', 'shen:官'), texts=("官能生印。身旺印强，不愁太过，只要官星清纯",)),
+    Rule('ge_yin.sha', 'ge_yin', all_of=('ge:印', 'shen:杀'),
+         texts=("喜七煞,但煞不可太多,多则伤身。原无七煞,行运遇之则发;原有七煞,行财运,或印绶死绝,或临墓地,皆凶。",)),
+    Rule('ge_yin.shishang', 'ge_yin', any_of=('shen:伤', 'shen:食'), all_of=('ge:印',),
+         texts=("伤食：身强印旺，恐其太过，泄身以为秀气；若印浅身轻，而用层层伤食，则寒贫之局矣。",)),
+    Rule('ge_yin.cai', 'ge_yin', any_of=('shen:财', 'shen:才'), all_of=('ge:印',),
+         texts=("有印多而用财者，印重身强，透财以抑太过，权而用之，只要根深，无防财破。 若印轻财重，又无劫财以救，则为贪财破印，贫贱之局也。",)),
+    Rule('ge_yin.many', 'ge_yin', all_of=('ge:印',), test=lambda c: c.shens.count("印") > 1,
+         texts=("印绶复遇拱禄、专禄、归禄、鼠贵、夹贵、时贵等格,尤为奇特,但主少子或无子,印绶多者清孤。",)),
+    Rule('ge_yin.jie', 'ge_yin', all_of=('ge:印', 'shen:劫'), texts=("化印为劫；弃之以就财官",)),
+    Rule('ge_yin.end', 'ge_yin', all_of=('ge:印',), texts=("", "-" * 120)),
+
+    # 偏印格
+    Rule('ge_xiao.title', 'ge_xiao', all_of=('ge:枭',),
+         texts=("\n印分析 **** 喜:食神 天月德 七煞 逢印看煞 以官为引   忌： 刑冲 伤官 死墓 辰戊印怕木 丑未印不怕木",
+                "一曰正印 二曰魁星 三曰孙极星",
+                "以印绶多者为上,月最要,日时次之,年干虽重,须归禄月、日、时,方可取用,若年露印,月日时无,亦不济事。",
+                "=" * 38)),
+    Rule('ge_xiao.guan', 'ge_xiao', all_of=('ge:枭', 'shen:官'), texts=("官能生印。身旺印强，不愁太过，只要官星清纯",)),
+    Rule('ge_xiao.sha', 'ge_xiao', all_of=('ge:枭', 'shen:杀'),
+         texts=("喜七煞,但煞不可太多,多则伤身。原无七煞,行运遇之则发;原有七煞,行财运,或印绶死绝,或临墓地,皆凶。",)),
+    Rule('ge_xiao.shishang', 'ge_xiao', any_of=('shen:伤', 'shen:食'), all_of=('ge:枭',),
+         texts=("伤食：身强印旺，恐其太过，泄身以为秀气；若印浅身轻，而用层层伤食，则寒贫之局矣。",)),
+    Rule('ge_xiao.cai', 'ge_xiao', any_of=('shen:财', 'shen:才'), all_of=('ge:枭',), texts=("弃印就财。",)),
+    Rule('ge_xiao.many', 'ge_xiao', all_of=('ge:枭',), test=lambda c: c.shens.count("印") > 1,
+         texts=("印绶复遇拱禄、专禄、归禄、鼠贵、夹贵、时贵等格,尤为奇特,但主少子或无子,印绶多者清孤。",)),
+    Rule('ge_xiao.jie', 'ge_xiao', all_of=('ge:枭', 'shen:劫'), texts=("化印为劫；弃之以就财官",)),
+    Rule('ge_xiao.end', 'ge_xiao', all_of=('ge:枭',), texts=("", "-" * 120)),
+
+    # 华盖
+    Rule('huagai.huagai', 'huagai', test=lambda c: _HUAGAI[c.zhis[2]] in c.zhis[:2] + c.zhis[3:],
+         texts=("\n\n华盖: 多主孤寡，总贵亦不免孤独，作僧道艺术论。",
+                "=" * 25,
+                "《理愚歌》云：华盖虽吉亦有妨，或为孽子或孤孀。填房入赘多阙口，炉钳顶笠拔缁黄。\n"
+                "    又云：华盖星辰兄弟寡，天上孤高之宿也；生来若在时与胎，便是过房庶出者。")),
+
+    # 十神组合
+    Rule('combo.yang_sha', 'combo', all_of=('shen:杀',), test=lambda c: yinyang(c.me) == '+',
+         texts=("阳杀:话多,热情外向,异性缘好",)),
+    Rule('combo.yin_sha', 'combo', all_of=('shen:杀',), test=lambda c: yinyang(c.me) != '+',
+         texts=("阴杀:话少,性格柔和",)),
+    Rule('combo.sanqi', 'combo', all_of=('shen:印', 'shen:才', 'shen:官'), texts=("印,偏财,官:三奇 怕正财",)),
+    Rule('combo.cai_sha', 'combo', all_of=('shen:才', 'shen:杀'), texts=("男:因女致祸、因色致祸; 女:赔货",)),
+    Rule('combo.cai_xiao', 'combo', all_of=('shen:才', 'shen:枭'), texts=("偏印因偏财而不懒！",)),
+])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='列出八字命中的断语规则')
+    parser.add_argument('year', type=int)
+    parser.add_argument('month', type=int)
+    parser.add_argument('day', type=int)
+    parser.add_argument('time', type=int)
+    parser.add_argument('-g', action='store_true', default=False, help='是否采用公历')
+    parser.add_argument('-r', action='store_true', default=False, help='是否为闰月，仅仅使用于农历')
+    parser.add_argument('-n', action='store_true', default=False, help='是否为女，默认为男')
+    options = parser.parse_args()
+
+    from chart import compute_chart
+    chart = compute_chart(options.year, options.month, options.day, options.time,
+                          gregorian=options.g, leap=options.r, female=options.n)
+    for finding in chart.rule_findings:
+        print(finding.rule if finding.pillar is None else '{} [{}]'.format(finding.rule, finding.pillar))
+        for text in finding.texts:
+            print("    ", text.strip())
+
+
+if __name__ == '__main__':
+    main()
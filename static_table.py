@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 四柱静态分析表：只由八字决定的结果（十神、五行分数、强弱、拱、空亡、神煞、格、三合三会局等）
+# 对 60年柱×12月支×60日柱×12时支 = 518400 种四柱预先算好，存为定长记录，
+# 用 mmap 打开后一次查表即可得到。月干、时干由五虎遁、五鼠遁确定。
+#
+# 生成: python static_table.py [-o 输出文件]
+
+import argparse
+import collections
+import hashlib
+import inspect
+import mmap
+import os
+import struct
+import warnings
+
+from datas import *
+from common import *
+from ganzhi_codes import *
+import chart
+from chart import Chart
+
+COUNT = 60 * 12 * 60 * 12
+MAGIC = b'BZST'
+VERSION = 2
+HEADER = struct.Struct('<4sII16s')
+RECORD = struct.Struct('<4s5B10BBb3sBBB4HHBB')
+EMPTY = 0xF
+
+GES = ('', '建', '月刃') + SHENS
+JUS = list(zhi_hes.items()) + list(zhi_huis.items())
+
+# 字段与 Chart 上的同名字段相同，除 jus、ge 外都是编号
+Static = collections.namedtuple(
+    "Static",
+    "gan_ids zhi_ids gan_shen_ids zhi_shen_ids hidden_ids element_scores gan_score_list "
+    "strong weak temps_scores gong_ids zhi_empties nayins shensha jus ge")
+
+
+def pillar_index(gan_ids, zhi_ids):
+    '''四柱编号在表中的序号，月干或时干与年干、日干不符时返回 None'''
+    if gan_ids[1] != month_gan(gan_ids[0], zhi_ids[1]) or gan_ids[3] != time_gan(gan_ids[2], zhi_ids[3]):
+        return None
+    year = ganzhi_id(gan_ids[0], zhi_ids[0])
+    day = ganzhi_id(gan_ids[2], zhi_ids[2])
+    return ((year * 12 + zhi_ids[1]) * 60 + day) * 12 + zhi_ids[3]
+
+
+def index_pillars(index):
+    '''pillar_index 的逆运算，返回 (gan_ids, zhi_ids)'''
+    index, time_zhi = divmod(index, 12)
+    index, day = divmod(index, 60)
+    year, month_zhi = divmod(index, 12)
+    gan_ids = (year % 10, month_gan(year % 10, month_zhi), day % 10, time_gan(day % 10, time_zhi))
+    zhi_ids = (year % 12, month_zhi, day % 12, time_zhi)
+    return gan_ids, zhi_ids
+
+
+def month_gan(year_gan, month_zhi):
+    '''五虎遁：甲己之年丙作首'''
+    return (year_gan % 5 * 2 + 2 + (month_zhi - 2) % 12) % 10
+
+
+def time_gan(day_gan, time_zhi):
+    '''五鼠遁：甲己还加甲'''
+    return (day_gan % 5 * 2 + time_zhi) % 10
+
+
+def _nibbles(values, size):
+    values = list(values) + [EMPTY] * (size * 2 - len(values))
+    return bytes(values[i] << 4 | values[i + 1] for i in range(0, size * 2, 2))
+
+
+def _unnibble(data):
+    result = []
+    for item in data:
+        result.extend((item >> 4, item & 0xF))
+    return result
+
+
+def _bits(flags):
+    return sum(1 << i for i, flag in enumerate(flags) if flag)
+
+
+def encode(chart):
+    '''把 Chart 的静态部分编码为一条记录'''
+    gans, zhis = chart.gan_ids, chart.zhi_ids
+    shens = [EMPTY if item == NONE else item for item in chart.gan_shen_ids] + list(chart.zhi_shen_ids)
+
+    wang = [zhi == wang_table[zhis[0]] for zhi in zhis]
+    jiesha = [zhi == jiesha_table[zhis[0]] for zhi in zhis]
+    # 元辰随大运方向变化，分别记录男命和女命
+    direction = 1 if gans[0] % 2 == 0 else -1
+    yuanchens = [[zhi == (zhis[0] + direction*-1*5)%12 for zhi in zhis]
+                 for direction in (direction, -direction)]
+
+    shensha = [sum(1 << seq for seq, _ in items) for items in chart.shensha]
+    # 日干引起的神煞，bazi.py 中标记为●
+    marks = sum(1 << seq for seq, by_gan in chart.shensha[2] if by_gan)
+
+    jus = 0
+    zhis_g = set(chart.zhis) | set(chart.gongs)
+    for i, (item, _) in enumerate(JUS):
+        if set(item).issubset(zhis_g):
+            jus |= 1 << i
+
+    return RECORD.pack(
+        _nibbles(shens, 4), *chart.element_scores, *chart.gan_score_list,
+        chart.strong, chart.temps_scores, _nibbles(chart.gong_ids, 3),
+        int(chart.weak) | _bits(chart.zhi_empties) << 4,
+        _bits(wang) | _bits(jiesha) << 4,
+        _bits(yuanchens[0]) | _bits(yuanchens[1]) << 4,
+        *shensha, marks, jus, GES.index(chart.ge))
+
+
+def decode(gans, zhis, record, female=False):
+    '''把四柱编号 gans、zhis 的一条记录还原为 Static，female 只影响元辰'''
+    gans, zhis = tuple(gans), tuple(zhis)
+    me = gans[2]
+    (shens, *rest) = RECORD.unpack(record)
+    element_scores = list(rest[:5])
+    gan_score_list = list(rest[5:15])
+    strong, temps_scores, gongs, flags, nayin_marks, yuanchen = rest[15:21]
+    shensha, marks, jus, ge = rest[21:25], rest[25], rest[26], rest[27]
+
+    shens = _unnibble(shens)
+    gan_shen_ids = tuple(NONE if item == EMPTY else item for item in shens[:4])
+    hidden_ids = tuple(tuple((gan, gan_shen_table[me][gan]) for gan, _ in hidden_table[item]) for item in zhis)
+
+    yuanchen = yuanchen >> 4 if female else yuanchen & 0xF
+    nayins_ = [(element_mark_table[gan_elements[gan]][zhi_elements[zhi]], nayin_table[ganzhi_id(gan, zhi)],
+                (bool(nayin_marks >> seq & 1), bool(nayin_marks >> (4 + seq) & 1), bool(yuanchen >> seq & 1)))
+               for seq, (gan, zhi) in enumerate(zip(gans, zhis))]
+
+    shensha_ = [[(i, seq == 2 and bool(marks >> i & 1)) for i in range(len(SHENSHAS)) if mask >> i & 1]
+                for seq, mask in enumerate(shensha)]
+    me_name = GANS[me]
+    jus_ = [ju[ten_deities[me_name].inverse[value]] for i, (_, value) in enumerate(JUS) if jus >> i & 1]
+
+    return Static(
+        gan_ids=gans, zhi_ids=zhis, gan_shen_ids=gan_shen_ids, zhi_shen_ids=tuple(shens[4:]),
+        hidden_ids=hidden_ids, element_scores=element_scores, gan_score_list=gan_score_list,
+        strong=strong, weak=bool(flags & 1), temps_scores=temps_scores,
+        gong_ids=[item for item in _unnibble(gongs) if item != EMPTY],
+        zhi_empties=[bool(flags >> (4 + i) & 1) for i in range(4)], nayins=nayins_,
+        shensha=shensha_, jus=jus_, ge=GES[ge])
+
+
+# 生成记录用到的模块，以及 chart.py 中算原局、拱和格的函数；chart.py 其他部分（大运流年、日历等）的改动不影响表
+SOURCE_FILES = ('ganzhi.py', 'datas.py', 'common.py', 'ganzhi_codes.py', 'rules.py')
+SOURCE_FUNCTIONS = (chart.get_roots, chart.get_gong, chart.get_shens, chart.check_he_chong,
+                    chart.Chart, chart._natal, chart._adjacent, chart._findings)
+
+
+def source_digest():
+    '''生成记录所依赖的源码摘要，这些源码或记录格式变化后旧表自动失效'''
+    md5 = hashlib.md5(RECORD.format.encode('ascii'))
+    base = os.path.dirname(os.path.abspath(__file__))
+    for name in SOURCE_FILES:
+        with open(os.path.join(base, name), 'rb') as f:
+            md5.update(f.read())
+    for item in SOURCE_FUNCTIONS + (encode, decode):
+        md5.update(inspect.getsource(item).encode('utf-8'))
+    return md5.digest()
+
+
+class StaticTable:
+    '''mmap 打开的静态分析表'''
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, digest = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION or size != RECORD.size:
+            raise ValueError("{} 不是静态分析表".format(path))
+        if len(self.mm) != HEADER.size + COUNT * RECORD.size:
+            raise ValueError("{} 长度不对".format(path))
+        if digest != source_digest():
+            raise ValueError("{} 已过期，请用 python static_table.py 重新生成".format(path))
+
+    def record(self, index):
+        offset = HEADER.size + index * RECORD.size
+        return self.mm[offset:offset + RECORD.size]
+
+    def lookup(self, gans, zhis, female=False):
+        '''gans、zhis 为四柱的天干、地支编号'''
+        index = pillar_index(gans, zhis)
+        if index is None:
+            raise KeyError((tuple(gans), tuple(zhis)))
+        return decode(gans, zhis, self.record(index), female)
+
+    def close(self):
+        self.mm.close()
+
+
+def default_path():
+    return os.environ.get('BAZI_STATIC_TABLE', data_path('static_table.bin'))
+
+
+_table = None
+
+def get_table():
+    '''默认路径的表，不存在或已过期时返回 None，已过期时给出警告'''
+    global _table
+    if _table is None:
+        try:
+            _table = StaticTable(default_path())
+        except OSError:
+            _table = False
+        except ValueError as e:
+            warnings.warn("{}，暂时现算".format(e), RuntimeWarning)
+            _table = False
+    return _table or None
+
+
+def lookup(gans, zhis, female=False):
+    '''四柱的静态分析结果，gans、zhis 为汉字，有表时查表，否则现算'''
+    gans = tuple(gan_ids[item] for item in gans)
+    zhis = tuple(zhi_ids[item] for item in zhis)
+    table = get_table()
+    if table is not None and pillar_index(gans, zhis) is not None:
+        return table.lookup(gans, zhis, female)
+    return decode(gans, zhis, encode(Chart([GANS[item] for item in gans], [ZHIS[item] for item in zhis])), female)
+
+
+def build(path):
+    '''生成全部 518400 条记录'''
+    with atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, source_digest()))
+        for index in range(COUNT):
+            gans, zhis = index_pillars(index)
+            f.write(encode(Chart([GANS[item] for item in gans], [ZHIS[item] for item in zhis])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成四柱静态分析表')
+    parser.add_argument('-o', '--output', default=default_path(), help='输出文件')
+    options = parser.parse_args()
+    build(options.output)
+    print("写入", options.output)
+
+
+if __name__ == '__main__':
+    main()
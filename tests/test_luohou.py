@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# luohou.days 与 lunar_python 逐日比较日九星
+
+import datetime
+
+import pytest
+from lunar_python import Solar
+
+import luohou
+
+
+def _jiuxing(date):
+    return str(Solar.fromYmd(date.year, date.month, date.day).getLunar().getDayNineStar())
+
+
+@pytest.mark.parametrize('start, end', [
+    # 整年，含春节前的一月
+    (datetime.date(1986, 1, 1), datetime.date(1987, 1, 1)),
+    (datetime.date(2023, 1, 1), datetime.date(2024, 1, 1)),
+    # 跨年一次推算
+    (datetime.date(1985, 7, 20), datetime.date(1986, 3, 1)),
+])
+def test_jiuxing(start, end):
+    wrong = [(item.date, item.jiuxing, _jiuxing(item.date))
+             for item in luohou.days(start, end) if item.jiuxing != _jiuxing(item.date)]
+    assert wrong == []
+
+
+def test_days_count():
+    start = datetime.date(2019, 6, 16)
+    items = list(luohou.days(start, start + datetime.timedelta(days=400)))
+    assert len(items) == 400
+    assert [item.date for item in items] == [start + datetime.timedelta(days=i) for i in range(400)]
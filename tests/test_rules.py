@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# rules.RULES 的特征索引、match 与 match_batch
+
+import pytest
+
+import rules
+from chart import compute_chart_from_pillars
+
+# 四柱天干、地支、是否为女
+PILLARS = [
+    ('甲丙庚丁', '子寅辰亥', False),     # 魁罡：日柱庚辰
+    ('丁壬丙戊', '未子子子', False),
+    ('己丙甲甲', '丑寅辰戌', True),
+    ('辛丁壬庚', '丑酉寅子', True),
+    ('丙庚壬辛', '午子子亥', False),
+    ('戊辛戊丙', '寅酉子辰', True),
+    ('癸辛庚戊', '未酉寅寅', False),
+    ('乙丙辛庚', '酉戌亥寅', True),
+]
+
+
+def _chart(gans, zhis, female):
+    return compute_chart_from_pillars(list(gans), list(zhis), female)
+
+
+def _ids(findings):
+    return [(item.rule, item.pillar) for item in findings]
+
+
+def test_kuigang():
+    chart = _chart(*PILLARS[0])
+    findings = rules.RULES.match(chart)
+    assert 'special.kuigang' in [item.rule for item in findings]
+    assert [item.rule for item in chart.rule_findings] == [item.rule for item in findings]
+
+    chart = _chart(*PILLARS[1])
+    assert 'special.kuigang' not in [item.rule for item in rules.RULES.match(chart)]
+
+
+def test_candidates():
+    seq = [rule.id for rule in rules.RULES.rules].index('special.kuigang')
+    assert seq in rules.RULES.index['day_pillar:庚辰']
+    assert seq in rules.RULES.candidates(rules.chart_features(_chart(*PILLARS[0])))
+    assert seq not in rules.RULES.candidates(rules.chart_features(_chart(*PILLARS[1])))
+
+
+def test_match_batch():
+    charts = [_chart(*item) for item in PILLARS]
+    batch = rules.RULES.match_batch(charts)
+    assert len(batch) == len(charts)
+    for chart, findings in zip(charts, batch):
+        assert _ids(findings) == _ids(rules.RULES.match(chart))
+
+
+def test_duplicate_id():
+    with pytest.raises(ValueError):
+        rules.RuleSet([rules.Rule('a.b', 'a', texts=('1',)), rules.Rule('a.b', 'a', texts=('2',))])
+
+
+def test_loop():
+    always = lambda chart, seq: True
+    with pytest.raises(ValueError):
+        rules.RuleSet([rules.Rule('a.x', 'a', pillars=(0,), test=always, loop='a.zuo'),
+                       rules.Rule('a.y', 'a'),
+                       rules.Rule('a.z', 'a', pillars=(0,), test=always, loop='a.zuo')])
+    with pytest.raises(ValueError):
+        rules.RuleSet([rules.Rule('a.x', 'a', pillars=(0,))])
+
+    # 同一 loop 组先按柱再按声明顺序，其他规则按声明顺序
+    ruleset = rules.RuleSet([
+        rules.Rule('a.first', 'a'),
+        rules.Rule('a.x', 'a', pillars=(0, 1, 2), test=always, loop='a.zuo'),
+        rules.Rule('a.y', 'a', pillars=(1, 2), test=always, loop='a.zuo'),
+        rules.Rule('a.z', 'a', pillars=(0, 3), test=lambda chart, seq: seq == 3),
+        rules.Rule('a.last', 'a', test=lambda chart: False),
+    ])
+    assert _ids(ruleset.match(None, frozenset())) == [
+        ('a.first', None), ('a.x', 0), ('a.x', 1), ('a.y', 1), ('a.x', 2), ('a.y', 2), ('a.z', 3)]
@@ -117,7 +117,7 @@ ji7_9 = '''
 	八月支成金局，无丙丁出救，此人零丁孤苦，如得丙透丁藏，生己元神，此人名魁天下，五福完人。
 
 	总之三秋己土，先癸後丙，取辛辅癸，九月土盛，宜甲木疏之，余皆酌用。
-    ''',   
+    '''   
 	
 
 ji10_12 = '''
@@ -131,7 +131,7 @@ ji10_12 = '''
     
     或一派戊己，取甲制之，甲透者富贵。
     
-    或一片辛庚，须用丙火，还须丁火为助，丙藏，富贵奇特之命。''',   
+    或一片辛庚，须用丙火，还须丁火为助，丙藏，富贵奇特之命。'''   
 
 months = {
 